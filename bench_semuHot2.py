@@ -0,0 +1,270 @@
+# ---------------------------
+# 세무사랑 핫스트링 성능 측정 (화면/키보드 훅 없이 실행)
+# ---------------------------
+# 사용 예)
+#   python bench_semuHot2.py                          # 1k / 10k / 100k 행, 결과 JSON을 화면에 출력
+#   python bench_semuHot2.py --sizes 1000,10000 --output bench_output.json
+#
+# - Qt는 offscreen 플랫폼으로 띄우므로 모니터가 없는 환경에서도 동작합니다.
+# - 키 입력은 실제 훅 대신 가상 키 이벤트를 HotstringEngine.handle_event에 직접 넣고,
+#   치환 입력은 FakeOutput(메모리 안에서만 동작)으로 받습니다.
+# - 측정용 데이터/엑셀 파일은 임시 폴더에 만들고, 사용자의 data.snap 등은 건드리지 않습니다.
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from openpyxl import Workbook
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QT_VERSION_STR
+
+import semuHot2
+import semuHot2_core
+
+CATEGORIES = ["복리후생비", "여비교통비", "접대비", "통신비", "세금과공과", "소모품비", "지급수수료", "차량유지비"]
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def make_records(rows, seed=0):
+    rnd = random.Random(seed)
+    seen = set()
+    records = []
+    while len(records) < rows:
+        abbrev = "".join(rnd.choice(LETTERS) for _ in range(rnd.randint(2, 6)))
+        if abbrev in seen:
+            continue
+        seen.add(abbrev)
+        records.append({"지정": abbrev, "번호": rnd.randint(100, 99999), "구분": rnd.choice(CATEGORIES)})
+    return records
+
+
+def make_workbook(path, records):
+    wb = Workbook(write_only=True)
+    for name in semuHot2_core.SHEET_NAMES:
+        ws = wb.create_sheet(name)
+        ws.append(list(semuHot2_core.COLUMNS))
+        for rec in records:
+            ws.append([rec["지정"], rec["번호"], rec["구분"]])
+    wb.save(path)
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, int(round(p / 100.0 * (len(sorted_values) - 1)))))
+    return sorted_values[k]
+
+
+def summarize_ns(samples):
+    samples = sorted(samples)
+    return {
+        "count": len(samples),
+        "mean_us": round(sum(samples) / len(samples) / 1000.0, 3) if samples else 0.0,
+        "p50_us": round(percentile(samples, 50) / 1000.0, 3),
+        "p95_us": round(percentile(samples, 95) / 1000.0, 3),
+        "p99_us": round(percentile(samples, 99) / 1000.0, 3),
+        "max_us": round(samples[-1] / 1000.0, 3) if samples else 0.0,
+    }
+
+
+def timed(func, repeat=1, settle=None):
+    # repeat번 실행해서 가장 빠른 시간(초)
+    # settle: 측정 사이에 백그라운드 작업(검색 색인 등)이 끝나길 기다리는 함수
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        if settle is not None:
+            settle()
+    return best
+
+
+def bench_keystrokes(store, words=2000, seed=1, suggest=False):
+    # 약어(+ 일부는 없는 단어)를 입력하고 스페이스를 누르는 과정을 키 단위로 측정
+    # suggest=True: 자동완성 후보가 있는 트라이 + 후보를 받는 콜백(GUI의 시그널 emit 대신 빈 함수)
+    rnd = random.Random(seed)
+    output = semuHot2_core.FakeOutput()
+    engine = semuHot2_core.HotstringEngine(output=output)
+    engine.use_table(semuHot2_core.build_hotstring_trie(store, suggest))
+    if suggest:
+        engine.suggest = lambda top, depth: None
+    abbrevs = list(store.abbrevs)
+    samples = []
+    clock = 0.0
+    for _ in range(words):
+        word = rnd.choice(abbrevs) if rnd.random() < 0.8 else "zz" + rnd.choice(abbrevs)
+        for name in list(word) + ["space"]:
+            clock += 0.05
+            event = semuHot2_core.SimulatedKeyEvent(name, clock)
+            start = time.perf_counter_ns()
+            engine.handle_event(event)
+            samples.append(time.perf_counter_ns() - start)
+    result = summarize_ns(samples)
+    result["replacements"] = len(output.injections)
+    return result
+
+
+def bench_window(window, records, repeat):
+    corp = semuHot2.CodeStore.from_records(records)
+    personal = semuHot2.CodeStore.from_records(records[: len(records) // 2])
+    window.apply_loaded_data(corp, personal)
+    wait_for_search_indexes(window)
+    app = QApplication.instance()
+
+    def toggle():
+        window.switch_category.setChecked(not window.switch_category.isChecked())
+        app.processEvents()
+
+    def update_table():
+        window.update_table()
+        app.processEvents()
+
+    return {
+        "mode_toggle_s": round(timed(toggle, repeat), 6),
+        "update_table_s": round(timed(update_table, repeat), 6),
+        "compile_tables_s": round(timed(semuHot2.compile_hotstring_tables, repeat), 6),
+    }
+
+
+def bench_loading(window, records, work_dir, repeat):
+    rows = len(records)
+    xlsx_path = os.path.join(work_dir, f"codes_{rows}.xlsx")
+    json_path = os.path.join(work_dir, f"codes_{rows}.json")
+    snap_path = os.path.join(work_dir, f"codes_{rows}.snap")
+    make_workbook(xlsx_path, records)
+    corp = semuHot2.CodeStore.from_records(records)
+    semuHot2.write_json_data(json_path, corp, corp)
+    semuHot2_core.write_snapshot(snap_path, [corp, corp])
+
+    def run_excel_import():
+        # GUI 없이 작업 스레드 본문을 그대로 실행
+        results = []
+        worker = semuHot2.ExcelImportWorker(xlsx_path)
+        worker.loaded.connect(results.append)
+        worker.failed.connect(lambda msg: results.append(RuntimeError(msg)))
+        worker.run()
+        if not results or isinstance(results[0], Exception):
+            raise RuntimeError(f"엑셀 불러오기 실패: {results}")
+        window.on_excel_loaded(results[0])
+
+    def settle():
+        wait_for_search_indexes(window)
+
+    def clear_cache():
+        for name in os.listdir(semuHot2.import_cache.cache_dir):
+            os.remove(os.path.join(semuHot2.import_cache.cache_dir, name))
+
+    os.makedirs(semuHot2.import_cache.cache_dir, exist_ok=True)
+    excel_cold = None
+    for _ in range(repeat):
+        clear_cache()
+        elapsed = timed(run_excel_import, settle=settle)
+        excel_cold = elapsed if excel_cold is None else min(excel_cold, elapsed)
+    excel_cached = timed(run_excel_import, repeat, settle)
+
+    def load_json():
+        window.apply_loaded_data(*semuHot2.read_json_data(json_path))
+
+    def load_snapshot():
+        (c, p), _ = semuHot2_core.read_snapshot(snap_path)
+        window.apply_loaded_data(c, p)
+
+    json_s = timed(load_json, repeat, settle)
+    snap_s = timed(load_snapshot, repeat, settle)
+    total_rows = rows * 2
+    return {
+        "load_excel_s": round(excel_cold, 6),
+        "load_excel_rows_per_s": round(total_rows / excel_cold, 1),
+        "load_excel_cached_s": round(excel_cached, 6),
+        "load_json_data_s": round(json_s, 6),
+        "load_json_data_rows_per_s": round(total_rows / json_s, 1),
+        "load_snapshot_s": round(snap_s, 6),
+        "load_snapshot_rows_per_s": round(total_rows / snap_s, 1),
+        "xlsx_bytes": os.path.getsize(xlsx_path),
+        "json_bytes": os.path.getsize(json_path),
+        "snapshot_bytes": os.path.getsize(snap_path),
+    }
+
+
+def redirect_data_files(work_dir):
+    # 사용자 데이터 파일 대신 임시 폴더를 쓰도록 경로를 바꿈
+    semuHot2.current_json_file = os.path.join(work_dir, "data.json")
+    semuHot2.snapshot_file = os.path.join(work_dir, "data.snap")
+    semuHot2.journal_file = os.path.join(work_dir, "data.journal")
+    semuHot2.import_cache = semuHot2.ImportCache(os.path.join(work_dir, "import_cache"))
+    semuHot2.edit_journal = semuHot2.EditJournal(semuHot2.journal_file, semuHot2.snapshot_file)
+    semuHot2.profile_registry = semuHot2.ProfileRegistry(
+        os.path.join(work_dir, "profiles"), os.path.join(work_dir, "profiles.json"),
+        (semuHot2.snapshot_file, semuHot2.journal_file))
+
+
+def wait_for_search_indexes(window):
+    for worker in list(window.search_workers.values()):
+        try:
+            worker.wait()
+        except RuntimeError:
+            pass
+    QApplication.instance().processEvents()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="세무사랑 핫스트링 성능 측정")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="측정할 행 수 목록 (쉼표 구분)")
+    parser.add_argument("--repeat", type=int, default=3, help="각 항목 반복 횟수 (가장 빠른 값 사용)")
+    parser.add_argument("--words", type=int, default=2000, help="키 입력 측정에 쓸 단어 수")
+    parser.add_argument("--skip-excel", action="store_true", help="엑셀 불러오기 측정 생략")
+    parser.add_argument("--output", help="결과 JSON 파일 경로 (생략하면 화면에 출력)")
+    args = parser.parse_args(argv)
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "qt": QT_VERSION_STR,
+            "sizes": sizes,
+            "repeat": args.repeat,
+        },
+        "results": [],
+    }
+    with tempfile.TemporaryDirectory(prefix="semuHot2_bench_") as work_dir:
+        redirect_data_files(work_dir)
+        window = semuHot2.MainWindow()
+        window.show()
+        for rows in sizes:
+            records = make_records(rows)
+            store = semuHot2.CodeStore.from_records(records)
+            entry = {"rows": rows}
+            entry["keystroke"] = bench_keystrokes(store, words=args.words)
+            entry["keystroke_suggest"] = bench_keystrokes(store, words=args.words, suggest=True)
+            entry.update(bench_window(window, records, args.repeat))
+            if not args.skip_excel:
+                entry.update(bench_loading(window, records, work_dir, args.repeat))
+            wait_for_search_indexes(window)
+            report["results"].append(entry)
+            print(f"{rows}행 완료", file=sys.stderr)
+        wait_for_search_indexes(window)
+        semuHot2.edit_journal.close()
+        window.deleteLater()
+        app.processEvents()
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
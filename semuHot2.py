@@ -1,18 +1,48 @@
+import time
+_startup_started = time.perf_counter()  # 시작 시간 측정 기준 (다른 import보다 먼저)
+
 import sys
 import os
 import json
-import keyboard  # 핫스트링 처리 (관리자 권한 필요할 수 있음)
-from openpyxl import load_workbook
+from html import escape
+
+# 데이터 저장소 / 불러오기 / 핫스트링 엔진 (Qt 없이 동작하는 부분)
+import semuHot2_core
+from semuHot2_core import (
+    script_dir, resource_dir, current_json_file, snapshot_file, import_cache_dir, journal_file,
+    profiles_dir, profiles_file, COLUMNS, CodeStore, diff_code_rows, ImportCache, EditJournal,
+    ProfileState, ProfileRegistry, HotstringStats, TrieNode, build_hotstring_trie, patch_hotstring_trie,
+    build_hotstring_tables, OutputBackend, HotstringEngine, read_workbook, write_json_data, read_json_data,
+    DaemonClient, SyncClient, find_workbooks, bulk_import, bulk_import_summary,
+    UsageCounts, usage_report, USAGE_FLUSH_S, write_workbook, write_back_workbook, write_back_path,
+    SearchIndex, collation_key, TableKeys, EditTransactions, parse_cell, edit_cells, paste_edits,
+    replace_edits, revert_edits, commit_edits,
+)
+
+if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()  # exe로 빌드한 경우 일괄 불러오기 작업 프로세스
+
+# 명령줄 모드 (semuHot2.exe daemon / status ...): Qt를 불러오지 않고 바로 처리
+if __name__ == "__main__" and len(sys.argv) > 1 and sys.argv[1] in semuHot2_core.CLI_COMMANDS:
+    sys.exit(semuHot2_core.main(sys.argv[1:]))
 
 # PyQt6 임포트
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-    QTableWidget, QTableWidgetItem, QFileDialog, QMessageBox, QLabel, QHeaderView,
+    QTableView, QAbstractItemView, QTableWidget, QTableWidgetItem, QFileDialog, QMessageBox, QLabel, QHeaderView,
     QToolButton, QDialog, QFormLayout, QKeySequenceEdit, QInputDialog, QMenu,
-    QCheckBox, QStyle, QSizePolicy
+    QCheckBox, QStyle, QSizePolicy, QProgressDialog, QLineEdit, QComboBox, QListWidget, QListWidgetItem,
+    QWidgetAction
+)
+from PyQt6.QtGui import (
+    QShortcut, QKeySequence, QDesktopServices, QIcon, QPainter, QPixmap, QUndoStack, QUndoCommand, QCursor,
+    QIntValidator
+)
+from PyQt6.QtCore import (
+    Qt, QObject, QUrl, QRect, QPoint, QAbstractTableModel, QModelIndex, pyqtSignal, QThread, QTimer, QFileSystemWatcher,
+    QMimeData
 )
-from PyQt6.QtGui import QShortcut, QKeySequence, QDesktopServices, QIcon, QPainter, QPixmap
-from PyQt6.QtCore import Qt, QUrl, QRect
 
 # ---------------------------
 # PyInstaller로 exe를 만들 때 이미지가 보이지 않는 경우 참고
@@ -21,15 +51,44 @@ from PyQt6.QtCore import Qt, QUrl, QRect
 # ---------------------------
 
 # ---------------------------
-# 실행 파일과 같은 폴더 경로 설정
+# 설정 파일 경로 (데이터 파일 경로는 semuHot2_core)
 # ---------------------------
-if getattr(sys, 'frozen', False):
-    script_dir = sys._MEIPASS
-else:
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-
-current_json_file = os.path.join(script_dir, "data.json")   # (데이터 저장용)
 shortcuts_file = os.path.join(script_dir, "shortcuts.json")
+options_file = os.path.join(script_dir, "options.json")    # (단축키 외 환경 설정)
+startup_report_file = os.path.join(script_dir, "startup_report.json")
+resident_file = os.path.join(script_dir, "resident.pid")  # (--prewarm으로 상주 중인 프로그램이 있다는 표시)
+
+# ---------------------------
+# 시작 시간 측정
+# ---------------------------
+# 단계별(import -> QApplication -> 창 생성 -> 표시 -> 데이터 불러오기) 걸린 시간을 기록합니다.
+# 진단 창에 표시되고, --startup-report 옵션으로 실행하면 startup_report.json에도 저장됩니다.
+class StartupTimer:
+    def __init__(self, started):
+        self.started = started
+        self.last = started
+        self.phases = []  # [(단계 이름, 초)]
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, now - self.last))
+        self.last = now
+
+    def to_dict(self):
+        return {
+            "phases_ms": {name: round(seconds * 1000.0, 1) for name, seconds in self.phases},
+            "total_ms": round((self.last - self.started) * 1000.0, 1),
+            "frozen": bool(getattr(sys, 'frozen', False)),
+        }
+
+
+startup_timer = StartupTimer(_startup_started)
+
+import_cache = ImportCache(import_cache_dir)
+
+edit_journal = EditJournal(journal_file, snapshot_file)
+
+profile_registry = ProfileRegistry(profiles_dir, profiles_file, (snapshot_file, journal_file))
 
 # ---------------------------
 # 전역 변수
@@ -42,11 +101,8 @@ have_shown_enable_message = False
 have_shown_disable_message = False
 
 # 엑셀(또는 JSON)에서 읽어온 데이터: 두 시트를 분리해서 저장
-corp_data = []      # [{ "지정": str, "번호": int, "구분": str }, ... ] - 법인 시트
-personal_data = []  # [{ "지정": str, "번호": int, "구분": str }, ... ] - 개인 시트
-
-# 현재 등록된 abbreviation을 추적 (최적화용)
-active_abbreviations = set()
+corp_data = CodeStore()      # 법인 시트
+personal_data = CodeStore()  # 개인 시트
 
 # ---------------------------
 # QKeyCombination 대체용 폴백 함수 (구버전 PyQt6, PyQt5 호환)
@@ -66,33 +122,445 @@ def make_keysequence_from_event(event):
     chord |= key
     return QKeySequence(chord)
 
+# ---------------------------
+# 클립보드 붙여넣기 입력 (Qt 클립보드를 쓰므로 GUI에만 있음, 나머지 입력 방식은 semuHot2_core)
+# ---------------------------
+class ClipboardOutput(QObject, OutputBackend):
+    # 클립보드는 GUI 스레드에서만 다룰 수 있으므로 훅 스레드는 요청만 보내고 바로 돌아갑니다.
+    # (기다리면 그동안 모든 키 처리가 멈춤) 붙여넣기에 쓰는 지우기/Ctrl+V 키는 엔진에 미리 알려서
+    # 사용자 입력으로 처리되지 않게 합니다.
+    # 요청할 때의 엔진 키 번호(key_seq)를 같이 보내고, 붙여넣기 전에 그 사이 사용자가 다른 키를 눌렀으면
+    # 그 요청은 버립니다. (이미 다음 글자가 입력된 뒤에 지우기/붙여넣기를 하면 엉뚱한 글자가 지워짐)
+    # 마지막 붙여넣기가 끝난 뒤 RESTORE_MS 후에 원래 클립보드 내용을 형식별로(텍스트, 서식 있는 텍스트, 이미지 등) 되돌립니다.
+    # (연달아 붙여넣으면 타이머를 다시 시작하므로 되돌리기는 한 번만)
+    # 다른 프로그램이 붙여넣을 때 만들어 주는 형식(지연 렌더링)은 그 시점에 만들어진 데이터만 남습니다.
+    name = "clipboard"
+    RESTORE_MS = 300
+
+    pasteRequested = pyqtSignal(int, str, int)  # (지울 글자 수, 입력할 문자열, 요청할 때의 key_seq)
+
+    def __init__(self, engine=None, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.pasteRequested.connect(self._paste)
+        self._saved = None  # 붙여넣기 전 클립보드 내용 (QMimeData 복사본)
+        self._restore_timer = QTimer(self)
+        self._restore_timer.setSingleShot(True)
+        self._restore_timer.setInterval(self.RESTORE_MS)
+        self._restore_timer.timeout.connect(self._restore)
+
+    def inject(self, erase, text):
+        seq = self.engine.key_seq if self.engine is not None else 0
+        if QThread.currentThread() is self.thread():
+            self._paste(erase, text, seq)
+        else:
+            self.pasteRequested.emit(erase, text, seq)
+
+    def _paste(self, erase, text, seq):
+        import keyboard
+        if self.engine is not None and self.engine.key_seq != seq:
+            self.engine.stats.stale_injections += 1
+            return
+        try:
+            clipboard = QApplication.clipboard()
+            if self._saved is None:
+                self._saved = copy_mime_data(clipboard.mimeData())
+            clipboard.setText(text)
+            if self.engine is not None:
+                self.engine.ignore_keys(["backspace"] * erase + ["v"])
+            if erase:
+                keyboard.write("\b" * erase)
+            keyboard.send("ctrl+v")
+            self._restore_timer.start()
+        except Exception:
+            # 훅 스레드 밖에서 실패하므로 엔진 통계에만 남김
+            if self.engine is not None:
+                self.engine.stats.inject_errors += 1
+
+    def _restore(self):
+        if self._saved is not None:
+            QApplication.clipboard().setMimeData(self._saved)
+            self._saved = None
+
+    def close(self):
+        self._restore_timer.stop()
+        self._restore()
+        self.deleteLater()
+
+
+def copy_mime_data(source):
+    # 클립보드의 QMimeData는 클립보드가 바뀌면 사라지므로 형식별 데이터를 복사해 둠
+    copied = QMimeData()
+    if source is None:
+        return copied
+    for fmt in source.formats():
+        copied.setData(fmt, source.data(fmt))
+    if source.hasImage():
+        copied.setImageData(source.imageData())
+    return copied
+
+
+def create_output_backend(name):
+    if name == "clipboard":
+        return ClipboardOutput(hotstring_engine)
+    return semuHot2_core.create_output_backend(name)
+
+
+hotstring_engine = HotstringEngine()
+
+# 모드별로 미리 컴파일해 둔 트라이 ("법인" / "개인")
+hotstring_tables = {"법인": TrieNode(), "개인": TrieNode()}
+suggestions_enabled = False  # 자동완성 목록 옵션 (켜져 있으면 트라이에 후보 목록까지 만듦)
+usage_counts = None  # 현재 프로필의 사용 빈도 (UsageCounts, 프로필을 불러오기 전에는 None)
+
+
+def usage_for(mode):
+    # {약어: 치환 횟수} (자동완성/검색 순위용)
+    return usage_counts.get(mode) if usage_counts is not None else None
+
+
+def compile_hotstring_tables(mode=None):
+    # 데이터를 불러올 때 두 모드를 모두 컴파일하고, 편집 시에는 해당 모드만 다시 컴파일
+    global hotstring_tables
+    if mode is None:
+        hotstring_tables = build_hotstring_tables(corp_data, personal_data, suggestions_enabled, usage_counts)
+    else:
+        rows = corp_data if mode == "법인" else personal_data
+        hotstring_tables = {**hotstring_tables, mode: build_hotstring_trie(rows, suggestions_enabled, usage_for(mode))}
+
+
+def tables_match_suggestions(tables):
+    # 트라이가 현재 자동완성 옵션대로 만들어졌는지 (후보 목록 유무)
+    return (tables["법인"].top is not None) == suggestions_enabled
+
+# ---------------------------
+# 검색 색인 만들기 (색인 자체는 semuHot2_core.SearchIndex)
+# ---------------------------
+class SearchIndexWorker(QThread):
+    built = pyqtSignal(str, object)  # (모드, SearchIndex)
+
+    def __init__(self, mode, store, parent=None):
+        super().__init__(parent)
+        self.mode = mode
+        self.store = store
+        # 색인은 복사본으로 만듦 (만드는 동안 GUI 스레드에서 행이 추가/삭제될 수 있음)
+        self.snapshot = store.copy()
+
+    def run(self):
+        index = SearchIndex(self.snapshot)
+        index.store = self.store
+        self.built.emit(self.mode, index)
+
+# ---------------------------
+# 테이블 모델 (CodeStore를 그대로 보여주는 가상 모델)
+# ---------------------------
+# 화면에 보이는 셀만 data()로 요청되므로 행 수만큼 아이템을 만들지 않습니다.
+# 모드 전환은 모델 리셋 한 번, 셀 편집은 해당 셀의 dataChanged만 발생합니다.
+class CodeTableModel(QAbstractTableModel):
+    cellEdited = pyqtSignal(int, int, object)   # (행, 열, 이전 값) - 저장소 값이 바뀐 뒤 발생
+    editRejected = pyqtSignal(str)      # 잘못된 입력으로 편집이 취소됐을 때 메시지
+
+    def __init__(self, store=None, parent=None):
+        super().__init__(parent)
+        self.store = store if store is not None else CodeStore()
+        self.rows = None  # 검색 중일 때 화면 행 -> 저장소 행 목록 (None이면 전체)
+        self._view_rows = None  # rows의 역방향 (저장소 행 -> 화면 행, 필요할 때 만듦)
+
+    def set_store(self, store, rows=None):
+        self.beginResetModel()
+        self.store = store
+        self.rows = rows
+        self._view_rows = None
+        self.endResetModel()
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self.rows = rows
+        self._view_rows = None
+        self.endResetModel()
+
+    def store_row(self, row):
+        return row if self.rows is None else self.rows[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.store) if self.rows is None else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return str(self.store.get(self.store_row(index.row()), index.column()))
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return COLUMNS[section]
+        return str(self.store_row(section) + 1)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEditable
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.EditRole or not index.isValid():
+            return False
+        row, column = self.store_row(index.row()), index.column()
+        try:
+            value = parse_cell(column, value)
+        except ValueError as e:
+            self.editRejected.emit(str(e))
+            return False
+        old = self.store.get(row, column)
+        if old == value:
+            return False
+        self.store.set(row, column, value)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+        self.cellEdited.emit(row, column, old)
+        return True
+
+    def set_cell(self, store, row, column, value):
+        # 실행 취소/다시 실행용: 검증 없이 저장소 값을 바꾸고, 화면에 보이는 셀이면 알림 (cellEdited는 보내지 않음)
+        store.set(row, column, value)
+        if store is not self.store:
+            return
+        if self.rows is None:
+            view_row = row
+        else:
+            if self._view_rows is None:
+                self._view_rows = {store_row: i for i, store_row in enumerate(self.rows)}
+            view_row = self._view_rows.get(row)
+            if view_row is None:
+                return  # 검색 결과에 없는 행
+        index = self.index(view_row, column)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+
+    def apply_diff(self, store, updates, inserts, deletes):
+        # diff_code_rows 결과를 store에 반영. 화면에 전체 표시 중인 저장소면 바뀐 행만 알립니다.
+        # (검색 중이거나 다른 모드의 저장소면 저장소만 고치고, 화면은 호출한 쪽에서 갱신)
+        visible = store is self.store and self.rows is None
+        roles = [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole]
+        for row, number, category in updates:
+            store.set(row, 1, number)
+            store.set(row, 2, category)
+            if visible:
+                self.dataChanged.emit(self.index(row, 1), self.index(row, 2), roles)
+        # 연속된 행끼리 묶어서 뒤에서부터 삭제 (앞쪽 행 번호가 밀리지 않도록)
+        ranges = []
+        for row in deletes:
+            if ranges and ranges[-1][1] == row - 1:
+                ranges[-1][1] = row
+            else:
+                ranges.append([row, row])
+        for start, end in reversed(ranges):
+            if visible:
+                self.beginRemoveRows(QModelIndex(), start, end)
+            store.remove_rows(start, end)
+            if visible:
+                self.endRemoveRows()
+        if inserts:
+            first = len(store)
+            if visible:
+                self.beginInsertRows(QModelIndex(), first, first + len(inserts) - 1)
+            for abbrev, number, category in inserts:
+                store.append(abbrev, number, category)
+            if visible:
+                self.endInsertRows()
+
 # ---------------------------
 # TransparentTableWidget 클래스
 # ---------------------------
-class TransparentTableWidget(QTableWidget):
+class TransparentTableWidget(QTableView):
     def __init__(self, parent=None):
         super().__init__(parent)
         # Hyung.png 파일을 배경 이미지로 로드합니다.
-        bg_image_path = os.path.join(script_dir, "Hyung.png")
-        self.bg_pixmap = QPixmap(bg_image_path)
+        # (이미지는 처음 그릴 때 불러옴 - 배경을 끈 상태면 아예 읽지 않음)
+        self.bg_image_path = os.path.join(resource_dir, "Hyung.png")
+        self.bg_pixmap = None
+        self.watermark_enabled = True
+        # viewport 크기별로 스케일 + 10% 투명도를 미리 적용해 둔 배경 (크기가 바뀔 때만 다시 생성)
+        self._bg_cache = None
+        self._bg_cache_size = None
+        self._bg_cache_pos = (0, 0)
         # 테이블의 배경을 투명하게 만들기 위해 기본 배경은 제거합니다.
         self.setStyleSheet("background: transparent;")
-    
+
+    def set_watermark_enabled(self, enabled):
+        self.watermark_enabled = enabled
+        if not enabled:
+            self._bg_cache = None
+            self._bg_cache_size = None
+        self.viewport().update()
+
+    def _cached_background(self):
+        size = self.viewport().size()
+        if self._bg_cache is None or self._bg_cache_size != size:
+            # 원본 이미지 비율을 유지하면서 viewport 크기에 맞게 스케일
+            if self.bg_pixmap is None:
+                self.bg_pixmap = QPixmap(self.bg_image_path)
+            scaled = self.bg_pixmap.scaled(size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+            blended = QPixmap(scaled.size())
+            blended.fill(Qt.GlobalColor.transparent)
+            p = QPainter(blended)
+            p.setOpacity(0.1)
+            p.drawPixmap(0, 0, scaled)
+            p.end()
+            self._bg_cache = blended
+            self._bg_cache_size = size
+            # 중앙에 배치
+            self._bg_cache_pos = ((size.width() - blended.width()) // 2, (size.height() - blended.height()) // 2)
+        return self._bg_cache
+
+    def resizeEvent(self, event):
+        self._bg_cache = None
+        super().resizeEvent(event)
+
     def paintEvent(self, event):
-        painter = QPainter(self.viewport())
-        # 10% 투명도로 배경 이미지 그리기
-        painter.setOpacity(0.1)
-        rect = self.viewport().rect()
-        # 원본 이미지 비율을 유지하면서 viewport 크기에 맞게 스케일
-        scaled_pixmap = self.bg_pixmap.scaled(rect.size(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-        # 중앙에 배치
-        x = (rect.width() - scaled_pixmap.width()) // 2
-        y = (rect.height() - scaled_pixmap.height()) // 2
-        painter.drawPixmap(x, y, scaled_pixmap)
-        painter.setOpacity(1.0)
+        bg = self._cached_background() if self.watermark_enabled else None
+        if bg is not None and not bg.isNull():
+            x, y = self._bg_cache_pos
+            # 다시 그려야 하는 영역에 걸친 부분만 복사
+            exposed = event.rect().intersected(QRect(x, y, bg.width(), bg.height()))
+            if not exposed.isEmpty():
+                painter = QPainter(self.viewport())
+                painter.drawPixmap(exposed, bg, exposed.translated(-x, -y))
+                painter.end()
         # 기본 그리기 (셀 및 내용)
         super().paintEvent(event)
 
+# ---------------------------
+# 엑셀 불러오기 (작업 스레드 + 스트리밍 읽기)
+# ---------------------------
+
+class ExcelImportWorker(QThread):
+    progress = pyqtSignal(int, int)      # (읽은 행 수, 전체 예상 행 수 - 모르면 0)
+    sheetMissing = pyqtSignal(str)       # 없는 시트 이름
+    loaded = pyqtSignal(object)          # {"법인": CodeStore, "개인": CodeStore, "tables": {...}}
+    failed = pyqtSignal(str)
+
+    def __init__(self, file_path, parent=None, build_tables=True):
+        super().__init__(parent)
+        self.file_path = file_path
+        self.build_tables = build_tables  # 변경 감시로 다시 읽을 때는 트라이를 통째로 만들지 않음
+
+    def run(self):
+        row_errors = []
+        try:
+            result = read_workbook(
+                self.file_path, import_cache,
+                on_progress=self.progress.emit,
+                on_sheet_missing=self.sheetMissing.emit,
+                interrupted=self.isInterruptionRequested,
+                row_errors=row_errors,
+            )
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        if result is not None:
+            result["row_errors"] = row_errors  # [(시트, 엑셀 행 번호, 이유)] - 건너뛴 행
+            self.finish(result)
+
+    def finish(self, result):
+        result["path"] = self.file_path
+        if not self.build_tables:
+            self.loaded.emit(result)
+            return
+        try:
+            # 핫스트링 트라이도 여기서 만들어 GUI 스레드의 일을 줄입니다.
+            result["tables"] = build_hotstring_tables(result["법인"], result["개인"], suggestions_enabled, usage_counts)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.loaded.emit(result)
+
+
+class ExcelExportWorker(QThread):
+    # 엑셀 내보내기 / 원본 엑셀에 반영 (행을 흘려 쓰므로 큰 시트도 메모리가 늘지 않고 화면이 멈추지 않음)
+    progress = pyqtSignal(int, int)  # (쓴 행 수, 전체 행 수)
+    exported = pyqtSignal(object)    # {"path", "rows"} 또는 {"path", "updated", "inserted", "deleted"}
+    failed = pyqtSignal(str)
+
+    def __init__(self, path, stores, source=None, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.stores = stores  # 코드표 복사본 (내보내는 동안 편집해도 영향 없음)
+        self.source = source  # 원본 엑셀 (있으면 바뀐 행만 반영)
+
+    def run(self):
+        try:
+            if self.source is None:
+                result = write_workbook(
+                    self.path, self.stores,
+                    on_progress=self.progress.emit, interrupted=self.isInterruptionRequested)
+            else:
+                result = write_back_workbook(
+                    self.source, self.stores, self.path,
+                    on_progress=self.progress.emit, interrupted=self.isInterruptionRequested)
+        except Exception as e:
+            self.failed.emit(str(e) or type(e).__name__)
+            return
+        if result is not None:
+            result["path"] = self.path
+            self.exported.emit(result)
+
+
+class BulkImportWorker(QThread):
+    # 폴더 일괄 불러오기 (파싱은 bulk_import가 프로세스 풀에서, 이 스레드는 결과를 모아 저장)
+    progress = pyqtSignal(int, int)  # (끝난 파일 수, 전체 파일 수)
+    loaded = pyqtSignal(object)      # bulk_import 보고서
+    failed = pyqtSignal(str)
+
+    def __init__(self, paths, into=None, parent=None):
+        super().__init__(parent)
+        self.paths = paths
+        self.into = into
+
+    def run(self):
+        try:
+            report = bulk_import(
+                self.paths, profile_registry, into=self.into,
+                on_progress=self.progress.emit,
+                interrupted=self.isInterruptionRequested,
+            )
+        except Exception as e:
+            self.failed.emit(str(e) or type(e).__name__)
+            return
+        self.loaded.emit(report)
+
+
+class SyncWorker(QThread):
+    # 공용 코드표 서버에서 변경분을 받아 코드표 복사본에 적용 (네트워크 대기 동안 화면이 멈추지 않도록)
+    pulled = pyqtSignal(object)  # {"profile", "url", "stores", "version", "changed", "base"}
+    failed = pyqtSignal(str)
+
+    def __init__(self, profile, url, stores, version, base, parent=None):
+        super().__init__(parent)
+        self.profile = profile
+        self.url = url
+        self.stores = stores  # 현재 코드표 복사본 (이 스레드에서만 고침)
+        self.version = version
+        self.base = base  # 복사본을 뜰 때의 (저널 번호, data_generation) - 그 사이 고친 내용이 있는지 확인용
+
+    def run(self):
+        try:
+            stores, version, changed = SyncClient(self.url).pull(self.stores, self.version)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.pulled.emit({
+            "profile": self.profile, "url": self.url,
+            "stores": stores, "version": version, "changed": changed, "base": self.base,
+        })
+
 # ---------------------------
 # 토글 스위치 (법인/개인)
 # ---------------------------
@@ -160,11 +628,57 @@ class SingleChordKeySequenceEdit(QKeySequenceEdit):
         self.setKeySequence(keyseq)
         event.accept()
 
+# ---------------------------
+# 실행 취소 (트랜잭션 자체는 semuHot2_core.EditTransactions)
+# ---------------------------
+class EditCommand(QUndoCommand):
+    # 행은 행 ID로 보관 (원본 파일 변경으로 행이 지워지거나 밀려도 실행 취소 기록이 맞도록)
+    def __init__(self, window, changes, label):
+        super().__init__(label)
+        self.window = window
+        self.changes = changes  # [(모드, 행 ID, 열, 이전 값, 새 값)]
+        self.applied = True  # push할 때는 이미 반영된 상태
+
+    def redo(self):
+        if self.applied:
+            return
+        self.window.apply_changes(self.changes, undo=False)
+        self.applied = True
+
+    def undo(self):
+        self.window.apply_changes(self.changes, undo=True)
+        self.applied = False
+
+
+class ReplaceDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("찾아 바꾸기")
+        layout = QFormLayout(self)
+        self.column_combo = QComboBox()
+        self.column_combo.addItems(COLUMNS)
+        self.find_edit = QLineEdit()
+        self.replace_edit = QLineEdit()
+        self.visible_only = QCheckBox("검색 결과에 보이는 행만")
+        layout.addRow("열:", self.column_combo)
+        layout.addRow("찾을 내용:", self.find_edit)
+        layout.addRow("바꿀 내용:", self.replace_edit)
+        layout.addRow(self.visible_only)
+
+        btn_layout = QHBoxLayout()
+        btn_ok = QPushButton("모두 바꾸기")
+        btn_cancel = QPushButton("취소")
+        btn_ok.clicked.connect(self.accept)
+        btn_cancel.clicked.connect(self.reject)
+        btn_layout.addWidget(btn_ok)
+        btn_layout.addWidget(btn_cancel)
+        layout.addRow(btn_layout)
+
 # ---------------------------
 # 단축키 설정 다이얼로그
 # ---------------------------
 class SettingsDialog(QDialog):
-    def __init__(self, current_shortcuts, parent=None):
+    def __init__(self, current_shortcuts, current_options=None, parent=None):
         super().__init__(parent)
         self.setWindowTitle("단축키 설정")
         self.current_shortcuts = current_shortcuts
@@ -175,6 +689,14 @@ class SettingsDialog(QDialog):
             layout.addRow(f"{key}:", key_edit)
             self.edits[key] = key_edit
 
+        # 단축키 외 옵션 (체크박스)
+        self.option_checks = {}
+        for key, value in (current_options or {}).items():
+            check = QCheckBox(key)
+            check.setChecked(bool(value))
+            layout.addRow(check)
+            self.option_checks[key] = check
+
         btn_layout = QHBoxLayout()
         btn_ok = QPushButton("확인")
         btn_cancel = QPushButton("취소")
@@ -190,17 +712,206 @@ class SettingsDialog(QDialog):
             new_shortcuts[key] = widget.keySequence()
         return new_shortcuts
 
+    def get_options(self):
+        return {key: check.isChecked() for key, check in self.option_checks.items()}
+
+# ---------------------------
+# 핫스트링 진단 다이얼로그
+# ---------------------------
+class DiagnosticsDialog(QDialog):
+    def __init__(self, stats, parent=None, build_usage_report=None):
+        super().__init__(parent)
+        self.setWindowTitle("핫스트링 진단")
+        self.resize(520, 420)
+        self.stats = stats
+        self.build_usage_report = build_usage_report  # 사용 빈도 보고서를 만드는 함수 (없으면 버튼 숨김)
+        layout = QVBoxLayout(self)
+
+        self.histogram_table = QTableWidget(len(HotstringStats.NAMES), 6)
+        self.histogram_table.setHorizontalHeaderLabels(["횟수", "평균(µs)", "p50", "p95", "p99", "최대"])
+        self.histogram_table.setVerticalHeaderLabels(["키 처리", "훅 지연", "일치 확인", "입력 전송", "전체"])
+        self.histogram_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.histogram_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.histogram_table)
+
+        layout.addWidget(QLabel("가장 느렸던 치환"))
+        self.slowest_table = QTableWidget(0, 2)
+        self.slowest_table.setHorizontalHeaderLabels(["지정", "전체(µs)"])
+        self.slowest_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.slowest_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.slowest_table)
+
+        self.since_label = QLabel("")
+        layout.addWidget(self.since_label)
+        startup = startup_timer.to_dict()
+        phases = " / ".join(f"{name} {ms}ms" for name, ms in startup["phases_ms"].items())
+        self.startup_label = QLabel(f"시작 시간: {phases} (합계 {startup['total_ms']}ms)")
+        self.startup_label.setWordWrap(True)
+        layout.addWidget(self.startup_label)
+
+        btn_layout = QHBoxLayout()
+        btn_refresh = QPushButton("새로고침")
+        btn_reset = QPushButton("초기화")
+        btn_export = QPushButton("JSON 내보내기")
+        btn_close = QPushButton("닫기")
+        btn_refresh.clicked.connect(self.refresh)
+        btn_reset.clicked.connect(self.reset_stats)
+        btn_usage = QPushButton("사용 빈도 보고서")
+        btn_export.clicked.connect(self.export_json)
+        btn_usage.clicked.connect(self.export_usage_report)
+        btn_usage.setVisible(build_usage_report is not None)
+        btn_close.clicked.connect(self.accept)
+        for btn in (btn_refresh, btn_reset, btn_export, btn_usage, btn_close):
+            btn_layout.addWidget(btn)
+        layout.addLayout(btn_layout)
+
+        # 열려 있는 동안 1초마다 갱신
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start(1000)
+        self.refresh()
+
+    def refresh(self):
+        data = self.stats.to_dict()
+        for row, name in enumerate(HotstringStats.NAMES):
+            h = data["histograms"][name]
+            values = [h["count"], h["mean_us"], h["p50_us"], h["p95_us"], h["p99_us"], h["max_us"]]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(str(value))
+                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                self.histogram_table.setItem(row, column, item)
+        self.slowest_table.setRowCount(len(data["slowest"]))
+        for row, entry in enumerate(data["slowest"]):
+            for column, value in enumerate((entry["지정"], entry["total_us"])):
+                item = QTableWidgetItem(str(value))
+                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                self.slowest_table.setItem(row, column, item)
+        self.since_label.setText(
+            f"측정 시작: {data['since']} / 입력 방식: {data['backend']} / 입력 실패: {data['inject_errors']}회"
+            f" / 늦어서 버린 붙여넣기: {data['stale_injections']}회")
+
+    def reset_stats(self):
+        self.stats.reset()
+        self.refresh()
+
+    def export_json(self):
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "진단 결과 저장",
+            os.path.join(script_dir, "hotstring_stats.json"),
+            "JSON Files (*.json);;All Files (*)"
+        )
+        if not file_path:
+            return
+        try:
+            with open(file_path, "w", encoding="utf-8") as f:
+                json.dump({**self.stats.to_dict(), "startup": startup_timer.to_dict()}, f, ensure_ascii=False, indent=4)
+        except Exception as e:
+            QMessageBox.critical(self, "오류", f"진단 결과 저장 실패: {str(e)}")
+
+    def export_usage_report(self):
+        # 자주 쓰는 코드 / 한 번도 치환되지 않은 코드를 JSON으로 저장
+        report = self.build_usage_report()
+        if report is None:
+            QMessageBox.information(self, "알림", "불러온 프로필이 없습니다.")
+            return
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "사용 빈도 보고서 저장",
+            os.path.join(script_dir, "usage_report.json"),
+            "JSON Files (*.json);;All Files (*)"
+        )
+        if not file_path:
+            return
+        try:
+            with open(file_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=4)
+        except Exception as e:
+            QMessageBox.critical(self, "오류", f"보고서 저장 실패: {str(e)}")
+            return
+        lines = [
+            f"{mode}: 코드 {m['codes']}개 중 {m['used']}개 사용 (치환 {m['hits']}회), 사용 안 함 {len(m['dead'])}개"
+            for mode, m in report["modes"].items()
+        ]
+        QMessageBox.information(self, "사용 빈도 보고서", f"기록 시작: {report['since'] or '-'}\n" + "\n".join(lines))
+
+# ---------------------------
+# 자동완성 목록 (입력 중인 약어의 후보)
+# ---------------------------
+# 다른 프로그램(세무사랑)에 입력하는 중에 캐럿 아래에 뜨는 작은 목록입니다.
+# 포커스를 가져오지 않으므로 계속 입력할 수 있고, 후보는 트라이 노드에 미리 계산된 top을 그대로 씁니다.
+def caret_position():
+    # 입력 중인 프로그램의 캐럿 아래 화면 좌표 (Windows). 알 수 없으면 마우스 위치
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class GUITHREADINFO(ctypes.Structure):
+            _fields_ = [
+                ("cbSize", wintypes.DWORD), ("flags", wintypes.DWORD),
+                ("hwndActive", wintypes.HWND), ("hwndFocus", wintypes.HWND), ("hwndCapture", wintypes.HWND),
+                ("hwndMenuOwner", wintypes.HWND), ("hwndMoveSize", wintypes.HWND), ("hwndCaret", wintypes.HWND),
+                ("rcCaret", wintypes.RECT),
+            ]
+
+        info = GUITHREADINFO(cbSize=ctypes.sizeof(GUITHREADINFO))
+        user32 = ctypes.windll.user32
+        if user32.GetGUIThreadInfo(0, ctypes.byref(info)) and info.hwndCaret:
+            point = wintypes.POINT(info.rcCaret.left, info.rcCaret.bottom)
+            if user32.ClientToScreen(info.hwndCaret, ctypes.byref(point)):
+                # Windows 좌표는 실제 픽셀, Qt 좌표는 배율이 적용된 논리 픽셀
+                ratio = QApplication.primaryScreen().devicePixelRatio()
+                return QPoint(int(point.x / ratio), int(point.y / ratio))
+    return QCursor.pos() + QPoint(0, 20)
+
+
+class SuggestionPopup(QLabel):
+    def __init__(self):
+        super().__init__(None, Qt.WindowType.ToolTip | Qt.WindowType.FramelessWindowHint
+                         | Qt.WindowType.WindowStaysOnTopHint | Qt.WindowType.WindowDoesNotAcceptFocus)
+        self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating)
+        self.setTextFormat(Qt.TextFormat.RichText)
+        self.setStyleSheet("background-color: #ffffff; border: 1px solid #8e44ad; padding: 4px; color: #2c3e50;")
+
+    def show_suggestions(self, top, depth):
+        # top: [(지정, 번호, 구분)], depth: 입력한 글자 수 (목록을 닫을 때는 top이 None)
+        if top is None:
+            self.hide()
+            return
+        rows = "".join(
+            f"<tr><td><b>{escape(abbrev[:depth])}</b>{escape(abbrev[depth:])}</td>"
+            f"<td align='right'>&nbsp;&nbsp;{escape(number)}</td><td>&nbsp;&nbsp;{escape(category)}</td></tr>"
+            for abbrev, number, category in top
+        )
+        self.setText(f"<table cellspacing='0'>{rows}</table>")
+        self.adjustSize()
+        if not self.isVisible():
+            self.move(caret_position())
+            self.show()
+
 # ---------------------------
 # 메인 윈도우
 # ---------------------------
 class MainWindow(QMainWindow):
-    def __init__(self):
+    persistenceFailed = pyqtSignal(str)
+    persisted = pyqtSignal()  # 스냅샷 쓰기가 끝남 (작업 스레드 -> GUI 스레드)
+    suggestionsRequested = pyqtSignal(object, int)  # 자동완성 후보 (훅 스레드 -> GUI 스레드)
+
+    JOURNAL_COMMIT_MS = 500  # 편집 기록을 모아서 저장하는 간격
+    SOURCE_RELOAD_MS = 1000  # 원본 파일이 바뀐 뒤 (저장이 끝나길 기다렸다가) 다시 읽기까지의 간격
+    SYNC_INTERVAL_MS = 60 * 1000  # 공용 코드표 서버에서 변경분을 받아 오는 간격
+
+    def __init__(self, defer_load=False, keep_resident=False):
+        # defer_load: 창을 먼저 띄우고 데이터는 이벤트 루프가 돈 뒤에 불러옴
+        # keep_resident: 창을 닫아도 종료하지 않고 숨김 (--prewarm 상주 모드)
         super().__init__()
+        self.keep_resident = keep_resident
+        self.exiting = False
         self.setWindowTitle("세무사랑 핫스트링")
         self.resize(800, 600)
 
         # 프로그램 아이콘 설정 (같은 폴더의 Hyung.png)
-        program_icon_path = os.path.join(script_dir, "Hyung.png")
+        program_icon_path = os.path.join(resource_dir, "Hyung.png")
         self.setWindowIcon(QIcon(program_icon_path))
 
         # 기본 단축키
@@ -209,6 +920,9 @@ class MainWindow(QMainWindow):
             "핫스트링 활성화": "Ctrl+W",
             "현재 카테고리": "Ctrl+Tab",
             "찾기": "Ctrl+F",
+            "찾아 바꾸기": "Ctrl+H",
+            "실행 취소": "Ctrl+Z",
+            "다시 실행": "Ctrl+Y",
             "프로그램 종료": "Ctrl+Q"
         }
         if os.path.exists(shortcuts_file):
@@ -224,7 +938,56 @@ class MainWindow(QMainWindow):
         else:
             self.shortcuts = {k: QKeySequence(v) if v else QKeySequence() for k, v in default_shortcuts.items()}
 
-        self.updating_table = False
+        # 기본 옵션
+        default_options = {
+            "배경 이미지 표시": True,   # 원격 데스크톱 등 느린 환경에서는 끄는 것을 권장
+            "클립보드 붙여넣기로 입력": False,  # 번호를 한 글자씩 치지 않고 Ctrl+V로 입력
+            "입력 중 자동완성 목록 표시": False,  # 약어를 두 글자 이상 치면 후보 지정/번호/구분을 보여 줌
+        }
+        self.options = dict(default_options)
+        if os.path.exists(options_file):
+            try:
+                with open(options_file, "r", encoding="utf-8") as f:
+                    loaded = json.load(f)
+                for key in default_options:
+                    if key in loaded:
+                        self.options[key] = loaded[key]
+            except Exception:
+                pass
+
+        self.import_worker = None  # 엑셀 불러오기 작업 스레드 (진행 중일 때만)
+        self.export_worker = None  # 엑셀 내보내기 작업 스레드 (진행 중일 때만)
+
+        # 편집 저널 그룹 커밋용 타이머 (첫 편집 후 JOURNAL_COMMIT_MS 뒤에 한 번에 저장)
+        self.journal_timer = QTimer(self)
+        self.journal_timer.setSingleShot(True)
+        self.journal_timer.setInterval(self.JOURNAL_COMMIT_MS)
+        self.journal_timer.timeout.connect(self.commit_journal)
+        self.persistenceFailed.connect(lambda msg: QMessageBox.critical(self, "오류", f"데이터 저장 실패: {msg}"))
+        self.persisted.connect(self.sync_daemon)
+
+        # 불러온 원본 파일(엑셀/JSON) 변경 감시 - 바뀌면 다시 읽어 달라진 행만 반영
+        self.source_watcher = QFileSystemWatcher(self)
+        self.source_watcher.fileChanged.connect(lambda _path: self.source_timer.start())
+        self.source_timer = QTimer(self)
+        self.source_timer.setSingleShot(True)
+        self.source_timer.setInterval(self.SOURCE_RELOAD_MS)
+        self.source_timer.timeout.connect(self.reload_source)
+        self.source_worker = None  # 원본 엑셀을 다시 읽는 중인 작업 스레드
+
+        # 사용 빈도 - 치환 횟수는 메모리에 모았다가 USAGE_FLUSH_S마다 파일에 씀
+        self.usage_timer = QTimer(self)
+        self.usage_timer.setInterval(USAGE_FLUSH_S * 1000)
+        self.usage_timer.timeout.connect(self.flush_usage_counts)
+        self.usage_timer.start()
+
+        # 공용 코드표 동기화 - 프로필에 서버가 설정돼 있으면 주기적으로 변경분만 받아 반영
+        self.sync_timer = QTimer(self)
+        self.sync_timer.setInterval(self.SYNC_INTERVAL_MS)
+        self.sync_timer.timeout.connect(self.start_sync)
+        self.sync_worker = None
+        self.sync_again = False  # 받는 동안 이 PC에서 코드표가 바뀌어 결과를 버렸으면 끝나는 대로 다시 받음
+        self.data_generation = 0  # 저널에 남지 않는 변경(원본 파일 반영, 새로 불러오기)마다 증가
 
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -240,11 +1003,44 @@ class MainWindow(QMainWindow):
         load_menu = QMenu()
         action_excel = load_menu.addAction("엑셀 불러오기")
         action_json = load_menu.addAction("JSON 불러오기")
+        load_menu.addSeparator()
+        action_export_json = load_menu.addAction("JSON 내보내기")
+        action_export_excel = load_menu.addAction("엑셀 내보내기...")
+        action_export_excel.triggered.connect(self.export_excel_file)
+        action_write_back = load_menu.addAction("원본 엑셀에 반영...")
+        action_write_back.triggered.connect(self.write_back_excel)
+        load_menu.addSeparator()
+        action_new_profile = load_menu.addAction("새 프로필...")
+        action_new_profile.triggered.connect(self.create_profile)
+        action_bulk = load_menu.addAction("폴더 일괄 불러오기...")
+        action_bulk.triggered.connect(self.bulk_import_folder)
+        action_sync = load_menu.addAction("공용 코드표 동기화...")
+        action_sync.triggered.connect(self.configure_sync)
         action_excel.triggered.connect(self.load_excel)
         action_json.triggered.connect(self.load_json_file)
+        action_export_json.triggered.connect(self.export_json_file)
         self.btn_load.setMenu(load_menu)
         top_layout.addWidget(self.btn_load)
 
+        # [편집] 버튼 - 실행 취소 / 다시 실행 / 찾아 바꾸기
+        self.transactions = EditTransactions(self.commit_transaction)
+        self.undo_stack = QUndoStack(self)
+        self.btn_edit = QPushButton("편집")
+        edit_menu = QMenu()
+        self.action_undo = edit_menu.addAction("실행 취소")
+        self.action_redo = edit_menu.addAction("다시 실행")
+        edit_menu.addSeparator()
+        action_replace = edit_menu.addAction("찾아 바꾸기...")
+        self.action_undo.triggered.connect(self.undo_stack.undo)
+        self.action_redo.triggered.connect(self.undo_stack.redo)
+        action_replace.triggered.connect(self.open_replace_dialog)
+        self.undo_stack.canUndoChanged.connect(self.action_undo.setEnabled)
+        self.undo_stack.canRedoChanged.connect(self.action_redo.setEnabled)
+        self.action_undo.setEnabled(False)
+        self.action_redo.setEnabled(False)
+        self.btn_edit.setMenu(edit_menu)
+        top_layout.addWidget(self.btn_edit)
+
         # 핫스트링 스위치
         self.switch_hotstring = ToggleSwitch(on_text="활성화", off_text="비활성화")
         self.switch_hotstring.setChecked(hotstring_active)
@@ -257,24 +1053,102 @@ class MainWindow(QMainWindow):
         self.switch_category.stateChanged.connect(self.on_category_switch_changed)
         top_layout.addWidget(self.switch_category)
 
+        # 프로필(거래처) 선택 - 불러오기/편집은 선택된 프로필에 적용
+        self.profile_name = None  # 현재 불러온 프로필 (데이터를 불러오기 전에는 None)
+        self.profile_combo = QComboBox()
+        self.profile_combo.setToolTip("프로필")
+        self.profile_combo.addItems(profile_registry.names())
+        self.profile_combo.setCurrentText(profile_registry.active)
+        self.profile_combo.activated.connect(
+            lambda index: self.activate_profile(self.profile_combo.itemText(index)))
+        top_layout.addWidget(self.profile_combo)
+        self.sync_label = QLabel("")  # 공용 코드표 동기화 상태 (설정된 프로필에서만 표시)
+        top_layout.addWidget(self.sync_label)
+
         # [설정] 아이콘 버튼 - 같은 폴더의 settingIcon.png 사용
         top_layout.addStretch()
         self.btn_settings = QToolButton()
-        setting_icon_path = os.path.join(script_dir, "settingIcon.png")
+        setting_icon_path = os.path.join(resource_dir, "settingIcon.png")
         self.btn_settings.setIcon(QIcon(setting_icon_path))
         self.btn_settings.setToolTip("단축키 설정")
         self.btn_settings.clicked.connect(self.open_settings_dialog)
+
+        # [진단] 버튼 - 핫스트링 지연 시간 통계
+        self.btn_diagnostics = QToolButton()
+        self.btn_diagnostics.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_FileDialogInfoView))
+        self.btn_diagnostics.setToolTip("핫스트링 진단")
+        self.btn_diagnostics.clicked.connect(self.open_diagnostics_dialog)
+        top_layout.addWidget(self.btn_diagnostics)
         top_layout.addWidget(self.btn_settings)
 
         # 테이블 - TransparentTableWidget 사용 (배경에 투명 이미지)
+        self.model = CodeTableModel(corp_data if current_mode == "법인" else personal_data, self)
+        self.model.cellEdited.connect(self.on_cell_changed)
+        self.model.editRejected.connect(self.on_edit_rejected)
         self.table = TransparentTableWidget()
-        self.table.setColumnCount(3)
-        self.table.setHorizontalHeaderLabels(["지정", "번호", "구분"])
+        self.table.set_watermark_enabled(self.options["배경 이미지 표시"])
+        self.apply_output_option()
+        self.suggestion_popup = SuggestionPopup()
+        self.suggestionsRequested.connect(self.suggestion_popup.show_suggestions)
+        self.apply_suggestion_option()
+        self.table.setModel(self.model)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.table.setEditTriggers(QTableWidget.EditTrigger.DoubleClicked | QTableWidget.EditTrigger.SelectedClicked)
-        self.table.cellChanged.connect(self.on_cell_changed)
+        # 행 높이를 고정해 두면 행 수가 많아도 헤더가 행마다 크기를 계산하지 않습니다.
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.DoubleClicked | QAbstractItemView.EditTrigger.SelectedClicked)
         main_layout.addWidget(self.table)
 
+        # 검색창 (입력하는 대로 테이블을 걸러서 순위대로 보여줌)
+        self.search_indexes = {}  # 모드 -> SearchIndex
+        self.search_workers = {}  # 모드 -> 색인을 만드는 중인 SearchIndexWorker
+        self.search_dirty_rows = {}  # 모드 -> 색인을 만드는 동안 편집된 행
+        search_layout = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("찾기 (지정 / 번호 / 구분, 초성 검색 가능)")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.textChanged.connect(self.on_search_changed)
+        self.search_edit.returnPressed.connect(self.select_first_result)
+        self.search_count_label = QLabel("")
+        search_layout.addWidget(self.search_edit)
+        search_layout.addWidget(self.search_count_label)
+
+        # 정렬 / 필터 - 헤더를 누르면 오름차순 -> 내림차순 -> 원래 순서, 구분은 여러 개 선택, 번호는 범위
+        self.table_keys = {}  # 모드 -> TableKeys
+        self.sort_column = None  # 0/1/2, "usage"(자주 쓰는 순) 또는 None(원래 순서)
+        self.sort_descending = False
+        self.category_filter = set()  # 보여 줄 구분 (비어 있으면 전체)
+        header = self.table.horizontalHeader()
+        header.setSectionsClickable(True)
+        header.sectionClicked.connect(self.cycle_sort)
+        self.number_min = QLineEdit()
+        self.number_max = QLineEdit()
+        for edit, text in ((self.number_min, "번호 부터"), (self.number_max, "번호 까지")):
+            edit.setPlaceholderText(text)
+            edit.setValidator(QIntValidator(edit))
+            edit.setFixedWidth(80)
+            edit.setClearButtonEnabled(True)
+            edit.textChanged.connect(self.refresh_view)
+            search_layout.addWidget(edit)
+        self.btn_filter = QToolButton()
+        self.btn_filter.setText("구분")
+        self.btn_filter.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup)
+        filter_menu = QMenu(self.btn_filter)
+        self.category_list = QListWidget()  # 메뉴 안의 목록이라 여러 개를 눌러도 닫히지 않음
+        self.category_list.setMaximumHeight(300)
+        self.category_list.itemChanged.connect(self.on_category_item_changed)
+        list_action = QWidgetAction(filter_menu)
+        list_action.setDefaultWidget(self.category_list)
+        filter_menu.addAction(list_action)
+        filter_menu.addSeparator()
+        self.action_usage_sort = filter_menu.addAction("자주 쓰는 순으로 정렬")
+        self.action_usage_sort.setCheckable(True)
+        self.action_usage_sort.toggled.connect(self.toggle_usage_sort)
+        filter_menu.addAction("필터/정렬 해제").triggered.connect(self.clear_view_filters)
+        filter_menu.aboutToShow.connect(self.fill_category_list)
+        self.btn_filter.setMenu(filter_menu)
+        search_layout.addWidget(self.btn_filter)
+        main_layout.insertLayout(1, search_layout)
+
         # 하단 라벨
         author_label = ClickableLabel("by 박종석 세무회계", "https://blog.naver.com/jstax220")
         author_label.setAlignment(Qt.AlignmentFlag.AlignRight)
@@ -291,9 +1165,41 @@ class MainWindow(QMainWindow):
         self.shortcut_find.activated.connect(self.search_table)
         self.shortcut_exit = QShortcut(self.shortcuts["프로그램 종료"], self)
         self.shortcut_exit.activated.connect(self.exit_program)
+        self.shortcut_replace = QShortcut(self.shortcuts["찾아 바꾸기"], self)
+        self.shortcut_replace.activated.connect(self.open_replace_dialog)
+        self.shortcut_undo = QShortcut(self.shortcuts["실행 취소"], self)
+        self.shortcut_undo.activated.connect(self.undo_stack.undo)
+        self.shortcut_redo = QShortcut(self.shortcuts["다시 실행"], self)
+        self.shortcut_redo.activated.connect(self.undo_stack.redo)
+        # 표 복사/붙여넣기 (탭으로 구분된 여러 셀 - 엑셀과 주고받기). 셀 편집 중에는 편집기가 처리
+        self.shortcut_copy = QShortcut(QKeySequence.StandardKey.Copy, self.table)
+        self.shortcut_copy.setContext(Qt.ShortcutContext.WidgetShortcut)
+        self.shortcut_copy.activated.connect(self.copy_cells)
+        self.shortcut_paste = QShortcut(QKeySequence.StandardKey.Paste, self.table)
+        self.shortcut_paste.setContext(Qt.ShortcutContext.WidgetShortcut)
+        self.shortcut_paste.activated.connect(self.paste_cells)
+
+        # 백그라운드 핫스트링(semuHot2_core.py daemon)이 실행 중이면 붙어서 핫스트링은 데몬에 맡김
+        self.daemon = DaemonClient.connect()
+        if self.daemon is not None:
+            self.attach_daemon()
+
+        if defer_load:
+            QTimer.singleShot(0, self.load_initial_data)
+        else:
+            self.load_initial_data()
 
-        if os.path.exists(current_json_file):
+    def load_initial_data(self):
+        name = profile_registry.active
+        if name == ProfileRegistry.DEFAULT and not os.path.exists(snapshot_file) and os.path.exists(current_json_file):
+            # 이전 버전에서 쓰던 data.json만 있으면 읽은 뒤 스냅샷으로 저장
+            self.profile_name = name
+            self.use_usage_counts(name)
             self.load_json_data()
+            self.save_snapshot_data(discard_journal=True)
+        else:
+            self.activate_profile(name)
+        startup_timer.mark("data")
 
     def show_load_menu(self):
         pos = self.btn_load.mapToGlobal(self.btn_load.rect().bottomLeft())
@@ -323,14 +1229,10 @@ class MainWindow(QMainWindow):
                 have_shown_enable_message = True
 
     def disable_hotstring(self):
-        global hotstring_active, active_abbreviations, have_shown_disable_message
+        global hotstring_active, have_shown_disable_message
         if hotstring_active:
-            for ab in active_abbreviations:
-                try:
-                    keyboard.remove_abbreviation(ab)
-                except:
-                    pass
-            active_abbreviations.clear()
+            self.daemon_request("configure", active=False)
+            hotstring_engine.stop()
             hotstring_active = False
             if not have_shown_disable_message:
                 QMessageBox.information(self, "정보", "핫스트링 기능이 비활성화되었습니다.")
@@ -343,24 +1245,47 @@ class MainWindow(QMainWindow):
         self.switch_category.setChecked(not self.switch_category.isChecked())
 
     def update_hotstrings(self):
-        global hotstring_active, active_abbreviations, corp_data, personal_data, current_mode
+        global hotstring_active, current_mode
         if not hotstring_active:
             return
-        target_data = corp_data if current_mode == "법인" else personal_data
-        new_abbrevs = set(item["지정"] for item in target_data)
-        to_remove = active_abbreviations - new_abbrevs
-        to_add = new_abbrevs - active_abbreviations
-        for ab in to_remove:
-            try:
-                keyboard.remove_abbreviation(ab)
-            except:
-                pass
-        for ab in to_add:
-            for row in target_data:
-                if row["지정"] == ab:
-                    keyboard.add_abbreviation(ab, str(row["번호"]))
-                    break
-        active_abbreviations = (active_abbreviations - to_remove) | to_add
+        if self.daemon is not None and self.daemon_request("configure", mode=current_mode, active=True) is not None:
+            return
+        if usage_counts is not None:
+            usage_counts.mode = current_mode
+        hotstring_engine.use_table(hotstring_tables[current_mode])
+        hotstring_engine.start()
+
+    def attach_daemon(self):
+        # 데몬의 현재 상태(켜짐 여부, 모드)를 화면에 맞춤
+        global hotstring_active, current_mode
+        status = self.daemon_request("status")
+        if status is None:
+            return
+        current_mode = status["mode"]
+        hotstring_active = status["active"]
+        for switch, checked in ((self.switch_category, current_mode == "법인"), (self.switch_hotstring, hotstring_active)):
+            switch.blockSignals(True)
+            switch.setChecked(checked)
+            switch.blockSignals(False)
+        self.setWindowTitle("세무사랑 핫스트링 (백그라운드 실행 중)")
+
+    def daemon_request(self, cmd, **args):
+        # 데몬에 요청을 보내고 응답을 돌려줌. 연결이 끊겼으면 떼어 내고 None (이후로는 이 창의 엔진 사용)
+        if self.daemon is None:
+            return None
+        try:
+            return self.daemon.request(cmd, **args)
+        except Exception:
+            self.daemon.close()
+            self.daemon = None
+            self.setWindowTitle("세무사랑 핫스트링")
+            return None
+
+    def sync_daemon(self):
+        # 저장이 끝난 편집/불러오기 내용을 데몬이 다시 읽도록 알림
+        if self.daemon is not None and self.profile_name is not None:
+            if self.daemon_request("reload", profile=self.profile_name) is None and hotstring_active:
+                self.update_hotstrings()  # 데몬이 꺼졌으면 이 창에서 이어서 처리
 
     def load_excel(self):
         file_path, _ = QFileDialog.getOpenFileName(
@@ -371,49 +1296,305 @@ class MainWindow(QMainWindow):
         )
         if not file_path:
             return
+        if self.import_worker is not None:
+            return  # 이미 불러오는 중
+
+        progress_dialog = QProgressDialog("엑셀 불러오는 중...", "취소", 0, 0, self)
+        progress_dialog.setWindowTitle("불러오기")
+        progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        progress_dialog.setMinimumDuration(300)
+
+        worker = ExcelImportWorker(file_path, parent=self)
+        self.import_worker = worker
+
+        def on_progress(done, total):
+            progress_dialog.setMaximum(total)
+            progress_dialog.setValue(min(done, total) if total else 0)
+
+        def on_finished():
+            progress_dialog.close()
+            self.import_worker = None
+            worker.deleteLater()
+
+        worker.progress.connect(on_progress)
+        worker.sheetMissing.connect(lambda name: QMessageBox.warning(self, "경고", f"엑셀 파일에 '{name}' 시트가 없습니다."))
+        worker.loaded.connect(self.on_excel_loaded)
+        worker.failed.connect(lambda msg: QMessageBox.critical(self, "오류", msg))
+        worker.finished.connect(on_finished)
+        progress_dialog.canceled.connect(worker.requestInterruption)
+        worker.start()
+
+    def on_excel_loaded(self, result):
+        self.apply_loaded_data(result["법인"], result["개인"], result["tables"])
+        self.save_snapshot_data(discard_journal=True)
+        self.watch_source(result.get("path"))
+        row_errors = result.get("row_errors")
+        if row_errors:
+            lines = [f"{sheet} 시트 {row}행: {message}" for sheet, row, message in row_errors[:10]]
+            if len(row_errors) > 10:
+                lines.append(f"... 외 {len(row_errors) - 10}개")
+            QMessageBox.warning(self, "경고", f"번호가 잘못된 {len(row_errors)}개 행을 건너뛰었습니다.\n\n" + "\n".join(lines))
+
+    def bulk_import_folder(self):
+        if self.import_worker is not None:
+            return  # 이미 불러오는 중
+        folder = QFileDialog.getExistingDirectory(self, "엑셀 파일이 있는 폴더 선택", script_dir)
+        if not folder:
+            return
         try:
-            wb = load_workbook(file_path, data_only=True)
-            temp_corp = []
-            temp_personal = []
-            if "법인" not in wb.sheetnames:
-                QMessageBox.warning(self, "경고", "엑셀 파일에 '법인' 시트가 없습니다.")
-            else:
-                ws_corp = wb["법인"]
-                for row in ws_corp.iter_rows(min_row=2, values_only=True):
-                    if row[0] is None:
-                        break
-                    지정 = str(row[0]).strip()
-                    번호 = row[1]
-                    구분 = str(row[2]).strip() if row[2] else ""
-                    try:
-                        번호 = int(번호)
-                    except:
-                        continue
-                    temp_corp.append({"지정": 지정, "번호": 번호, "구분": 구분})
-            if "개인" not in wb.sheetnames:
-                QMessageBox.warning(self, "경고", "엑셀 파일에 '개인' 시트가 없습니다.")
-            else:
-                ws_personal = wb["개인"]
-                for row in ws_personal.iter_rows(min_row=2, values_only=True):
-                    if row[0] is None:
-                        break
-                    지정 = str(row[0]).strip()
-                    번호 = row[1]
-                    구분 = str(row[2]).strip() if row[2] else ""
-                    try:
-                        번호 = int(번호)
-                    except:
-                        continue
-                    temp_personal.append({"지정": 지정, "번호": 번호, "구분": 구분})
-            data_to_save = {"corp_data": temp_corp, "personal_data": temp_personal}
-            with open(current_json_file, "w", encoding="utf-8") as f:
-                json.dump(data_to_save, f, ensure_ascii=False, indent=4)
-            self.load_json_data()
-        except Exception as e:
+            paths = find_workbooks(folder)
+        except OSError as e:
             QMessageBox.critical(self, "오류", str(e))
+            return
+        if not paths:
+            QMessageBox.information(self, "알림", "폴더에 엑셀 파일(.xlsx, .xlsm)이 없습니다.")
+            return
+        each, merge = "파일마다 새 프로필 (파일 이름)", "모두 합쳐 프로필 하나로"
+        choice, ok = QInputDialog.getItem(
+            self, "폴더 일괄 불러오기", f"엑셀 파일 {len(paths)}개를 어떻게 불러올까요?", [each, merge], 0, False)
+        if not ok:
+            return
+        into = None
+        if choice == merge:
+            into, ok = QInputDialog.getText(self, "폴더 일괄 불러오기", "새 프로필 이름:")
+            if not ok:
+                return
+            error = profile_registry.validate_name(into)
+            if error is not None:
+                QMessageBox.warning(self, "경고", error)
+                return
+
+        progress_dialog = QProgressDialog("폴더 불러오는 중...", "취소", 0, len(paths), self)
+        progress_dialog.setWindowTitle("폴더 일괄 불러오기")
+        progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        progress_dialog.setMinimumDuration(300)
+
+        worker = BulkImportWorker(paths, into, parent=self)
+        self.import_worker = worker
+
+        def on_progress(done, total):
+            progress_dialog.setMaximum(total)
+            progress_dialog.setValue(done)
+
+        def on_finished():
+            progress_dialog.close()
+            self.import_worker = None
+            worker.deleteLater()
+
+        worker.progress.connect(on_progress)
+        worker.loaded.connect(self.on_bulk_imported)
+        worker.failed.connect(lambda msg: QMessageBox.critical(self, "오류", msg))
+        worker.finished.connect(on_finished)
+        progress_dialog.canceled.connect(worker.requestInterruption)
+        worker.start()
+
+    def on_bulk_imported(self, report):
+        for name, path in report["profiles"].items():
+            if path is not None:
+                profile_registry.set_source(name, path)
+        self.profile_combo.clear()
+        self.profile_combo.addItems(profile_registry.names())
+        if self.profile_name is not None:
+            self.profile_combo.setCurrentText(self.profile_name)
+        summary = bulk_import_summary(report)
+        report_path = os.path.join(script_dir, "bulk_import_report.json")
+        try:
+            with open(report_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            summary += f"\n\n자세한 결과: {report_path}"
+        except OSError:
+            pass
+        QMessageBox.information(self, "폴더 일괄 불러오기", summary)
+
+    def watch_source(self, path):
+        # 현재 프로필의 원본 파일을 감시 대상으로 (path가 None이면 감시 중지)
+        files = self.source_watcher.files()
+        if files:
+            self.source_watcher.removePaths(files)
+        self.source_timer.stop()
+        if path is None:
+            return
+        if self.profile_name is not None:
+            profile_registry.set_source(self.profile_name, path)
+        if os.path.exists(path):
+            self.source_watcher.addPath(path)
+
+    def reload_source(self):
+        path = profile_registry.sources.get(self.profile_name)
+        if path is None:
+            return
+        if not os.path.exists(path):
+            # 저장 프로그램이 파일을 지우고 새로 만드는 중일 수 있으므로 잠시 뒤 다시 확인
+            self.source_timer.start()
+            return
+        if path not in self.source_watcher.files():
+            # 새 파일로 교체되면 감시 목록에서 빠지므로 다시 등록
+            self.source_watcher.addPath(path)
+        if os.path.splitext(path)[1].lower() == ".json":
+            try:
+                corp, personal = read_json_data(path)
+            except Exception:
+                self.source_timer.start()  # 쓰는 도중이라 잘린 파일일 수 있음
+                return
+            self.on_source_reloaded({"법인": corp, "개인": personal, "path": path})
+            return
+        if self.source_worker is not None or self.import_worker is not None:
+            self.source_timer.start()
+            return
+        worker = ExcelImportWorker(path, parent=self, build_tables=False)
+        self.source_worker = worker
+
+        def on_finished():
+            self.source_worker = None
+            worker.deleteLater()
+
+        worker.loaded.connect(self.on_source_reloaded)
+        worker.failed.connect(lambda _msg: self.source_timer.start())
+        worker.finished.connect(on_finished)
+        worker.start()
+
+    def on_source_reloaded(self, result):
+        if result.get("path") != profile_registry.sources.get(self.profile_name):
+            return  # 그 사이 프로필이나 원본 파일이 바뀐 경우
+        self.apply_row_diffs(result)
+
+    def apply_row_diffs(self, stores):
+        # stores({"법인": CodeStore, "개인": CodeStore})와 현재 데이터를 비교해서 추가/수정/삭제된 행만 반영
+        # (테이블/검색 색인/트라이 모두 바뀐 행만 고치고 스냅샷 저장). 바뀐 내용이 있었으면 True
+        global hotstring_tables
+        changed = False
+        for mode, store in (("법인", corp_data), ("개인", personal_data)):
+            updates, inserts, deletes = diff_code_rows(store, stores[mode])
+            if not (updates or inserts or deletes):
+                continue
+            changed = True
+            abbrevs = {abbrev for abbrev, _, _ in inserts}
+            abbrevs.update(store.abbrevs[row] for row, _, _ in updates)
+            abbrevs.update(store.abbrevs[row] for row in deletes)
+            first_new = len(store) - len(deletes)
+            self.model.apply_diff(store, updates, inserts, deletes)
+
+            # 검색 색인: 삭제가 있으면 행 번호가 밀리므로 다시 만들고, 아니면 바뀐 행만 반영
+            index = self.search_indexes.get(mode)
+            changed_rows = [row for row, _, _ in updates] + list(range(first_new, len(store)))
+            if deletes:
+                self.rebuild_search_index(mode, store)
+            elif index is not None and index.store is store:
+                for row in changed_rows:
+                    index.update_row(row)
+            elif mode in self.search_dirty_rows:
+                self.search_dirty_rows[mode].update(changed_rows)
+            keys = self.table_keys.get(mode)
+            if deletes:
+                self.table_keys.pop(mode, None)
+            elif keys is not None and keys.store is store:
+                for row in changed_rows:
+                    keys.update_row(row)
+
+            hotstring_tables = {
+                **hotstring_tables, mode: patch_hotstring_trie(hotstring_tables[mode], store, abbrevs, usage_for(mode))}
+        if not changed:
+            return False
+        self.data_generation += 1
+        if (self.search_edit.text().strip() or self.view_active()
+                or self.model.store is not (corp_data if current_mode == "법인" else personal_data)):
+            self.update_table()
+        if hotstring_active:
+            self.update_hotstrings()
+        self.save_snapshot_data()
+        return True
+
+    def configure_sync(self):
+        # 현재 프로필의 공용 코드표 서버 주소 설정 (비우면 동기화 해제)
+        if self.profile_name is None:
+            return
+        current = profile_registry.sync.get(self.profile_name, {}).get("url", "")
+        url, ok = QInputDialog.getText(
+            self, "공용 코드표 동기화",
+            f"'{self.profile_name}' 프로필의 서버 주소 (예: http://192.168.0.10:8765, 비우면 해제):",
+            text=current,
+        )
+        if not ok:
+            return
+        url = url.strip()
+        if url == current:
+            self.start_sync()
+            return
+        profile_registry.set_sync(self.profile_name, url or None)
+        self.update_sync_schedule()
+
+    def update_sync_schedule(self):
+        # 현재 프로필에 서버가 설정돼 있으면 바로 한 번 받고 주기적으로 반복
+        if self.profile_name in profile_registry.sync:
+            self.sync_label.setText("동기화 중...")
+            self.sync_timer.start()
+            self.start_sync()
+        else:
+            self.sync_timer.stop()
+            self.sync_label.setText("")
+
+    def start_sync(self):
+        sync = profile_registry.sync.get(self.profile_name)
+        if sync is None or self.sync_worker is not None:
+            return
+        copies = {"법인": corp_data.copy(), "개인": personal_data.copy()}
+        base = (edit_journal.seq, self.data_generation)
+        worker = SyncWorker(self.profile_name, sync["url"], copies, sync["version"], base, parent=self)
+        self.sync_worker = worker
+
+        def on_finished():
+            self.sync_worker = None
+            worker.deleteLater()
+            if self.sync_again:
+                self.sync_again = False
+                self.start_sync()
+
+        worker.pulled.connect(self.on_sync_pulled)
+        worker.failed.connect(self.on_sync_failed)
+        worker.finished.connect(on_finished)
+        worker.start()
+
+    def on_sync_pulled(self, result):
+        sync = profile_registry.sync.get(self.profile_name)
+        if result["profile"] != self.profile_name or sync is None or sync["url"] != result["url"]:
+            return  # 그 사이 프로필이나 서버 주소가 바뀐 경우
+        if result["changed"] != 0 and result["base"] != (edit_journal.seq, self.data_generation):
+            # 받는 동안 표에서 고친 내용은 받은 코드표에 없으므로 그대로 반영하면 되돌려짐 - 버리고 지금 데이터로 다시 받음
+            self.sync_again = True
+            return
+        if result["changed"] != 0:
+            self.apply_row_diffs(result["stores"])
+        if result["version"] != sync["version"]:
+            profile_registry.set_sync(self.profile_name, result["url"], result["version"])
+        self.sync_label.setText(f"공용 {result['version']}판")
+        self.sync_label.setToolTip(f"{result['url']} - 마지막 확인 {time.strftime('%H:%M:%S')}")
+
+    def on_sync_failed(self, message):
+        # 서버에 연결되지 않아도 마지막으로 받은 코드표(프로필 스냅샷)로 계속 동작
+        sync = profile_registry.sync.get(self.profile_name)
+        if sync is None:
+            return
+        self.sync_label.setText(f"오프라인 ({sync['version']}판)")
+        self.sync_label.setToolTip(f"{sync['url']} - {message}")
+
+    def apply_loaded_data(self, corp, personal, tables=None, search_indexes=None):
+        # 불러온 데이터를 현재 데이터로 교체 (테이블 모델 리셋 + 핫스트링 트라이 교체)
+        global corp_data, personal_data, hotstring_tables
+        corp_data = corp
+        personal_data = personal
+        self.data_generation += 1
+        self.undo_stack.clear()  # 이전 데이터의 행 번호를 가리키므로 버림
+        self.build_search_indexes(search_indexes)
+        if tables is None or not tables_match_suggestions(tables):
+            compile_hotstring_tables()
+        else:
+            hotstring_tables = tables
+        self.update_table()
+        if hotstring_active:
+            self.update_hotstrings()
 
     def load_json_file(self):
-        global corp_data, personal_data, current_json_file
+        global current_json_file
         file_path, _ = QFileDialog.getOpenFileName(
             self,
             "JSON 파일 선택",
@@ -423,92 +1604,521 @@ class MainWindow(QMainWindow):
         if not file_path:
             return
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            corp_data = data.get("corp_data", [])
-            personal_data = data.get("personal_data", [])
+            corp, personal = read_json_data(file_path)
             current_json_file = file_path
-            self.update_table()
-            if hotstring_active:
-                self.update_hotstrings()
+            self.apply_loaded_data(corp, personal)
         except Exception as e:
             QMessageBox.critical(self, "오류", f"JSON 로드 실패: {str(e)}")
+            return
+        self.save_snapshot_data(discard_journal=True)
+        self.watch_source(file_path)
+
+    def export_json_file(self):
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "JSON 파일 저장",
+            current_json_file,
+            "JSON Files (*.json);;All Files (*)"
+        )
+        if not file_path:
+            return
+        try:
+            write_json_data(file_path, corp_data, personal_data)
+        except Exception as e:
+            QMessageBox.critical(self, "오류", f"JSON 저장 실패: {str(e)}")
+
+    def export_excel_file(self):
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "엑셀 파일 저장",
+            os.path.join(script_dir, f"{self.profile_name or '코드표'}.xlsx"),
+            "Excel Files (*.xlsx)"
+        )
+        if file_path:
+            self.start_excel_export(file_path)
+
+    def write_back_excel(self):
+        # 불러왔던 원본 엑셀에 편집한 행만 반영 (다른 이름으로 저장도 가능)
+        source = profile_registry.sources.get(self.profile_name)
+        if source is None or os.path.splitext(source)[1].lower() not in (".xlsx", ".xlsm") or not os.path.exists(source):
+            QMessageBox.warning(self, "경고", "이 프로필은 엑셀 파일에서 불러온 것이 아니거나 원본 파일이 없습니다.")
+            return
+        ext = os.path.splitext(source)[1].lower()
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "원본 엑셀에 반영", write_back_path(source), f"Excel Files (*{ext})")
+        if not file_path:
+            return
+        if os.path.normcase(os.path.abspath(file_path)) == os.path.normcase(os.path.abspath(source)):
+            reply = QMessageBox.question(
+                self, "원본 덮어쓰기",
+                f"원본 엑셀 파일을 덮어씁니다.\n{source}\n\n고친 칸에 수식이 있었다면 값으로 바뀝니다. 계속할까요?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.No)
+            if reply != QMessageBox.StandardButton.Yes:
+                return
+        self.start_excel_export(file_path, source)
+
+    def start_excel_export(self, file_path, source=None):
+        if self.export_worker is not None:
+            return  # 이미 내보내는 중
+        stores = {"법인": corp_data.copy(), "개인": personal_data.copy()}
+        progress_dialog = QProgressDialog("엑셀 저장 중...", "취소", 0, 0, self)
+        progress_dialog.setWindowTitle("내보내기")
+        progress_dialog.setMinimumDuration(300)
+
+        worker = ExcelExportWorker(file_path, stores, source, parent=self)
+        self.export_worker = worker
+
+        def on_progress(done, total):
+            progress_dialog.setMaximum(total)
+            progress_dialog.setValue(min(done, total) if total else 0)
+
+        def on_finished():
+            progress_dialog.close()
+            self.export_worker = None
+            worker.deleteLater()
+
+        worker.progress.connect(on_progress)
+        worker.exported.connect(self.on_excel_exported)
+        worker.failed.connect(lambda msg: QMessageBox.critical(self, "오류", f"엑셀 저장 실패: {msg}"))
+        worker.finished.connect(on_finished)
+        progress_dialog.canceled.connect(worker.requestInterruption)
+        worker.start()
+
+    def on_excel_exported(self, result):
+        if "rows" in result:
+            message = f"{result['rows']}행을 저장했습니다."
+        else:
+            message = f"수정 {result['updated']}행, 추가 {result['inserted']}행, 삭제 {result['deleted']}행을 반영했습니다."
+            if result["formulas"]:
+                message += f"\n그중 {result['formulas']}행은 수식이 있던 칸을 값으로 바꾸거나 지웠습니다."
+        QMessageBox.information(self, "내보내기", f"{message}\n{result['path']}")
 
     def load_json_data(self):
-        global corp_data, personal_data
         if not os.path.exists(current_json_file):
             QMessageBox.warning(self, "경고", f"JSON 파일({current_json_file})이 존재하지 않습니다.")
             return
         try:
-            with open(current_json_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            corp_data = data.get("corp_data", [])
-            personal_data = data.get("personal_data", [])
-            self.update_table()
-            if hotstring_active:
-                self.update_hotstrings()
+            self.apply_loaded_data(*read_json_data(current_json_file))
         except Exception as e:
             QMessageBox.critical(self, "오류", f"JSON 로드 실패: {str(e)}")
 
+    def activate_profile(self, name):
+        # 현재 프로필을 캐시에 넘기고 name 프로필의 데이터/트라이/검색 색인으로 교체
+        global edit_journal
+        if name == self.profile_name:
+            return
+        try:
+            state = profile_registry.open(name)
+        except Exception as e:
+            QMessageBox.critical(self, "오류", f"데이터 로드 실패: {str(e)}")
+            if self.profile_name is not None:
+                self.profile_combo.setCurrentText(self.profile_name)
+            return
+        if self.profile_name is not None:
+            self.journal_timer.stop()
+            self.commit_journal()
+            profile_registry.release(ProfileState(
+                self.profile_name, {"법인": corp_data, "개인": personal_data}, edit_journal,
+                hotstring_tables, self.search_indexes,
+            ))
+        self.profile_name = name
+        profile_registry.set_active(name)
+        self.profile_combo.setCurrentText(name)
+        self.use_usage_counts(name)
+        edit_journal = state.journal
+        self.apply_loaded_data(state.stores["법인"], state.stores["개인"], state.tables, state.search_indexes)
+        if state.replayed:
+            self.save_snapshot_data()
+        else:
+            self.sync_daemon()
+        self.watch_source(profile_registry.sources.get(name))
+        self.update_sync_schedule()
+
+    def use_usage_counts(self, name):
+        # 이전 프로필의 횟수를 기록하고 name 프로필의 사용 빈도로 교체
+        global usage_counts
+        self.flush_usage_counts()
+        usage_counts = UsageCounts(profile_registry.usage_path(name))
+        usage_counts.mode = current_mode
+        hotstring_engine.usage = usage_counts
+
+    def flush_usage_counts(self):
+        if usage_counts is None:
+            return
+        try:
+            usage_counts.flush()
+        except OSError:
+            pass  # 못 쓴 횟수는 남겨 두고 다음 타이머에서 다시 시도
+
+    def create_profile(self):
+        name, ok = QInputDialog.getText(self, "새 프로필", "프로필(거래처) 이름:")
+        if not ok:
+            return
+        error = profile_registry.validate_name(name)
+        if error is None:
+            try:
+                profile_registry.create(name)
+            except OSError as e:
+                error = f"프로필 만들기 실패: {str(e)}"
+        if error is not None:
+            QMessageBox.warning(self, "경고", error)
+            return
+        self.profile_combo.clear()
+        self.profile_combo.addItems(profile_registry.names())
+        self.activate_profile(name)
+
+    def save_snapshot_data(self, discard_journal=False):
+        # 스냅샷 쓰기는 백그라운드 스레드에서 진행 (실패는 화면에 알림)
+        try:
+            future = edit_journal.checkpoint([corp_data, personal_data], discard=discard_journal)
+        except Exception as e:
+            QMessageBox.critical(self, "오류", f"데이터 저장 실패: {str(e)}")
+            return
+        future.add_done_callback(self._on_checkpoint_done)
+
+    def _on_checkpoint_done(self, future):
+        error = future.exception()
+        if error is not None:
+            # 작업 스레드에서 불리므로 GUI 스레드로 넘겨서 표시
+            self.persistenceFailed.emit(str(error))
+        else:
+            self.persisted.emit()
+
+    def commit_journal(self):
+        committed = bool(edit_journal.pending)
+        try:
+            edit_journal.commit()
+        except Exception as e:
+            QMessageBox.critical(self, "오류", f"편집 내용 저장 실패: {str(e)}")
+            return
+        if edit_journal.needs_compaction():
+            self.save_snapshot_data()
+        elif committed:
+            self.sync_daemon()
+
     def update_table(self):
         global current_mode, corp_data, personal_data
-        self.updating_table = True
-        self.table.blockSignals(True)
-        show_data = corp_data if current_mode == "법인" else personal_data
-        self.table.setRowCount(len(show_data))
-        for row_idx, entry in enumerate(show_data):
-            item_지정 = QTableWidgetItem(str(entry["지정"]))
-            item_번호 = QTableWidgetItem(str(entry["번호"]))
-            item_구분 = QTableWidgetItem(str(entry["구분"]))
-            item_지정.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            item_번호.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            item_구분.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(row_idx, 0, item_지정)
-            self.table.setItem(row_idx, 1, item_번호)
-            self.table.setItem(row_idx, 2, item_구분)
-        self.table.blockSignals(False)
-        self.updating_table = False
-
-    def on_cell_changed(self, row, column):
-        if self.updating_table:
-            return
-        global current_mode, corp_data, personal_data, hotstring_active
-        target_data = corp_data if current_mode == "법인" else personal_data
-        if row < 0 or row >= len(target_data):
-            return
-        new_value = self.table.item(row, column).text()
-        if column == 0:
-            target_data[row]["지정"] = new_value.strip()
-        elif column == 1:
+        store = corp_data if current_mode == "법인" else personal_data
+        self.model.set_store(store, self.view_rows())
+
+    def build_search_indexes(self, indexes=None):
+        # 데이터를 불러온 뒤 두 모드의 검색 색인을 백그라운드에서 만듦
+        # indexes: 프로필 캐시에 남아 있던 색인 (같은 데이터의 색인이 있는 모드는 다시 만들지 않음)
+        self.search_indexes = {}
+        for mode, store in (("법인", corp_data), ("개인", personal_data)):
+            index = (indexes or {}).get(mode)
+            if index is not None and index.store is store:
+                self.search_indexes[mode] = index
+                continue
+            self.rebuild_search_index(mode, store)
+
+    def rebuild_search_index(self, mode, store):
+        # 색인을 다 만들 때까지는 search_rows가 전체 훑기로 대신함
+        self.search_indexes.pop(mode, None)
+        self.search_dirty_rows[mode] = set()
+        worker = SearchIndexWorker(mode, store, self)
+        worker.built.connect(self.on_search_index_built)
+        worker.finished.connect(worker.deleteLater)
+        self.search_workers[mode] = worker
+        worker.start()
+
+    def on_search_index_built(self, mode, index):
+        store = corp_data if mode == "법인" else personal_data
+        if index.store is not store or self.sender() is not self.search_workers.get(mode):
+            return  # 그 사이 데이터를 다시 불러왔거나 색인을 다시 만들기 시작한 경우
+        for row in self.search_dirty_rows.pop(mode, ()):
+            index.update_row(row)
+        self.search_indexes[mode] = index
+        self.search_workers.pop(mode, None)
+
+    def search_rows(self, text):
+        # 검색어가 없으면 None (전체 표시)
+        if not text.strip():
+            self.search_count_label.setText("")
+            return None
+        store = corp_data if current_mode == "법인" else personal_data
+        index = self.search_indexes.get(current_mode)
+        usage = usage_for(current_mode)
+        if index is not None and index.store is store:
+            rows = index.search(text, usage)
+        else:
+            rows = SearchIndex.scan(store, text, usage)  # 색인을 만드는 중
+        self.search_count_label.setText(f"{len(rows)}건")
+        return rows
+
+    def on_search_changed(self, _text):
+        self.refresh_view()
+
+    def refresh_view(self):
+        self.model.set_rows(self.view_rows())
+
+    def view_active(self):
+        # 정렬이나 구분/번호 필터가 걸려 있는지
+        return self.sort_column is not None or bool(self.category_filter) or self.number_range() != (None, None)
+
+    def number_range(self):
+        bounds = []
+        for edit in (self.number_min, self.number_max):
             try:
-                new_num = int(new_value)
-            except:
-                QMessageBox.critical(self, "오류", "번호는 정수여야 합니다.")
-                self.update_table()
-                return
-            target_data[row]["번호"] = new_num
-        elif column == 2:
-            target_data[row]["구분"] = new_value.strip()
-        if hotstring_active:
+                bounds.append(int(edit.text()))
+            except ValueError:
+                bounds.append(None)
+        return tuple(bounds)
+
+    def table_keys_for(self, mode, store):
+        keys = self.table_keys.get(mode)
+        if keys is None or keys.store is not store:
+            keys = self.table_keys[mode] = TableKeys(store)
+        return keys
+
+    def view_rows(self):
+        # 검색 결과(없으면 전체)에 구분/번호 필터와 정렬을 적용한 행 목록 (아무 조건도 없으면 None - 전체 표시)
+        rows = self.search_rows(self.search_edit.text())
+        if not self.view_active():
+            return rows
+        store = corp_data if current_mode == "법인" else personal_data
+        keys = self.table_keys_for(current_mode, store)
+        mask = keys.mask(self.category_filter, self.number_range(), rows)
+        if self.sort_column is None:
+            order = rows if rows is not None else range(len(store))
+        elif self.sort_column == "usage":
+            order = keys.usage_order(usage_for(current_mode))
+        else:
+            index = self.search_indexes.get(current_mode)
+            abbrev_keys = index.sort_keys if index is not None and index.store is store else None
+            order = keys.order(self.sort_column, self.sort_descending, abbrev_keys)
+        rows = keys.select(order, mask)
+        self.search_count_label.setText(f"{len(rows)}건")
+        return rows
+
+    def cycle_sort(self, column):
+        if self.sort_column != column:
+            self.sort_column, self.sort_descending = column, False
+        elif not self.sort_descending:
+            self.sort_descending = True
+        else:
+            self.sort_column = None
+        self.update_sort_indicator()
+        self.refresh_view()
+
+    def toggle_usage_sort(self, checked):
+        if checked:
+            self.sort_column, self.sort_descending = "usage", False
+        elif self.sort_column == "usage":
+            self.sort_column = None
+        self.update_sort_indicator()
+        self.refresh_view()
+
+    def update_sort_indicator(self):
+        header = self.table.horizontalHeader()
+        header.setSortIndicatorShown(isinstance(self.sort_column, int))
+        if isinstance(self.sort_column, int):
+            order = Qt.SortOrder.DescendingOrder if self.sort_descending else Qt.SortOrder.AscendingOrder
+            header.setSortIndicator(self.sort_column, order)
+        self.action_usage_sort.blockSignals(True)
+        self.action_usage_sort.setChecked(self.sort_column == "usage")
+        self.action_usage_sort.blockSignals(False)
+
+    def fill_category_list(self):
+        # 현재 모드에 있는 구분을 가나다순으로 (행 수 포함)
+        store = corp_data if current_mode == "법인" else personal_data
+        counts = self.table_keys_for(current_mode, store).category_counts()
+        self.category_list.blockSignals(True)
+        self.category_list.clear()
+        for name in sorted(counts, key=collation_key):
+            item = QListWidgetItem(f"{name or '(없음)'} ({counts[name]})")
+            item.setData(Qt.ItemDataRole.UserRole, name)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Checked if name in self.category_filter else Qt.CheckState.Unchecked)
+            self.category_list.addItem(item)
+        self.category_list.blockSignals(False)
+
+    def on_category_item_changed(self, item):
+        name = item.data(Qt.ItemDataRole.UserRole)
+        if item.checkState() == Qt.CheckState.Checked:
+            self.category_filter.add(name)
+        else:
+            self.category_filter.discard(name)
+        self.update_filter_button()
+        self.refresh_view()
+
+    def update_filter_button(self):
+        count = len(self.category_filter)
+        self.btn_filter.setText(f"구분 ({count})" if count else "구분")
+
+    def clear_view_filters(self):
+        self.sort_column = None
+        self.category_filter.clear()
+        for edit in (self.number_min, self.number_max):
+            edit.blockSignals(True)
+            edit.clear()
+            edit.blockSignals(False)
+        self.update_sort_indicator()
+        self.update_filter_button()
+        self.refresh_view()
+
+    def select_first_result(self):
+        if self.model.rowCount() > 0:
+            index = self.model.index(0, 0)
+            self.table.setCurrentIndex(index)
+            self.table.scrollTo(index)
+            self.table.setFocus()
+
+    def on_cell_changed(self, row, column, old):
+        # 값 검증과 저장소 반영은 CodeTableModel.setData에서 이미 끝난 상태
+        store = corp_data if current_mode == "법인" else personal_data
+        with self.edit_transaction("셀 편집") as transaction:
+            transaction.changes.append((current_mode, row, column, old, store.get(row, column)))
+
+    def on_edit_rejected(self, msg):
+        if self.transactions.current is not None:
+            self.transactions.current.rejected += 1  # 여러 셀을 고치는 중이면 끝나고 한 번만 알림
+        else:
+            QMessageBox.critical(self, "오류", msg)
+
+    def edit_transaction(self, label, undoable=True):
+        # 안에서 일어난 셀 변경을 모아서 끝날 때 commit_transaction으로 한 번에 반영 (중첩되면 가장 바깥에서 반영)
+        return self.transactions.begin(label, undoable)
+
+    def commit_transaction(self, transaction):
+        global hotstring_tables
+        if transaction.rejected:
+            QMessageBox.warning(self, "경고", f"값이 잘못된 셀(빈 지정, 정수가 아닌 번호) {transaction.rejected}개는 건너뛰었습니다.")
+        if not transaction.changes:
+            return
+        stores = {"법인": corp_data, "개인": personal_data}
+        changes, affected = commit_edits(transaction, stores, edit_journal)
+        for mode, row, column, old, new in transaction.changes:
+            store = stores[mode]
+            index = self.search_indexes.get(mode)
+            if index is not None and index.store is store:
+                index.update_row(row)
+            elif mode in self.search_dirty_rows:
+                self.search_dirty_rows[mode].add(row)
+            keys = self.table_keys.get(mode)
+            if keys is not None and keys.store is store:
+                keys.update_row(row)
+        if not self.journal_timer.isActive():
+            self.journal_timer.start()
+        for mode, abbrevs in affected.items():
+            hotstring_tables = {
+                **hotstring_tables, mode: patch_hotstring_trie(hotstring_tables[mode], stores[mode], abbrevs, usage_for(mode))}
+        if affected and hotstring_active:
             self.update_hotstrings()
+        if transaction.undoable:
+            self.undo_stack.push(EditCommand(self, changes, transaction.label))
+
+    def apply_changes(self, changes, undo):
+        # 실행 취소(undo=True)면 이전 값으로, 다시 실행이면 새 값으로 되돌림 (그 사이 지워진 행은 건너뜀)
+        stores = {"법인": corp_data, "개인": personal_data}
+        with self.edit_transaction("실행 취소" if undo else "다시 실행", undoable=False) as transaction:
+            revert_edits(transaction, stores, changes, undo, self.model.set_cell)
+
+    def selected_view_cells(self):
+        return sorted((index.row(), index.column()) for index in self.table.selectionModel().selectedIndexes())
+
+    def copy_cells(self):
+        cells = self.selected_view_cells()
+        if not cells:
+            return
+        rows = sorted({row for row, _ in cells})
+        columns = sorted({column for _, column in cells})
+        selected = set(cells)
+        lines = []
+        for row in rows:
+            values = []
+            for column in columns:
+                values.append(str(self.model.data(self.model.index(row, column))) if (row, column) in selected else "")
+            lines.append("\t".join(values))
+        QApplication.clipboard().setText("\n".join(lines))
+
+    def paste_cells(self):
+        # 탭/줄바꿈으로 구분된 값을 현재 셀부터 채움. 값이 하나면 선택한 모든 셀에 채움 (엑셀과 동일)
+        text = QApplication.clipboard().text()
+        if not text:
+            return
+        current = self.table.currentIndex()
+        if not current.isValid():
+            return
+        store = self.model.store
+        rows = self.model.rows if self.model.rows is not None else range(len(store))
+        edits = paste_edits(text, (current.row(), current.column()), self.selected_view_cells(), rows)
+        with self.edit_transaction("붙여넣기") as transaction:
+            edit_cells(transaction, current_mode, store, edits, self.model.set_cell)
+
+    def open_replace_dialog(self):
+        dialog = ReplaceDialog(self)
+        if dialog.exec() != QDialog.DialogCode.Accepted or not dialog.find_edit.text():
+            return
+        count = self.replace_in_column(
+            dialog.column_combo.currentIndex(), dialog.find_edit.text(), dialog.replace_edit.text(),
+            dialog.visible_only.isChecked(),
+        )
+        QMessageBox.information(self, "찾아 바꾸기", f"{count}개 셀을 바꿨습니다.")
+
+    def replace_in_column(self, column, find, replace, visible_only=False):
+        # 현재 모드 시트의 한 열에서 find를 replace로 모두 바꾸고 바뀐 셀 수를 돌려줌
+        store = self.model.store
+        rows = self.model.rows if visible_only else None
+        with self.edit_transaction("찾아 바꾸기") as transaction:
+            return edit_cells(transaction, current_mode, store, replace_edits(store, column, find, replace, rows),
+                              self.model.set_cell)
 
     def search_table(self):
-        search_text, ok = QInputDialog.getText(self, "찾기", "찾을 값 입력:")
-        if ok and search_text:
-            items = self.table.findItems(search_text, Qt.MatchFlag.MatchContains)
-            if items:
-                item = items[0]
-                self.table.setCurrentItem(item)
-                self.table.scrollToItem(item)
-            else:
-                QMessageBox.information(self, "찾기", f"'{search_text}'(을)를 찾을 수 없습니다.")
+        self.search_edit.setFocus()
+        self.search_edit.selectAll()
 
     def exit_program(self):
+        self.exiting = True
         self.close()
 
+    def show_from_background(self):
+        self.show()
+        self.setWindowState(self.windowState() & ~Qt.WindowState.WindowMinimized)
+        self.raise_()
+        self.activateWindow()
+
+    def closeEvent(self, event):
+        if self.keep_resident and not self.exiting:
+            # 상주 모드에서는 창만 숨김 (다음 실행 때 바로 다시 표시)
+            event.ignore()
+            self.hide()
+            return
+        for worker in (self.import_worker, self.export_worker):
+            if worker is not None:
+                worker.requestInterruption()
+                worker.wait()
+        # 프로필을 전환하기 전에 시작된 색인 작업까지 모두 기다림
+        for worker in self.findChildren(SearchIndexWorker) + self.findChildren(SyncWorker):
+            try:
+                worker.wait()
+            except RuntimeError:
+                pass  # 이미 끝나서 삭제된 작업
+        self.sync_timer.stop()
+        hotstring_engine.stop()
+        self.usage_timer.stop()
+        self.flush_usage_counts()
+        self.suggestion_popup.close()
+        self.journal_timer.stop()
+        try:
+            edit_journal.close()
+            self.sync_daemon()  # 데몬은 창을 닫은 뒤에도 마지막 편집 내용으로 계속 동작
+            if self.daemon is not None:
+                self.daemon.close()
+            profile_registry.close()
+        except Exception as e:
+            QMessageBox.critical(self, "오류", f"편집 내용 저장 실패: {str(e)}")
+        super().closeEvent(event)
+
     def open_settings_dialog(self):
-        dialog = SettingsDialog(self.shortcuts, self)
+        dialog = SettingsDialog(self.shortcuts, self.options, self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
+            self.options.update(dialog.get_options())
+            self.table.set_watermark_enabled(self.options["배경 이미지 표시"])
+            self.apply_output_option()
+            self.apply_suggestion_option()
+            self.save_option_settings()
             new_shortcuts = dialog.get_shortcuts()
             self.shortcuts.update(new_shortcuts)
             self.shortcut_load.setKey(self.shortcuts["불러오기"])
@@ -516,8 +2126,40 @@ class MainWindow(QMainWindow):
             self.shortcut_category.setKey(self.shortcuts["현재 카테고리"])
             self.shortcut_find.setKey(self.shortcuts["찾기"])
             self.shortcut_exit.setKey(self.shortcuts["프로그램 종료"])
+            self.shortcut_replace.setKey(self.shortcuts["찾아 바꾸기"])
+            self.shortcut_undo.setKey(self.shortcuts["실행 취소"])
+            self.shortcut_redo.setKey(self.shortcuts["다시 실행"])
             self.save_shortcut_settings()
 
+    def apply_output_option(self):
+        backend = "clipboard" if self.options["클립보드 붙여넣기로 입력"] else "sendinput"
+        hotstring_engine.set_output(create_output_backend(backend))
+
+    def apply_suggestion_option(self):
+        # 켜면 트라이를 후보 목록까지 포함해 다시 컴파일하고, 끄면 후보 없는 트라이로 되돌림
+        global suggestions_enabled
+        suggestions_enabled = bool(self.options["입력 중 자동완성 목록 표시"])
+        hotstring_engine.suggest = self.suggestionsRequested.emit if suggestions_enabled else None
+        if not suggestions_enabled:
+            self.suggestion_popup.hide()
+        if not tables_match_suggestions(hotstring_tables):
+            compile_hotstring_tables()
+            if hotstring_active:
+                self.update_hotstrings()
+
+    def open_diagnostics_dialog(self):
+        dialog = DiagnosticsDialog(hotstring_engine.stats, self, self.build_usage_report)
+        dialog.exec()
+
+    def build_usage_report(self):
+        # 현재 프로필의 사용 빈도 보고서 (데몬이 치환 중이면 대기 중인 횟수를 먼저 기록하게 함)
+        if usage_counts is None:
+            return None
+        if self.daemon is not None:
+            self.daemon_request("flush")
+        self.flush_usage_counts()
+        return usage_report({"법인": corp_data, "개인": personal_data}, usage_counts)
+
     def save_shortcut_settings(self):
         save_dict = {key: self.shortcuts[key].toString() for key in self.shortcuts}
         try:
@@ -526,8 +2168,70 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "오류", f"단축키 설정 저장 실패: {str(e)}")
 
+    def save_option_settings(self):
+        try:
+            with open(options_file, "w", encoding="utf-8") as f:
+                json.dump(self.options, f, ensure_ascii=False, indent=4)
+        except Exception as e:
+            QMessageBox.critical(self, "오류", f"옵션 저장 실패: {str(e)}")
+
+# ---------------------------
+# 단일 실행 (--prewarm으로 상주 중인 프로그램이 있으면 그 창을 띄우고 바로 종료)
+# ---------------------------
+# 상주 프로그램만 서버를 열고 resident_file을 남깁니다. 그냥 실행할 때는 이 파일이 있을 때만 접속해 보므로
+# 상주 프로그램을 쓰지 않으면 시작할 때 확인 비용이 없고, 창을 여러 개 띄우는 것도 예전처럼 됩니다.
+INSTANCE_SERVER_NAME = "semuHot2-instance"
+
+
+def notify_running_instance():
+    # 이미 실행 중인 프로그램에 "show"를 보냈으면 True
+    from PyQt6.QtNetwork import QLocalSocket
+    socket = QLocalSocket()
+    socket.connectToServer(INSTANCE_SERVER_NAME)
+    if not socket.waitForConnected(200):
+        return False
+    socket.write(b"show")
+    socket.waitForBytesWritten(200)
+    socket.disconnectFromServer()
+    return True
+
+
+def start_instance_server(window):
+    from PyQt6.QtNetwork import QLocalServer
+    server = QLocalServer(window)
+    if not server.listen(INSTANCE_SERVER_NAME):
+        # 비정상 종료로 남은 소켓 파일 정리 후 재시도
+        QLocalServer.removeServer(INSTANCE_SERVER_NAME)
+        server.listen(INSTANCE_SERVER_NAME)
+
+    def on_new_connection():
+        conn = server.nextPendingConnection()
+        if conn is None:
+            return
+
+        def on_ready_read():
+            if bytes(conn.readAll()).strip() == b"show":
+                window.show_from_background()
+
+        conn.readyRead.connect(on_ready_read)
+        conn.disconnected.connect(conn.deleteLater)
+
+    server.newConnection.connect(on_new_connection)
+    return server
+
+
 if __name__ == "__main__":
+    # 실행 옵션
+    #   --prewarm        : 창을 띄우지 않고 미리 실행해 둠 (시작 프로그램에 등록하는 용도).
+    #                      이후 실행하면 새로 뜨지 않고 상주 중인 창을 바로 표시합니다. (단일 실행은 이때만)
+    #   --startup-report : 시작 단계별 시간을 startup_report.json에 저장하고 화면에 출력
+    prewarm = "--prewarm" in sys.argv
+    startup_report = "--startup-report" in sys.argv
+    startup_timer.mark("import")
+
     app = QApplication(sys.argv)
+    if (prewarm or os.path.exists(resident_file)) and notify_running_instance():
+        sys.exit(0)
     app.setStyleSheet("""
     QWidget {
         background-color: #f7f7f7;
@@ -560,7 +2264,7 @@ if __name__ == "__main__":
         background: transparent;
         border: none;
     }
-    QTableWidget {
+    QTableView {
         background-color: #ffffff;
         gridline-color: #bdc3c7;
         color: #2c3e50;
@@ -584,6 +2288,37 @@ if __name__ == "__main__":
         color: #ecf0f1;
     }
     """)
-    window = MainWindow()
-    window.show()
-    sys.exit(app.exec())
+    startup_timer.mark("app")
+    window = MainWindow(defer_load=True, keep_resident=prewarm)
+    instance_server = None
+    if prewarm:
+        instance_server = start_instance_server(window)
+        try:
+            with open(resident_file, "w", encoding="utf-8") as f:
+                f.write(str(os.getpid()))
+        except OSError:
+            pass  # 표시 파일이 없으면 다음 실행이 상주 창 대신 새 창을 띄울 뿐
+    startup_timer.mark("window")
+    if not prewarm:
+        window.show()
+    startup_timer.mark("show")
+
+    if startup_report:
+        def write_startup_report():
+            report = startup_timer.to_dict()
+            print(json.dumps(report, ensure_ascii=False))
+            try:
+                with open(startup_report_file, "w", encoding="utf-8") as f:
+                    json.dump(report, f, ensure_ascii=False, indent=4)
+            except OSError:
+                pass
+        # 데이터 불러오기(load_initial_data)가 먼저 예약돼 있으므로 그 다음에 실행됨
+        QTimer.singleShot(0, write_startup_report)
+
+    exit_code = app.exec()
+    if prewarm:
+        try:
+            os.remove(resident_file)
+        except OSError:
+            pass
+    sys.exit(exit_code)
@@ -0,0 +1,2990 @@
+# ---------------------------
+# 세무사랑 핫스트링 - 화면 없이 쓰는 핵심 기능
+# ---------------------------
+# 코드표 저장소, 스냅샷/편집 저널, 프로필, 엑셀/JSON 불러오기, 핫스트링 엔진을 담고 있습니다.
+# Qt를 불러오지 않으므로 GUI(semuHot2.py) 없이도 쓸 수 있고, 명령줄로 실행하면
+# 핫스트링만 돌리는 가벼운 백그라운드 프로세스(데몬)가 됩니다.
+#
+#   python semuHot2_core.py daemon [--profile 이름] [--mode 법인|개인] [--off]
+#   python semuHot2_core.py status | enable | disable | reload | stop
+#   python semuHot2_core.py mode 개인
+#   python semuHot2_core.py profile 이름
+#   python semuHot2_core.py sync-server | publish 파일 --server URL --token 토큰 | sync [--server URL]
+import sys
+import os
+import re
+import json
+import gzip
+import time
+import heapq
+import mmap
+import struct
+import hashlib
+import argparse
+import tempfile
+import threading
+from array import array
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+# keyboard(핫스트링 훅, 관리자 권한 필요할 수 있음)와 openpyxl(엑셀)은 시작 시간과 메모리를 줄이기 위해
+# 실제로 쓰는 시점(핫스트링 활성화 / 엑셀 불러오기)에 불러옵니다.
+
+# ---------------------------
+# 실행 파일과 같은 폴더 경로 설정
+# ---------------------------
+# resource_dir: 함께 묶인 이미지 (onefile이면 실행할 때마다 풀리는 임시 폴더)
+# script_dir:   데이터/설정 파일 (항상 실행 파일과 같은 폴더에 남도록)
+if getattr(sys, 'frozen', False):
+    resource_dir = sys._MEIPASS
+    script_dir = os.path.dirname(os.path.abspath(sys.executable))
+else:
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    resource_dir = script_dir
+
+current_json_file = os.path.join(script_dir, "data.json")   # (JSON 가져오기/내보내기 기본 경로)
+snapshot_file = os.path.join(script_dir, "data.snap")       # (데이터 저장용 - 바이너리 스냅샷)
+import_cache_dir = os.path.join(script_dir, "import_cache")  # (엑셀 불러오기 캐시)
+journal_file = os.path.join(script_dir, "data.journal")     # (스냅샷 이후 편집 기록)
+profiles_dir = os.path.join(script_dir, "profiles")        # (기본 외 프로필별 데이터 폴더)
+profiles_file = os.path.join(script_dir, "profiles.json")  # (마지막으로 사용한 프로필)
+daemon_key_file = os.path.join(script_dir, "daemon.key")   # (데몬 접속용 인증 키)
+
+# ---------------------------
+# 열 단위 데이터 저장소 (지정 / 번호 / 구분)
+# ---------------------------
+# 행마다 dict를 두는 대신 열별로 리스트/배열 하나씩만 유지합니다.
+# 번호는 정수 배열(array 'q'), 구분은 구분 목록 + 번호 배열(CategoryColumn)로 저장해 행당 메모리를 줄입니다.
+COLUMNS = ("지정", "번호", "구분")
+SHEET_NAMES = ("법인", "개인")
+
+
+class PackedStrings:
+    # 스냅샷에서 읽은 문자열 열: UTF-8 바이트 묶음 + 오프셋 배열.
+    # 행을 읽을 때만 해당 구간을 디코딩합니다.
+    __slots__ = ("blob", "offsets")
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].decode("utf-8")
+
+    def __iter__(self):
+        blob, offsets = self.blob, self.offsets
+        for i in range(len(offsets) - 1):
+            yield blob[offsets[i]:offsets[i + 1]].decode("utf-8")
+
+
+class CategoryColumn:
+    # 구분 열: 서로 다른 구분 문자열 목록 + 행별 번호(uint32 배열).
+    # 같은 구분 문자열을 행마다 따로 두지 않고, 스냅샷의 구분 번호 배열을 그대로 씁니다.
+    __slots__ = ("names", "ids", "_index")
+
+    def __init__(self, names=None, ids=None):
+        self.names = names if names is not None else []
+        self.ids = ids if ids is not None else array("I")
+        self._index = {name: i for i, name in enumerate(self.names)}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            names = self.names
+            return [names[j] for j in self.ids[i]]
+        return self.names[self.ids[i]]
+
+    def __setitem__(self, i, name):
+        self.ids[i] = self._intern(name)
+
+    def __delitem__(self, i):
+        del self.ids[i]
+
+    def __iter__(self):
+        names = self.names
+        return (names[i] for i in self.ids)
+
+    def _intern(self, name):
+        idx = self._index.get(name)
+        if idx is None:
+            idx = self._index[name] = len(self.names)
+            self.names.append(name)
+        return idx
+
+    def append(self, name):
+        self.ids.append(self._intern(name))
+
+    def copy(self):
+        return CategoryColumn(list(self.names), array("I", self.ids))
+
+
+class CodeStore:
+    # 행마다 고정된 행 ID(row_ids)를 붙입니다. 행을 지우거나 추가해도 다른 행의 ID는 바뀌지 않으므로
+    # 편집 저널과 실행 취소 기록은 행 번호 대신 ID로 행을 가리킵니다. (ID는 스냅샷에 함께 저장)
+    __slots__ = ("abbrevs", "numbers", "categories", "row_ids", "next_id", "_id_rows")
+
+    def __init__(self):
+        self.abbrevs = []                   # 지정
+        self.numbers = array("q")           # 번호
+        self.categories = CategoryColumn()  # 구분
+        self.row_ids = array("I")           # 행 ID
+        self.next_id = 0
+        self._id_rows = None                # 행 ID -> 행 번호 (필요할 때 만듦)
+
+    @classmethod
+    def from_records(cls, records):
+        store = cls()
+        for rec in records:
+            store.append(rec["지정"], rec["번호"], rec["구분"])
+        return store
+
+    def copy(self):
+        # 백그라운드 저장용 복사본. 읽기 전용(스냅샷) 지정 열은 그대로 공유합니다.
+        store = CodeStore()
+        store.abbrevs = list(self.abbrevs) if isinstance(self.abbrevs, list) else self.abbrevs
+        store.numbers = array("q", self.numbers)
+        store.categories = self.categories.copy()
+        store.row_ids = array("I", self.row_ids)
+        store.next_id = self.next_id
+        return store
+
+    def to_records(self):
+        return [
+            {"지정": a, "번호": n, "구분": c}
+            for a, n, c in zip(self.abbrevs, self.numbers, self.categories)
+        ]
+
+    def __len__(self):
+        return len(self.abbrevs)
+
+    def _own_columns(self):
+        # 스냅샷에서 읽은 읽기 전용 지정 열은 처음 수정할 때 리스트로 바꿉니다.
+        if not isinstance(self.abbrevs, list):
+            self.abbrevs = list(self.abbrevs)
+
+    def append(self, abbrev, number, category):
+        self._own_columns()
+        if self._id_rows is not None:
+            self._id_rows[self.next_id] = len(self.abbrevs)
+        self.abbrevs.append(abbrev)
+        self.numbers.append(number)
+        self.categories.append(category)
+        self.row_ids.append(self.next_id)
+        self.next_id += 1
+
+    def get(self, row, column):
+        if column == 0:
+            return self.abbrevs[row]
+        if column == 1:
+            return self.numbers[row]
+        return self.categories[row]
+
+    def set(self, row, column, value):
+        if column == 0:
+            self._own_columns()
+            self.abbrevs[row] = value
+        elif column == 1:
+            self.numbers[row] = value
+        else:
+            self.categories[row] = value
+
+    def remove_rows(self, start, end):
+        # start ~ end(포함) 행 삭제
+        self._own_columns()
+        del self.abbrevs[start:end + 1]
+        del self.numbers[start:end + 1]
+        del self.categories[start:end + 1]
+        del self.row_ids[start:end + 1]
+        self._id_rows = None
+
+    def row_of(self, row_id):
+        # 행 ID의 현재 행 번호 (지워진 행이면 None)
+        if self._id_rows is None:
+            self._id_rows = {row_id: row for row, row_id in enumerate(self.row_ids)}
+        return self._id_rows.get(row_id)
+
+
+# ---------------------------
+# 검색 색인 (n-gram + 한글 초성)
+# ---------------------------
+# 행마다 "지정\n번호\n구분" 문자열(소문자)과 그 초성 문자열을 만들어 두고,
+# 2글자 조각(bigram)마다 그 조각이 들어 있는 행 번호 배열을 유지합니다.
+# 검색어의 조각들 중 가장 짧은 목록만 후보로 삼아 실제 포함 여부를 확인하므로
+# 행 수가 많아도 키 입력마다 전체를 훑지 않습니다.
+# 검색어에 초성(ㄱ~ㅎ)이 들어 있으면 초성 문자열에서 찾습니다. ("ㅂㄹ" -> "복리후생비")
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_CHOSEONG_SET = frozenset(CHOSEONG)
+
+
+def hangul_initials(text):
+    out = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(CHOSEONG[code // 588])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def _bigrams(text):
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def _initial_bigrams(initials):
+    # 초성이 섞인 조각만 따로 색인 (나머지는 원문 색인과 같으므로 그쪽을 사용)
+    return {gram for gram in _bigrams(initials) if gram[0] in _CHOSEONG_SET or gram[1] in _CHOSEONG_SET}
+
+
+def _rank_hits(texts, q, rows, usage=None, abbrevs=None):
+    # 순위: 지정 > 번호 > 구분, 그 안에서 완전 일치 > 앞부분 일치 > 포함, 자주 쓴 약어(usage) 우선, 짧은 값 우선
+    hits = []
+    for row in rows:
+        text = texts[row]
+        pos = text.find(q)
+        if pos < 0:
+            continue
+        field = text.count("\n", 0, pos)
+        start = text.rfind("\n", 0, pos) + 1
+        end = text.find("\n", pos)
+        end = len(text) if end < 0 else end
+        if pos == start:
+            kind = 0 if pos + len(q) == end else 1
+        else:
+            kind = 2
+        used = -usage.get(abbrevs[row], 0) if usage else 0
+        hits.append((field, kind, used, end - start, row))
+    hits.sort()
+    return [hit[4] for hit in hits]
+
+
+def _search_query(query):
+    # (정규화된 검색어, 초성 검색 여부)
+    q = query.strip().lower()
+    if any(ch in _CHOSEONG_SET for ch in q):
+        return hangul_initials(q), True
+    return q, False
+
+
+class SearchIndex:
+    REBUILD_STALE = 5000  # 편집으로 쌓인 오래된 색인 항목이 이만큼 되면 다시 만듦
+
+    def __init__(self, store):
+        self.store = store
+        self.rebuild()
+
+    def rebuild(self):
+        self.texts = []          # 행별 검색 문자열 (소문자)
+        self.initials = []       # 행별 초성 문자열 (한글이 없으면 texts와 같은 객체)
+        self.sort_keys = []      # 행별 지정 정렬 키 (collation_key - 테이블 정렬용으로 같이 만들어 둠)
+        self.grams = {}          # 조각 -> array('I') 행 번호
+        self.initial_grams = {}  # 초성이 섞인 조각 -> array('I') 행 번호
+        self._category_keys = {}  # 구분 값별 조각 캐시 (구분은 반복되는 값이 많음)
+        self.stale = 0
+        for row in range(len(self.store)):
+            self.texts.append("")
+            self.initials.append("")
+            self.sort_keys.append(b"")
+            self._index_row(row)
+
+    def _index_row(self, row):
+        store = self.store
+        abbrev = store.abbrevs[row].lower()
+        number = str(store.numbers[row])
+        category = store.categories[row].lower()
+        text = f"{abbrev}\n{number}\n{category}"
+        initials = hangul_initials(text)
+        if initials == text:
+            initials = text
+        self.texts[row] = text
+        self.initials[row] = initials
+        self.sort_keys[row] = collation_key(store.abbrevs[row])
+
+        cached = self._category_keys.get(category)
+        if cached is None:
+            cached = self._category_keys[category] = (_bigrams(category), _initial_bigrams(hangul_initials(category)))
+        keys = _bigrams(abbrev) | _bigrams(number) | cached[0]
+        initial_keys = cached[1]
+        if initials is not text:
+            initial_keys = initial_keys | _initial_bigrams(hangul_initials(abbrev))
+        for grams, gram_keys in ((self.grams, keys), (self.initial_grams, initial_keys)):
+            for gram in gram_keys:
+                posting = grams.get(gram)
+                if posting is None:
+                    posting = grams[gram] = array("I")
+                posting.append(row)
+
+    def update_row(self, row):
+        # 편집된 행만 다시 색인 (이전 조각의 항목은 남겨 두고, 검색할 때 실제 문자열로 걸러냄)
+        # 맨 뒤에 추가된 행(row == 색인된 행 수)도 여기서 색인합니다.
+        if row > len(self.texts):
+            return
+        if row == len(self.texts):
+            self.texts.append("")
+            self.initials.append("")
+            self.sort_keys.append(b"")
+        self._index_row(row)
+        self.stale += 1
+        if self.stale >= self.REBUILD_STALE:
+            self.rebuild()
+
+    def search(self, query, usage=None):
+        # 일치하는 행 번호를 순위대로 돌려줍니다. (usage: {약어: 치환 횟수})
+        q, initial_mode = _search_query(query)
+        if not q:
+            return []
+        texts = self.initials if initial_mode else self.texts
+        if len(q) == 1:
+            # 한 글자는 조각 색인이 없으므로 문자열 목록을 바로 훑음
+            return _rank_hits(texts, q, range(len(texts)), usage, self.store.abbrevs)
+        postings = []
+        for gram in _bigrams(q):
+            if initial_mode and (gram[0] in _CHOSEONG_SET or gram[1] in _CHOSEONG_SET):
+                posting = self.initial_grams.get(gram)
+            else:
+                posting = self.grams.get(gram)
+            if posting is None:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:3]:
+            candidates.intersection_update(posting)
+        return _rank_hits(texts, q, candidates, usage, self.store.abbrevs)
+
+    @staticmethod
+    def scan(store, query, usage=None):
+        # 색인이 아직 없을 때 쓰는 전체 훑기 (결과/순위는 search와 같음)
+        q, initial_mode = _search_query(query)
+        if not q:
+            return []
+        texts = [
+            f"{a}\n{n}\n{c}".lower()
+            for a, n, c in zip(store.abbrevs, store.numbers, store.categories)
+        ]
+        if initial_mode:
+            texts = [hangul_initials(text) for text in texts]
+        return _rank_hits(texts, q, range(len(texts)), usage, store.abbrevs)
+
+
+# ---------------------------
+# 정렬 / 필터 (미리 계산한 키 + 구분별 비트맵)
+# ---------------------------
+# GUI 테이블 모델의 rows(화면 행 -> 저장소 행)만 바꿔서 정렬/필터를 보여 주므로 테이블을 다시 만들지 않습니다.
+# - 지정: 행마다 한국어 정렬 키(bytes)를 한 번 만들어 두고 bytes 비교로 정렬
+# - 번호: 숫자 그대로, 구분: 서로 다른 구분 값만 정렬한 뒤 행을 구분별로 나눠 담음 (행 수에 비례)
+# - 구분 필터: 구분 번호별 행 비트맵(int)을 OR, 번호 범위는 번호순 행 목록에서 이분 탐색
+# 정렬 결과는 열/방향별로 캐시하고, 편집된 행은 update_row로 키만 고친 뒤 캐시를 버립니다.
+_DIGIT_RUN = re.compile(r"([0-9]+)")
+
+
+def collation_key(text):
+    # 한국어 정렬 키: 기호 < 숫자 < 영문 < 한글 순, 영문은 대소문자 무시, 숫자는 값 크기대로(2 < 10),
+    # 한글은 초성/중성/종성 순이고 초성만 쓴 글자(ㄱ, ㄴ ...)는 같은 초성의 음절보다 앞.
+    # 원소마다 종류 바이트 + 고정 길이 값이라 bytes를 그대로 비교하면 위 순서가 됩니다.
+    out = bytearray()
+    for i, part in enumerate(_DIGIT_RUN.split(text.casefold())):
+        if i % 2:
+            digits = part.lstrip("0") or "0"
+            out += bytes((1, min(len(digits), 255))) + digits.encode("ascii")
+            continue
+        for ch in part:
+            code = ord(ch)
+            if 0xAC00 <= code <= 0xD7A3:
+                code -= 0xAC00
+                out += bytes((3, code // 588, code % 588 // 28 + 1, code % 28))
+            elif ch in _CHOSEONG_SET:
+                out += bytes((3, CHOSEONG.index(ch), 0, 0))
+            else:
+                out.append(2 if ch.isalpha() else 0)
+                out += code.to_bytes(3, "big")
+    return bytes(out)
+
+
+class TableKeys:
+    def __init__(self, store):
+        self.store = store
+        self._abbrev_keys = None  # 행별 지정 정렬 키 (지정으로 처음 정렬할 때 만듦)
+        self._orders = {}         # (열, 내림차순) -> 행 순서
+        self._bitmaps = None      # 구분 번호 -> 행 비트맵
+
+    def update_row(self, row):
+        # 편집된 행 (맨 뒤에 추가된 행 포함)
+        if self._abbrev_keys is not None and row <= len(self._abbrev_keys):
+            key = collation_key(self.store.abbrevs[row])
+            if row == len(self._abbrev_keys):
+                self._abbrev_keys.append(key)
+            else:
+                self._abbrev_keys[row] = key
+        self._orders.clear()
+        self._bitmaps = None
+
+    def order(self, column, descending=False, abbrev_keys=None):
+        # column의 값 순서대로 정렬한 행 목록 (같은 값끼리는 원래 행 순서)
+        # abbrev_keys: 검색 색인이 만들어 둔 지정 정렬 키 (없으면 여기서 만듦)
+        cached = self._orders.get((column, descending))
+        if cached is not None:
+            return cached
+        store = self.store
+        if column == 0:
+            if abbrev_keys is None:
+                if self._abbrev_keys is None:
+                    self._abbrev_keys = [collation_key(abbrev) for abbrev in store.abbrevs]
+                abbrev_keys = self._abbrev_keys
+            rows = sorted(range(len(store)), key=abbrev_keys.__getitem__, reverse=descending)
+        elif column == 1:
+            rows = sorted(range(len(store)), key=store.numbers.__getitem__, reverse=descending)
+        else:
+            categories = store.categories
+            buckets = [[] for _ in categories.names]
+            for row, category_id in enumerate(categories.ids):
+                buckets[category_id].append(row)
+            ranked = sorted(range(len(buckets)), key=lambda i: collation_key(categories.names[i]), reverse=descending)
+            rows = [row for i in ranked for row in buckets[i]]
+        self._orders[(column, descending)] = rows
+        return rows
+
+    def usage_order(self, usage):
+        # 자주 쓴 약어 순 (횟수가 계속 바뀌므로 캐시하지 않음)
+        abbrevs = self.store.abbrevs
+        usage = usage or {}
+        return sorted(range(len(self.store)), key=lambda row: -usage.get(abbrevs[row], 0))
+
+    def category_bitmaps(self):
+        # {구분: 행 비트맵} (행이 하나도 없는 구분은 빠짐)
+        if self._bitmaps is None:
+            categories = self.store.categories
+            size = (len(self.store) + 7) // 8
+            blocks = [None] * len(categories.names)
+            for row, category_id in enumerate(categories.ids):
+                block = blocks[category_id]
+                if block is None:
+                    block = blocks[category_id] = bytearray(size)
+                block[row >> 3] |= 1 << (row & 7)
+            self._bitmaps = {
+                categories.names[i]: int.from_bytes(block, "little")
+                for i, block in enumerate(blocks) if block is not None
+            }
+        return self._bitmaps
+
+    def category_counts(self):
+        return {name: bitmap.bit_count() for name, bitmap in self.category_bitmaps().items()}
+
+    def mask(self, categories=None, number_range=None, rows=None):
+        # 조건을 모두 만족하는 행의 비트맵 (조건이 없으면 None)
+        # categories: 보여 줄 구분 집합, number_range: (최소, 최대) - 한쪽은 None 가능, rows: 검색 결과 행
+        mask = None
+        if categories:
+            bitmaps = self.category_bitmaps()
+            mask = 0
+            for name in categories:
+                mask |= bitmaps.get(name, 0)
+        if number_range is not None and number_range != (None, None):
+            low, high = number_range
+            by_number = self.order(1)
+            start = _number_bound(self.store, by_number, low, False)
+            end = _number_bound(self.store, by_number, high, True)
+            mask = _and_mask(mask, _rows_mask(by_number[start:end]))
+        if rows is not None:
+            mask = _and_mask(mask, _rows_mask(rows))
+        return mask
+
+    def select(self, order, mask):
+        # order 중에서 mask에 들어 있는 행만 (순서 유지)
+        if mask is None:
+            return list(order)
+        bits = mask.to_bytes((len(self.store) + 7) // 8, "little")
+        return [row for row in order if bits[row >> 3] >> (row & 7) & 1]
+
+
+def _rows_mask(rows):
+    block = bytearray((max(rows, default=-1) + 8) // 8)
+    for row in rows:
+        block[row >> 3] |= 1 << (row & 7)
+    return int.from_bytes(block, "little")
+
+
+def _and_mask(mask, other):
+    return other if mask is None else mask & other
+
+
+def _number_bound(store, by_number, value, upper):
+    # 번호순 행 목록에서 value 이상(upper면 value 초과)이 처음 나오는 위치
+    if value is None:
+        return len(by_number) if upper else 0
+    numbers = store.numbers
+    lo, hi = 0, len(by_number)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        n = numbers[by_number[mid]]
+        if n < value or (upper and n == value):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+# ---------------------------
+# 행 단위 비교 (원본 파일이 바뀌었을 때 바뀐 행만 반영)
+# ---------------------------
+# 지정을 키로 비교합니다. 같은 지정이 여러 행에 있으면 (지정, 몇 번째인지)를 키로 씁니다.
+#   updates: [(기존 행, 번호, 구분)]  - 같은 키인데 번호/구분이 다른 행
+#   inserts: [(지정, 번호, 구분)]     - 새 파일에만 있는 행 (맨 뒤에 추가)
+#   deletes: [기존 행]                - 새 파일에 없는 행
+def _keyed_rows(store):
+    keys = {}
+    seen = {}
+    for row, abbrev in enumerate(store.abbrevs):
+        k = seen.get(abbrev, 0)
+        seen[abbrev] = k + 1
+        keys[(abbrev, k)] = row
+    return keys
+
+
+def diff_code_rows(old, new):
+    old_keys = _keyed_rows(old)
+    updates, inserts = [], []
+    for key, new_row in _keyed_rows(new).items():
+        number, category = new.numbers[new_row], new.categories[new_row]
+        row = old_keys.pop(key, None)
+        if row is None:
+            inserts.append((key[0], number, category))
+        elif old.numbers[row] != number or old.categories[row] != category:
+            updates.append((row, number, category))
+    deletes = sorted(old_keys.values())
+    return updates, inserts, deletes
+
+
+def apply_code_diff(store, updates, inserts, deletes):
+    # diff_code_rows 결과를 store에 반영 (화면에 보이는 저장소는 CodeTableModel.apply_diff 사용)
+    for row, number, category in updates:
+        store.set(row, 1, number)
+        store.set(row, 2, category)
+    # 연속된 행끼리 묶어서 뒤에서부터 삭제
+    ranges = []
+    for row in deletes:
+        if ranges and ranges[-1][1] == row - 1:
+            ranges[-1][1] = row
+        else:
+            ranges.append([row, row])
+    for start, end in reversed(ranges):
+        store.remove_rows(start, end)
+    for abbrev, number, category in inserts:
+        store.append(abbrev, number, category)
+
+
+# ---------------------------
+# 바이너리 스냅샷 (data.snap)
+# ---------------------------
+# JSON(indent=4) 전체를 파싱하는 대신, 열 단위로 그대로 덤프한 파일을 사용합니다.
+# 번호/오프셋은 배열 메모리를 그대로 복사해 읽고, 문자열은 화면 표시 등으로
+# 실제로 접근할 때만 디코딩합니다.
+#
+# 파일 구조 (리틀 엔디언)
+#   헤더: magic "SH2S", 버전(u16), 시트 수(u16), 반영된 마지막 저널 번호(u64, 버전 2부터)
+#   시트마다: 행 수, 구분 종류 수, 지정 바이트 수, 구분 바이트 수, 다음 행 ID(버전 3부터) (각 u64)
+#             번호 int64[행 수]
+#             행 ID uint32[행 수] (버전 3부터. 이전 버전은 0부터 차례로 붙임)
+#             지정 오프셋 uint32[행 수 + 1], 구분 번호 uint32[행 수]
+#             구분 오프셋 uint32[구분 종류 수 + 1]
+#             지정 UTF-8 바이트, 구분 UTF-8 바이트 (8바이트 정렬)
+SNAPSHOT_MAGIC = b"SH2S"
+SNAPSHOT_VERSION = 3
+_SNAPSHOT_HEADER_V1 = struct.Struct("<4sHH")
+_SNAPSHOT_HEADER = struct.Struct("<4sHHQ")
+_SNAPSHOT_SECTION_V2 = struct.Struct("<QQQQ")
+_SNAPSHOT_SECTION = struct.Struct("<QQQQQ")
+
+
+def _pack_strings(strings):
+    offsets = array("I", [0])
+    chunks = []
+    pos = 0
+    for text in strings:
+        data = text.encode("utf-8")
+        chunks.append(data)
+        pos += len(data)
+        offsets.append(pos)
+    return b"".join(chunks), offsets
+
+
+def write_snapshot(path, stores, journal_seq=0):
+    # stores: 시트 순서(SHEET_NAMES)대로의 CodeStore 목록.
+    # journal_seq: 이 스냅샷에 이미 반영된 마지막 편집 저널 번호
+    # 임시 파일에 다 쓴 뒤 이름을 바꾸므로 중간에 꺼져도 기존 파일은 그대로 남습니다.
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(stores), journal_seq))
+        for store in stores:
+            abbrev_blob, abbrev_offsets = _pack_strings(store.abbrevs)
+            categories = store.categories
+            category_blob, category_offsets = _pack_strings(categories.names)
+            f.write(_SNAPSHOT_SECTION.pack(
+                len(store), len(categories.names), len(abbrev_blob), len(category_blob), store.next_id))
+            for block in (store.numbers, store.row_ids, abbrev_offsets, categories.ids, category_offsets):
+                if sys.byteorder != "little":
+                    block = array(block.typecode, block)
+                    block.byteswap()
+                f.write(block.tobytes())
+            f.write(abbrev_blob)
+            f.write(category_blob)
+            f.write(b"\0" * (-(len(abbrev_blob) + len(category_blob)) % 8))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _read_array(buf, typecode, offset, count):
+    block = array(typecode)
+    end = offset + count * block.itemsize
+    block.frombytes(buf[offset:end])
+    if sys.byteorder != "little":
+        block.byteswap()
+    return block, end
+
+
+def read_snapshot(path):
+    # (시트 순서(SHEET_NAMES)대로의 CodeStore 목록, 반영된 마지막 저널 번호)를 돌려줍니다.
+    # 파일은 메모리 매핑으로 열고 각 열을 덩어리째 복사한 뒤 바로 닫습니다.
+    # (매핑을 계속 유지하면 Windows에서 스냅샷 파일을 교체할 수 없음)
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError("스냅샷 파일이 비어 있습니다.")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            magic, version, count = _SNAPSHOT_HEADER_V1.unpack_from(mm, 0)
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError("스냅샷 파일 형식이 아닙니다.")
+            if version == 1:
+                journal_seq = 0
+                pos = _SNAPSHOT_HEADER_V1.size
+            elif version in (2, SNAPSHOT_VERSION):
+                journal_seq = _SNAPSHOT_HEADER.unpack_from(mm, 0)[3]
+                pos = _SNAPSHOT_HEADER.size
+            else:
+                raise ValueError(f"지원하지 않는 스냅샷 버전입니다: {version}")
+            stores = []
+            for _ in range(count):
+                if version == SNAPSHOT_VERSION:
+                    rows, n_categories, abbrev_len, category_len, next_id = _SNAPSHOT_SECTION.unpack_from(mm, pos)
+                    pos += _SNAPSHOT_SECTION.size
+                    numbers, pos = _read_array(mm, "q", pos, rows)
+                    row_ids, pos = _read_array(mm, "I", pos, rows)
+                else:
+                    rows, n_categories, abbrev_len, category_len = _SNAPSHOT_SECTION_V2.unpack_from(mm, pos)
+                    pos += _SNAPSHOT_SECTION_V2.size
+                    numbers, pos = _read_array(mm, "q", pos, rows)
+                    row_ids, next_id = array("I", range(rows)), rows
+                abbrev_offsets, pos = _read_array(mm, "I", pos, rows + 1)
+                category_ids, pos = _read_array(mm, "I", pos, rows)
+                category_offsets, pos = _read_array(mm, "I", pos, n_categories + 1)
+                abbrev_blob = mm[pos:pos + abbrev_len]
+                pos += abbrev_len
+                category_names = list(PackedStrings(mm[pos:pos + category_len], category_offsets))
+                pos += category_len
+                pos += -(abbrev_len + category_len) % 8
+
+                store = CodeStore()
+                store.abbrevs = PackedStrings(abbrev_blob, abbrev_offsets)
+                store.numbers = numbers
+                store.categories = CategoryColumn(category_names, category_ids)
+                store.row_ids = row_ids
+                store.next_id = next_id
+                stores.append(store)
+    return stores, journal_seq
+
+# ---------------------------
+# 엑셀 불러오기 캐시 (경로 + 수정 시각 + 내용 해시)
+# ---------------------------
+# 같은 엑셀 파일을 다시 불러오면 파싱하지 않고 캐시된 스냅샷을 사용합니다.
+#   1) 경로/수정 시각/크기가 기록과 같으면 해시 계산 없이 바로 캐시 사용
+#   2) 아니면 내용 해시(SHA-1)로 찾음 (복사/이동된 같은 파일도 재사용)
+def file_content_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ImportCache:
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, "index.json")
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _save_index(self, index):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+
+    def _snapshot_path(self, content_hash):
+        return os.path.join(self.cache_dir, content_hash + ".snap")
+
+    def _warnings_path(self, content_hash):
+        # 처음 불러올 때 나온 경고 (없는 시트, 건너뛴 행) - 캐시를 쓸 때도 똑같이 알리기 위해
+        return os.path.join(self.cache_dir, content_hash + ".warnings.json")
+
+    def lookup(self, source_path):
+        # 캐시가 있으면 (CodeStore 목록, 경고, 키) / 없으면 (None, None, 키)
+        # 경고는 {"missing": [시트 이름], "row_errors": [[시트, 엑셀 행 번호, 이유]]}
+        # 키는 store()에 그대로 넘겨 해시를 다시 계산하지 않게 합니다.
+        source_path = os.path.abspath(source_path)
+        st = os.stat(source_path)
+        index = self._load_index()
+        entry = index.get(source_path)
+        if entry and entry.get("mtime") == st.st_mtime_ns and entry.get("size") == st.st_size:
+            content_hash = entry["hash"]
+        else:
+            content_hash = file_content_hash(source_path)
+        key = {"path": source_path, "mtime": st.st_mtime_ns, "size": st.st_size, "hash": content_hash}
+        snap_path = self._snapshot_path(content_hash)
+        if os.path.exists(snap_path):
+            try:
+                with open(self._warnings_path(content_hash), "r", encoding="utf-8") as f:
+                    warnings = json.load(f)
+                missing, row_errors = list(warnings["missing"]), [tuple(e) for e in warnings["row_errors"]]
+                stores, _ = read_snapshot(snap_path)
+            except Exception:
+                return None, None, key  # 경고 기록이 없는 이전 캐시 등 - 다시 파싱
+            if entry != {k: key[k] for k in ("mtime", "size", "hash")}:
+                self.remember(key)
+            return stores, {"missing": missing, "row_errors": row_errors}, key
+        return None, None, key
+
+    def store(self, key, stores, missing=(), row_errors=()):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        warnings_path = self._warnings_path(key["hash"])
+        tmp_path = warnings_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"missing": list(missing), "row_errors": [list(e) for e in row_errors]}, f, ensure_ascii=False)
+        os.replace(tmp_path, warnings_path)
+        write_snapshot(self._snapshot_path(key["hash"]), stores)
+        self.remember(key)
+
+    def remember(self, key):
+        index = self._load_index()
+        index[key["path"]] = {"mtime": key["mtime"], "size": key["size"], "hash": key["hash"]}
+        self._save_index(index)
+
+
+# ---------------------------
+# 편집 저널 (append-only) + 백그라운드 압축
+# ---------------------------
+# 셀 편집은 한 줄짜리 JSON 기록으로 저널 파일 끝에 덧붙이기만 합니다.
+#   - record(): 메모리에만 쌓음 (편집 시점 비용 최소)
+#   - commit(): 쌓인 기록을 한 번의 write + fsync로 저장 (GUI에서 디바운스해서 호출)
+#   - checkpoint(): 현재 데이터를 스냅샷으로 저장하고 저널을 비움 (별도 스레드)
+# 각 기록에는 증가하는 번호(n)가 붙고, 스냅샷 헤더에는 반영된 마지막 번호가 들어갑니다.
+# 시작할 때는 스냅샷보다 번호가 큰 기록만 다시 적용하므로,
+# 압축 도중 프로그램이 꺼져도 편집이 빠지거나 두 번 적용되지 않습니다.
+class EditJournal:
+    COMPACT_BYTES = 256 * 1024  # 저널이 이 크기를 넘으면 스냅샷으로 압축
+
+    def __init__(self, path, snapshot_path):
+        self.path = path
+        self.old_path = path + ".old"   # 압축 중인(스냅샷에 쓰는 중인) 이전 저널
+        self.snapshot_path = snapshot_path
+        self.seq = 0
+        self.pending = []
+        self._executor = ThreadPoolExecutor(max_workers=1)  # 스냅샷 쓰기는 한 번에 하나씩, 요청 순서대로
+        self._checkpoint_gen = 0
+
+    def record(self, mode, row_id, column, value):
+        # 행은 행 ID로 기록 (기록과 스냅샷 사이에 행이 지워지거나 추가돼도 같은 행에 적용)
+        self.seq += 1
+        self.pending.append({"n": self.seq, "m": mode, "i": row_id, "c": column, "v": value})
+
+    def commit(self):
+        if not self.pending:
+            return
+        lines = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in self.pending)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        self.pending.clear()
+
+    def needs_compaction(self):
+        try:
+            return os.path.getsize(self.path) > self.COMPACT_BYTES
+        except OSError:
+            return False
+
+    def _read_entries(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        # 기록 도중 꺼져서 잘린 마지막 줄은 무시
+                        continue
+        except FileNotFoundError:
+            return
+
+    def replay(self, stores, base_seq):
+        # stores: {"법인": CodeStore, "개인": CodeStore}
+        # 스냅샷(base_seq) 이후의 편집만 순서대로 다시 적용하고, 적용한 개수를 돌려줍니다.
+        applied = 0
+        self.seq = base_seq
+        for path in (self.old_path, self.path):
+            for entry in self._read_entries(path):
+                n = entry.get("n", 0)
+                self.seq = max(self.seq, n)
+                if n <= base_seq:
+                    continue
+                store = stores.get(entry.get("m"))
+                if store is None:
+                    continue
+                if "i" in entry:
+                    row = store.row_of(entry["i"])
+                else:
+                    row = entry.get("r", -1)  # 행 ID가 없던 이전 버전의 기록
+                column = entry.get("c", -1)
+                if row is None or not (0 <= row < len(store)) or column not in (0, 1, 2):
+                    continue
+                store.set(row, column, entry["v"])
+                applied += 1
+        return applied
+
+    def _rotate(self):
+        # 현재 저널을 .old로 옮김 (이미 .old가 있으면 뒤에 이어 붙임)
+        if not os.path.exists(self.path):
+            return
+        if os.path.exists(self.old_path):
+            with open(self.path, "r", encoding="utf-8") as src, open(self.old_path, "a", encoding="utf-8") as dst:
+                dst.write(src.read())
+                dst.flush()
+                os.fsync(dst.fileno())
+            os.remove(self.path)
+        else:
+            os.replace(self.path, self.old_path)
+
+    def checkpoint(self, stores, discard=False):
+        # stores: 시트 순서대로의 CodeStore 목록 (복사본을 떠서 백그라운드에서 저장)
+        # discard=True: 데이터를 통째로 새로 불러온 경우. 이전 편집 기록은 버립니다.
+        if discard:
+            self.pending.clear()
+            for path in (self.path, self.old_path):
+                if os.path.exists(path):
+                    os.remove(path)
+        else:
+            self.commit()
+            self._rotate()
+        self._checkpoint_gen += 1
+        gen = self._checkpoint_gen
+        copies = [store.copy() for store in stores]
+        seq = self.seq
+        return self._executor.submit(self._write_checkpoint, copies, seq, gen)
+
+    def _write_checkpoint(self, copies, seq, gen):
+        write_snapshot(self.snapshot_path, copies, seq)
+        # 뒤에 또 다른 체크포인트가 예약돼 있으면 .old는 그쪽에서 지웁니다.
+        if gen == self._checkpoint_gen and os.path.exists(self.old_path):
+            os.remove(self.old_path)
+
+    def close(self):
+        # 남은 기록을 저장하고 진행 중인 스냅샷 쓰기가 끝날 때까지 기다림
+        self.commit()
+        self._executor.shutdown(wait=True)
+
+
+# ---------------------------
+# 표 편집 (트랜잭션 / 값 검증 / 실행 취소)
+# ---------------------------
+# 붙여넣기나 찾아 바꾸기처럼 여러 셀을 한 번에 고칠 때 셀마다 트라이를 교체하고 저장하지 않도록,
+# 바뀐 셀을 모아 두었다가 커밋할 때 한 번만 반영합니다.
+#   - 핫스트링: 바뀐 약어의 경로만 고친 트라이로 한 번 교체
+#   - 저장: 저널에 한꺼번에 기록 (쓰기 1회)
+#   - 실행 취소: 트랜잭션 하나가 실행 취소 항목 하나 (행은 행 ID로 보관)
+# 여기서는 저장소만 다루고, 화면 알림/검색 색인/실행 취소 스택은 GUI(commit_transaction)가 맡습니다.
+# set_cell(store, 행, 열, 값)을 넘기면 저장소를 고칠 때 그 함수를 씁니다. (GUI는 화면 알림까지 하는 모델의 set_cell)
+class EditTransaction:
+    def __init__(self, label, undoable=True):
+        self.label = label
+        self.undoable = undoable
+        self.changes = []  # [(모드, 행, 열, 이전 값, 새 값)]
+        self.rejected = 0  # 잘못된 값(빈 지정, 정수가 아닌 번호)이라 건너뛴 셀 수
+
+
+class EditTransactions:
+    # 안에서 일어난 셀 변경을 모아서 끝날 때 on_commit(transaction)으로 한 번에 반영 (중첩되면 가장 바깥에서 반영)
+    def __init__(self, on_commit):
+        self.on_commit = on_commit
+        self.current = None  # 진행 중인 EditTransaction
+
+    @contextmanager
+    def begin(self, label, undoable=True):
+        if self.current is not None:
+            yield self.current
+            return
+        transaction = self.current = EditTransaction(label, undoable)
+        try:
+            yield transaction
+        finally:
+            self.current = None
+            self.on_commit(transaction)
+
+
+def parse_cell(column, value):
+    # 표에 입력한 값 -> 저장할 값 (잘못된 값이면 화면에 그대로 보여 줄 메시지로 ValueError)
+    if column == 1:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise ValueError("번호는 정수여야 합니다.") from None
+    value = str(value).strip()
+    if column == 0 and not value:
+        raise ValueError("지정은 비워 둘 수 없습니다.")
+    return value
+
+
+def _set_store_cell(store, row, column, value):
+    store.set(row, column, value)
+
+
+def edit_cells(transaction, mode, store, edits, set_cell=None):
+    # edits: [(행, 열, 입력한 값)]. 잘못된 값은 transaction.rejected로 세고 건너뛰며,
+    # 값이 바뀐 셀만 고쳐서 transaction에 기록. 바꾼 셀 수를 돌려줌
+    set_cell = set_cell or _set_store_cell
+    count = 0
+    for row, column, value in edits:
+        try:
+            new = parse_cell(column, value)
+        except ValueError:
+            transaction.rejected += 1
+            continue
+        old = store.get(row, column)
+        if new == old:
+            continue
+        set_cell(store, row, column, new)
+        transaction.changes.append((mode, row, column, old, new))
+        count += 1
+    return count
+
+
+def paste_edits(text, current, selected, rows):
+    # 탭/줄바꿈으로 구분된 text를 current(화면 행, 열) 셀부터 채울 [(저장소 행, 열, 값)]
+    # 값이 하나면 선택한 모든 셀(selected: [(화면 행, 열)])에 채움 (엑셀과 동일). 표 밖으로 넘치는 부분은 버림
+    # rows: 화면 행 -> 저장소 행 (검색 중이면 보이는 행만)
+    grid = [line.rstrip("\r").split("\t") for line in text.rstrip("\r\n").split("\n")]
+    if len(grid) == 1 and len(grid[0]) == 1:
+        return [(rows[row], column, grid[0][0]) for row, column in (selected or [current])]
+    edits = []
+    for dr, values in enumerate(grid):
+        row = current[0] + dr
+        if row >= len(rows):
+            break
+        for dc, value in enumerate(values):
+            column = current[1] + dc
+            if column >= len(COLUMNS):
+                break
+            edits.append((rows[row], column, value))
+    return edits
+
+
+def replace_edits(store, column, find, replace, rows=None):
+    # 한 열에서 find가 들어 있는 셀마다 replace로 바꾼 [(행, 열, 값)] (rows: 대상 행 - 검색 결과만 바꿀 때)
+    edits = []
+    for row in range(len(store)) if rows is None else rows:
+        text = str(store.get(row, column))
+        if find in text:
+            edits.append((row, column, text.replace(find, replace)))
+    return edits
+
+
+def revert_edits(transaction, stores, changes, undo, set_cell=None):
+    # 행 ID로 기록한 changes를 실행 취소(undo=True)면 이전 값으로, 다시 실행이면 새 값으로 (그 사이 지워진 행은 건너뜀)
+    set_cell = set_cell or _set_store_cell
+    for mode, row_id, column, old, new in (reversed(changes) if undo else changes):
+        row = stores[mode].row_of(row_id)
+        if row is None:
+            continue
+        before, after = (new, old) if undo else (old, new)
+        set_cell(stores[mode], row, column, after)
+        transaction.changes.append((mode, row, column, before, after))
+
+
+def commit_edits(transaction, stores, journal):
+    # 트랜잭션의 변경을 저널에 기록하고 (행 ID 기준 변경 목록(실행 취소용), {모드: 트라이에서 다시 확인할 약어})
+    changes = []
+    affected = {}
+    for mode, row, column, old, new in transaction.changes:
+        store = stores[mode]
+        row_id = store.row_ids[row]
+        changes.append((mode, row_id, column, old, new))
+        journal.record(mode, row_id, column, new)
+        if column == 0:
+            affected.setdefault(mode, set()).update((old, new))
+        else:
+            affected.setdefault(mode, set()).add(store.abbrevs[row])  # 번호 (구분은 자동완성 목록용)
+    return changes, affected
+
+
+# ---------------------------
+# 프로필 (거래처별 코드표)
+# ---------------------------
+# 프로필마다 법인/개인 시트와 스냅샷, 편집 저널을 따로 둡니다.
+#   기본 프로필: 기존 data.snap / data.journal
+#   그 외:      profiles/<이름>/data.snap, data.journal
+# 최근에 쓴 프로필은 컴파일된 트라이와 검색 색인까지 메모리에 남겨 두어(LRU)
+# 다시 전환할 때 파일을 읽지 않습니다. 메모리 한도를 넘으면 가장 오래 안 쓴 프로필부터
+# 내려놓고(저널 저장 후), 다음에 전환할 때 스냅샷에서 다시 읽습니다.
+class ProfileState:
+    __slots__ = ("name", "stores", "journal", "tables", "search_indexes", "replayed")
+
+    def __init__(self, name, stores, journal, tables=None, search_indexes=None, replayed=0):
+        self.name = name
+        self.stores = stores  # {"법인": CodeStore, "개인": CodeStore}
+        self.journal = journal
+        self.tables = tables  # 컴파일된 트라이 (None이면 전환할 때 컴파일)
+        self.search_indexes = search_indexes or {}
+        self.replayed = replayed  # 불러올 때 다시 적용한 저널 편집 수
+
+    def estimated_bytes(self):
+        return sum(len(store) for store in self.stores.values()) * ProfileRegistry.ROW_BYTES
+
+
+class ProfileRegistry:
+    DEFAULT = "기본"
+    ROW_BYTES = 800  # 행 하나당 데이터 + 트라이 + 검색 색인 메모리 (5만 행 측정값 기준 대략치)
+    BUDGET_BYTES = 256 * 1024 * 1024
+    INVALID_CHARS = frozenset('\\/:*?"<>|')
+
+    def __init__(self, directory, state_file, default_paths, budget_bytes=BUDGET_BYTES):
+        # default_paths: 기본 프로필의 (스냅샷, 저널) 경로
+        self.directory = directory
+        self.state_file = state_file
+        self.default_paths = default_paths
+        self.budget_bytes = budget_bytes
+        self.cache = OrderedDict()  # 이름 -> ProfileState (현재 프로필 제외, 마지막이 가장 최근)
+        self.active = self.DEFAULT
+        self.sources = {}  # 이름 -> 마지막으로 불러온 원본 파일 (엑셀/JSON, 변경 감시 대상)
+        self.sync = {}     # 이름 -> {"url": 공용 코드표 서버, "version": 마지막으로 받은 판}
+        try:
+            with open(state_file, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("active") in self.names():
+                self.active = state["active"]
+            self.sources = dict(state.get("sources", {}))
+            self.sync = dict(state.get("sync", {}))
+        except (OSError, ValueError, AttributeError, TypeError):
+            pass
+
+    def names(self):
+        try:
+            others = sorted(
+                name for name in os.listdir(self.directory)
+                if os.path.isdir(os.path.join(self.directory, name)) and name != self.DEFAULT
+            )
+        except OSError:
+            others = []
+        return [self.DEFAULT] + others
+
+    def paths(self, name):
+        # (스냅샷, 저널) 경로
+        if name == self.DEFAULT:
+            return self.default_paths
+        folder = os.path.join(self.directory, name)
+        return os.path.join(folder, "data.snap"), os.path.join(folder, "data.journal")
+
+    def usage_path(self, name):
+        # 사용 빈도 파일 (스냅샷 옆 data.usage.json)
+        return os.path.splitext(self.paths(name)[0])[0] + ".usage.json"
+
+    def validate_name(self, name):
+        # 폴더 이름으로 쓸 수 없으면 오류 메시지, 괜찮으면 None
+        if not name or name != name.strip() or name in (".", ".."):
+            return "프로필 이름이 비어 있거나 앞뒤에 공백이 있습니다."
+        if any(ch in self.INVALID_CHARS for ch in name):
+            return "프로필 이름에 \\ / : * ? \" < > | 는 쓸 수 없습니다."
+        if name in self.names():
+            return f"'{name}' 프로필이 이미 있습니다."
+        return None
+
+    def create(self, name):
+        os.makedirs(os.path.join(self.directory, name))
+
+    def open(self, name):
+        # 캐시에 있으면 그대로, 없으면 스냅샷 + 저널에서 불러옴
+        state = self.cache.pop(name, None)
+        if state is not None:
+            return state
+        snap_path, journal_path = self.paths(name)
+        journal = EditJournal(journal_path, snap_path)
+        stores = {"법인": CodeStore(), "개인": CodeStore()}
+        replayed = 0
+        if os.path.exists(snap_path):
+            (corp, personal), journal_seq = read_snapshot(snap_path)
+            stores = {"법인": corp, "개인": personal}
+            # 스냅샷 이후 저널에 남은 편집을 다시 적용
+            replayed = journal.replay(stores, journal_seq)
+        return ProfileState(name, stores, journal, replayed=replayed)
+
+    def release(self, state):
+        # 전환하면서 내려놓은 프로필을 가장 최근 항목으로 보관하고 한도를 넘으면 오래된 것부터 정리
+        state.replayed = 0
+        self.cache[state.name] = state
+        self.cache.move_to_end(state.name)
+        total = sum(s.estimated_bytes() for s in self.cache.values())
+        while total > self.budget_bytes and self.cache:
+            _, evicted = self.cache.popitem(last=False)
+            total -= evicted.estimated_bytes()
+            evicted.journal.close()
+
+    def set_active(self, name):
+        self.active = name
+        self._save_state()
+
+    def set_source(self, name, path):
+        if self.sources.get(name) != path:
+            self.sources[name] = path
+            self._save_state()
+
+    def set_sync(self, name, url, version=0):
+        # url이 None이면 동기화 해제
+        if url is None:
+            self.sync.pop(name, None)
+        else:
+            self.sync[name] = {"url": url, "version": version}
+        self._save_state()
+
+    def _save_state(self):
+        try:
+            with open(self.state_file, "w", encoding="utf-8") as f:
+                state = {"active": self.active, "sources": self.sources, "sync": self.sync}
+                json.dump(state, f, ensure_ascii=False, indent=4)
+        except OSError:
+            pass
+
+    def close(self):
+        for state in self.cache.values():
+            state.journal.close()
+        self.cache.clear()
+
+
+# ---------------------------
+# 지연 시간 측정 (고정 메모리 히스토그램)
+# ---------------------------
+# 값마다 저장하지 않고 로그 눈금 구간(2배마다 4칸)별 개수만 셉니다.
+# 1ns ~ 약 18분 범위를 160칸으로 덮으므로 메모리는 항상 일정하고,
+# 기록 한 번은 정수 비트 연산 + 배열 덧셈뿐이라 상시로 켜 둘 수 있습니다.
+class LatencyHistogram:
+    BUCKETS_PER_DOUBLING = 4  # 최상위 비트 다음 2비트로 2배 구간을 4칸으로 나눔
+    BUCKET_COUNT = 160
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.counts = array("Q", bytes(8 * self.BUCKET_COUNT))
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, ns):
+        if ns < 1:
+            ns = 1
+        exponent = ns.bit_length() - 1
+        if exponent >= 2:
+            bucket = (exponent << 2) | ((ns >> (exponent - 2)) & 3)
+        else:
+            bucket = exponent << 2
+        if bucket >= self.BUCKET_COUNT:
+            bucket = self.BUCKET_COUNT - 1
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def _bucket_upper_ns(self, bucket):
+        exponent, sub = divmod(bucket, self.BUCKETS_PER_DOUBLING)
+        if exponent < 2:
+            return float(2 ** (exponent + 1))  # 1~3ns는 2배 구간 하나로만 셈
+        return float(2 ** exponent) * (1 + (sub + 1) / self.BUCKETS_PER_DOUBLING)
+
+    def percentile_ns(self, p):
+        # 해당 백분위가 들어 있는 구간의 위쪽 경계 (실제 값보다 최대 25% 큼)
+        if self.count == 0:
+            return 0.0
+        target = self.count * p / 100.0
+        seen = 0
+        for bucket, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= target:
+                return min(self._bucket_upper_ns(bucket), self.max_ns)
+        return float(self.max_ns)
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "mean_us": round(self.total_ns / self.count / 1000.0, 3) if self.count else 0.0,
+            "p50_us": round(self.percentile_ns(50) / 1000.0, 3),
+            "p95_us": round(self.percentile_ns(95) / 1000.0, 3),
+            "p99_us": round(self.percentile_ns(99) / 1000.0, 3),
+            "max_us": round(self.max_ns / 1000.0, 3),
+        }
+
+
+class HotstringStats:
+    # 핫스트링 처리 단계별 지연 시간
+    #   key        : 키 이벤트 하나를 처리하는 데 걸린 시간 (모든 키)
+    #   hook_delay : OS가 키 이벤트를 만든 시각 -> 훅에서 받은 시각
+    #   match      : 스페이스 이벤트를 받은 시각 -> 약어 일치 확인
+    #   inject     : 백스페이스 + 번호 입력을 보내는 데 걸린 시간 (입력 방식별로 다름)
+    #   total      : 스페이스 이벤트를 받은 시각 -> 치환 입력 완료
+    SLOWEST_KEEP = 10
+    NAMES = ("key", "hook_delay", "match", "inject", "total")
+
+    def __init__(self):
+        self.histograms = {name: LatencyHistogram() for name in self.NAMES}
+        self.slowest = []  # (total_ns, 약어) 최소 힙 - 가장 느린 SLOWEST_KEEP개만 유지
+        self.started = time.time()
+        self.backend = ""  # 현재 입력 방식 이름 (HotstringEngine.set_output에서 설정)
+        self.inject_errors = 0
+        self.stale_injections = 0  # 보내기 전에 다른 키가 눌려서 버린 치환 (클립보드 붙여넣기)
+
+    def reset(self):
+        for histogram in self.histograms.values():
+            histogram.reset()
+        self.slowest = []
+        self.started = time.time()
+        self.inject_errors = 0
+        self.stale_injections = 0
+
+    def record_replacement(self, abbrev, match_ns, inject_ns, total_ns):
+        h = self.histograms
+        h["match"].record(match_ns)
+        h["inject"].record(inject_ns)
+        h["total"].record(total_ns)
+        if len(self.slowest) < self.SLOWEST_KEEP:
+            heapq.heappush(self.slowest, (total_ns, abbrev))
+        elif total_ns > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, (total_ns, abbrev))
+
+    def to_dict(self):
+        return {
+            "since": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "backend": self.backend,
+            "inject_errors": self.inject_errors,
+            "stale_injections": self.stale_injections,
+            "histograms": {name: h.to_dict() for name, h in self.histograms.items()},
+            "slowest": [
+                {"지정": abbrev, "total_us": round(ns / 1000.0, 3)}
+                for ns, abbrev in sorted(self.slowest, reverse=True)
+            ],
+        }
+
+# ---------------------------
+# 사용 빈도 (약어별 치환 횟수)
+# ---------------------------
+# 훅 스레드는 치환할 때 메모리의 대기 목록에 1을 더하기만 하고, 파일 쓰기는 flush에서 모아서 합니다.
+# (GUI는 타이머, 데몬은 대기 루프가 USAGE_FLUSH_S마다 호출)
+# flush는 파일을 다시 읽어 대기분을 더한 뒤 쓰므로, GUI와 데몬이 같은 프로필의 횟수를
+# 번갈아 기록해도 서로 덮어쓰지 않습니다.
+# 횟수는 자동완성 후보/검색 결과의 순위와 사용하지 않는 코드 보고서에 씁니다.
+USAGE_FLUSH_S = 60
+
+
+class UsageCounts:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()  # 훅 스레드와 flush 사이 (대기 목록만 보호)
+        self.mode = "법인"  # 지금 치환에 쓰는 코드표 (엔진의 트라이를 바꿀 때 같이 바꿈)
+        self.pending = {}   # (모드, 약어) -> 아직 파일에 쓰지 않은 횟수
+        self.counts, self.since, self._mtime = self._read()
+
+    def _read(self):
+        # ({모드: {약어: 횟수}}, 기록 시작 시각, 파일 수정 시각)
+        counts = {mode: {} for mode in SHEET_NAMES}
+        try:
+            mtime = os.path.getmtime(self.path)
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return counts, None, None
+        for mode in SHEET_NAMES:
+            counts[mode].update(data.get("counts", {}).get(mode, {}))
+        return counts, data.get("since"), mtime
+
+    def hit(self, abbrev):
+        # 훅 스레드에서 치환할 때마다 호출 (메모리만 고침)
+        key = (self.mode, abbrev)
+        with self.lock:
+            self.pending[key] = self.pending.get(key, 0) + 1
+
+    def get(self, mode):
+        # {약어: 횟수} (아직 파일에 쓰지 않은 횟수 포함). 돌려받은 dict는 고치지 말 것
+        with self.lock:
+            pending = [(abbrev, n) for (m, abbrev), n in self.pending.items() if m == mode]
+        counts = self.counts[mode]
+        if pending:
+            counts = dict(counts)
+            for abbrev, n in pending:
+                counts[abbrev] = counts.get(abbrev, 0) + n
+        return counts
+
+    def flush(self):
+        # 대기 중인 횟수를 파일에 더함. 쓸 것이 없으면 다른 프로세스가 쓴 파일만 다시 읽음
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        if not pending:
+            try:
+                changed = os.path.getmtime(self.path) != self._mtime
+            except OSError:
+                changed = False
+            if changed:
+                self.counts, self.since, self._mtime = self._read()
+            return 0
+        counts, since, _ = self._read()
+        for (mode, abbrev), n in pending.items():
+            counts[mode][abbrev] = counts[mode].get(abbrev, 0) + n
+        since = since or time.strftime("%Y-%m-%dT%H:%M:%S")
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"since": since, "counts": counts}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # 못 쓴 횟수는 대기 목록에 되돌려 두고 다음 flush에서 다시 시도
+            with self.lock:
+                for key, n in pending.items():
+                    self.pending[key] = self.pending.get(key, 0) + n
+            raise
+        self.counts, self.since, self._mtime = counts, since, os.path.getmtime(self.path)
+        return sum(pending.values())
+
+
+def usage_report(stores, usage, top=20):
+    # 모드별 자주 쓰는 코드 상위 top개와 한 번도 치환되지 않은 코드 목록
+    report = {"since": usage.since, "modes": {}}
+    for mode in SHEET_NAMES:
+        store = stores[mode]
+        counts = usage.get(mode)
+        seen = set()
+        used, dead = [], []
+        for abbrev, number, category in zip(store.abbrevs, store.numbers, store.categories):
+            if not abbrev or abbrev in seen:
+                continue  # 같은 지정이 여러 번 있으면 처음 나온 행만 치환됨
+            seen.add(abbrev)
+            n = counts.get(abbrev, 0)
+            if n:
+                used.append((n, abbrev, number, category))
+            else:
+                dead.append({"지정": abbrev, "번호": number, "구분": category})
+        used.sort(key=lambda entry: (-entry[0], entry[1]))
+        report["modes"][mode] = {
+            "codes": len(seen),
+            "used": len(used),
+            "hits": sum(entry[0] for entry in used),
+            "hot": [{"지정": a, "번호": num, "구분": c, "횟수": n} for n, a, num, c in used[:top]],
+            "dead": dead,
+        }
+    return report
+
+# ---------------------------
+# 핫스트링 엔진 (전역 훅 1개 + 접두사 트라이)
+# ---------------------------
+# keyboard.add_abbreviation은 약어마다 별도의 훅을 등록하기 때문에
+# 키 하나를 누를 때마다 등록된 모든 리스너가 실행됩니다.
+# 여기서는 훅을 하나만 걸고 입력 중인 단어를 트라이 위에서 한 칸씩 따라가므로
+# 키 입력당 비용이 약어 개수와 상관없이 일정합니다.
+#
+# 자동완성 목록용으로 만들면(suggest=True) 노드마다 그 접두사로 시작하는 약어 중 상위 SUGGEST_TOP_K개
+# (지정, 번호, 구분)를 미리 담아 둡니다(top). 입력 중에는 현재 노드의 top을 그대로 보여 주기만 하므로
+# 키 입력당 추가 비용이 없습니다. 순위는 자주 쓴 약어(usage) 먼저, 그다음 짧은 약어, 같은 길이면 가나다순.
+# 자동완성을 쓰지 않으면 top은 None이고 만드는 비용도 들지 않습니다.
+SUGGEST_TOP_K = 8
+
+
+class TrieNode:
+    __slots__ = ("children", "replacement", "abbrev", "category", "top")
+
+    def __init__(self):
+        self.children = {}
+        self.replacement = None
+        self.abbrev = None    # 끝 노드에만 (진단용 약어 이름)
+        self.category = None  # 끝 노드에만 (자동완성 목록용)
+        self.top = None       # 자동완성 후보 [(지정, 번호, 구분)] (suggest=True로 만든 트라이만)
+
+
+def _suggest_key(usage):
+    # 약어 -> 순위 키 (usage: {약어: 치환 횟수} 또는 None)
+    if not usage:
+        return lambda abbrev: (len(abbrev), abbrev)
+    return lambda abbrev: (-usage.get(abbrev, 0), len(abbrev), abbrev)
+
+
+def build_hotstring_trie(store, suggest=False, usage=None):
+    root = TrieNode()
+    if suggest:
+        return _build_suggest_trie(root, store, usage)
+    for abbrev, number in zip(store.abbrevs, store.numbers):
+        if not abbrev:
+            continue
+        node = root
+        for ch in abbrev:
+            child = node.children.get(ch)
+            if child is None:
+                child = node.children[ch] = TrieNode()
+            node = child
+        # 같은 지정이 여러 번 있으면 처음 나온 행을 사용 (기존 동작과 동일)
+        if node.replacement is None:
+            node.replacement = str(number)
+            node.abbrev = abbrev
+    return root
+
+
+def _build_suggest_trie(root, store, usage=None):
+    # 약어를 순위 순서로 넣으면 각 노드에 처음 도착한 K개가 곧 그 노드의 상위 K개입니다. (병합 불필요)
+    # 같은 지정끼리는 행 순서가 유지되므로(안정 정렬) 처음 나온 행을 쓰는 규칙도 그대로입니다.
+    abbrevs, numbers, categories = store.abbrevs, store.numbers, store.categories
+    k = SUGGEST_TOP_K
+    root.top = []
+    previous = None
+    rank = _suggest_key(usage)
+    for row in sorted(range(len(abbrevs)), key=lambda r: rank(abbrevs[r])):
+        abbrev = abbrevs[row]
+        if not abbrev or abbrev == previous:
+            continue
+        previous = abbrev
+        entry = (abbrev, str(numbers[row]), categories[row])
+        node = root
+        if len(node.top) < k:
+            node.top.append(entry)
+        for ch in abbrev:
+            child = node.children.get(ch)
+            if child is None:
+                child = node.children[ch] = TrieNode()
+                child.top = []
+            node = child
+            if len(node.top) < k:
+                node.top.append(entry)
+        node.replacement, node.abbrev, node.category = entry[1], abbrev, entry[2]
+    return root
+
+
+def _copy_trie_node(node):
+    copy = TrieNode()
+    copy.children = dict(node.children)
+    copy.replacement = node.replacement
+    copy.abbrev = node.abbrev
+    copy.category = node.category
+    copy.top = node.top
+    return copy
+
+
+def _merge_suggest_top(node, rank):
+    # 자식들의 top과 자기 자신으로 이 노드의 top을 다시 계산 (경로 복사한 노드만)
+    candidates = [entry for child in node.children.values() for entry in child.top]
+    if node.replacement is not None:
+        candidates.append((node.abbrev, node.replacement, node.category))
+    return heapq.nsmallest(SUGGEST_TOP_K, candidates, key=lambda entry: rank(entry[0]))
+
+
+def patch_hotstring_trie(root, store, abbrevs, usage=None):
+    # abbrevs에 해당하는 경로만 복사해서 고친 새 트라이를 돌려줍니다 (경로 복사).
+    # 나머지 가지는 기존 트라이와 공유하므로 훅 스레드가 읽고 있는 트라이는 바뀌지 않고,
+    # 비용은 전체 행 수가 아니라 바뀐 약어 수 x 약어 길이에 비례합니다.
+    # (지운 약어의 빈 가지는 남겨 둡니다 - 끝 노드가 아니므로 치환되지 않음)
+    wanted = {abbrev for abbrev in abbrevs if abbrev}
+    first = {}
+    if wanted:
+        for row, abbrev in enumerate(store.abbrevs):
+            if abbrev in wanted and abbrev not in first:
+                first[abbrev] = row
+    new_root = _copy_trie_node(root)
+    copied = {id(new_root): (0, new_root)}  # id -> (깊이, 노드)
+    for abbrev in wanted:
+        node = new_root
+        for depth, ch in enumerate(abbrev, 1):
+            child = node.children.get(ch)
+            if child is None:
+                child = TrieNode()
+                child.top = []
+            elif id(child) not in copied:
+                child = _copy_trie_node(child)
+            copied[id(child)] = (depth, child)
+            node.children[ch] = child
+            node = child
+        row = first.get(abbrev)
+        node.replacement = None if row is None else str(store.numbers[row])
+        node.abbrev = None if row is None else abbrev
+        node.category = None if row is None else store.categories[row]
+    if new_root.top is not None:
+        # 자동완성 후보는 바뀐 경로만 깊은 노드부터 다시 계산 (나머지 가지는 기존 top 그대로)
+        rank = _suggest_key(usage)
+        for _, node in sorted(copied.values(), key=lambda item: -item[0]):
+            node.top = _merge_suggest_top(node, rank)
+    return new_root
+
+
+# keyboard.KEY_UP / keyboard.all_modifiers와 같은 값 (keyboard 모듈을 늦게 불러오기 위해 복사)
+KEY_UP = "up"
+MODIFIER_KEYS = frozenset({
+    "alt", "alt gr", "ctrl", "shift", "windows",
+    "left alt", "right alt", "left ctrl", "right ctrl",
+    "left shift", "right shift", "left windows", "right windows",
+})
+
+
+# ---------------------------
+# 치환 입력 방식 (출력 백엔드)
+# ---------------------------
+# 엔진은 "글자 erase개 지우고 text 입력"만 요청하고, 실제로 키를 보내는 방법은 백엔드가 정합니다.
+#   KeyboardOutput  : keyboard.write 한 번 (글자마다 키 입력을 따로 보냄)
+#   SendInputOutput : Windows SendInput 한 번에 지우기 + 입력 전체를 보냄 (중간에 사용자 입력이 끼어들지 않음)
+#   ClipboardOutput : 클립보드에 번호를 넣고 Ctrl+V (긴 문자열도 입력 시간이 일정, GUI 스레드에서 비동기로)
+#   FakeOutput      : 메모리 안에서만 동작 (입력 장치가 없는 환경의 테스트/벤치마크용)
+class OutputBackend:
+    name = ""
+
+    def inject(self, erase, text):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class KeyboardOutput(OutputBackend):
+    name = "keyboard"
+
+    def inject(self, erase, text):
+        import keyboard
+        keyboard.write("\b" * erase + text)
+
+
+class SendInputOutput(OutputBackend):
+    name = "sendinput"
+
+    INPUT_KEYBOARD = 1
+    KEYEVENTF_KEYUP = 0x0002
+    KEYEVENTF_UNICODE = 0x0004
+    VK_BACK = 0x08
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+
+        class KEYBDINPUT(ctypes.Structure):
+            _fields_ = [("wVk", wintypes.WORD), ("wScan", wintypes.WORD), ("dwFlags", wintypes.DWORD),
+                        ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_size_t)]
+
+        class MOUSEINPUT(ctypes.Structure):
+            _fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG), ("mouseData", wintypes.DWORD),
+                        ("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_size_t)]
+
+        class HARDWAREINPUT(ctypes.Structure):
+            _fields_ = [("uMsg", wintypes.DWORD), ("wParamL", wintypes.WORD), ("wParamH", wintypes.WORD)]
+
+        class INPUTUNION(ctypes.Union):
+            _fields_ = [("mi", MOUSEINPUT), ("ki", KEYBDINPUT), ("hi", HARDWAREINPUT)]
+
+        class INPUT(ctypes.Structure):
+            _fields_ = [("type", wintypes.DWORD), ("u", INPUTUNION)]
+
+        self._ctypes = ctypes
+        self._INPUT = INPUT
+        self._send_input = ctypes.windll.user32.SendInput
+        self._send_input.argtypes = (wintypes.UINT, ctypes.POINTER(INPUT), ctypes.c_int)
+        self._send_input.restype = wintypes.UINT
+
+    def _key(self, vk, scan, flags):
+        item = self._INPUT(type=self.INPUT_KEYBOARD)
+        item.u.ki.wVk = vk
+        item.u.ki.wScan = scan
+        item.u.ki.dwFlags = flags
+        return item
+
+    def inject(self, erase, text):
+        keys = []
+        for _ in range(erase):
+            keys.append(self._key(self.VK_BACK, 0, 0))
+            keys.append(self._key(self.VK_BACK, 0, self.KEYEVENTF_KEYUP))
+        for ch in text:
+            if "0" <= ch <= "9":
+                # 숫자는 가상 키로 보냄 (유니코드 입력을 받지 않는 프로그램 대비)
+                keys.append(self._key(ord(ch), 0, 0))
+                keys.append(self._key(ord(ch), 0, self.KEYEVENTF_KEYUP))
+            else:
+                keys.append(self._key(0, ord(ch), self.KEYEVENTF_UNICODE))
+                keys.append(self._key(0, ord(ch), self.KEYEVENTF_UNICODE | self.KEYEVENTF_KEYUP))
+        if not keys:
+            return
+        array = (self._INPUT * len(keys))(*keys)
+        sent = self._send_input(len(keys), array, self._ctypes.sizeof(self._INPUT))
+        if sent != len(keys):
+            raise OSError(f"SendInput: {sent}/{len(keys)}개만 전송됨")
+
+
+class FakeOutput(OutputBackend):
+    # 실제 키 입력 없이 엔진이 보낸 요청을 기록하고, 입력된 결과 문자열(text)을 흉내 냅니다.
+    name = "fake"
+
+    def __init__(self):
+        self.injections = []  # [(지운 글자 수, 입력한 문자열)]
+        self.text = ""
+
+    def inject(self, erase, text):
+        self.injections.append((erase, text))
+        self.text = (self.text[:-erase] if erase else self.text) + text
+
+    def type_keys(self, engine, keys, interval=0.05, start=None):
+        # keys의 키 이름을 차례로 누른 것처럼 text에 반영하고 엔진에 전달
+        clock = time.time() if start is None else start
+        for name in keys:
+            clock += interval
+            self.text += " " if name == "space" else (name if len(name) == 1 else "")
+            engine.handle_event(SimulatedKeyEvent(name, clock))
+        return clock
+
+
+class SimulatedKeyEvent:
+    # keyboard.KeyboardEvent 중 HotstringEngine이 쓰는 속성만 흉내 냄
+    __slots__ = ("name", "event_type", "time")
+
+    def __init__(self, name, event_time, event_type="down"):
+        self.name = name
+        self.event_type = event_type
+        self.time = event_time
+
+
+def create_output_backend(name):
+    # SendInput은 Windows 전용이므로 다른 환경에서는 keyboard로 대체
+    # (클립보드 붙여넣기는 Qt가 필요하므로 GUI 쪽 create_output_backend에서 처리)
+    if name == "sendinput" and sys.platform == "win32":
+        return SendInputOutput()
+    if name == "fake":
+        return FakeOutput()
+    return KeyboardOutput()
+
+
+class HotstringEngine:
+    IGNORE_SECONDS = 1.0  # ignore_keys로 알린 키가 이 시간 안에 오지 않으면 더 기다리지 않음
+
+    def __init__(self, triggers=("space",), timeout=2, output=None):
+        self.triggers = set(triggers)
+        self.timeout = timeout  # 글자 사이 간격이 이 시간(초)을 넘으면 입력 중인 단어를 버림
+        self.stats = HotstringStats()
+        # 치환 입력 백엔드 (기본: keyboard.write, 벤치마크/테스트에서는 FakeOutput)
+        self.set_output(output if output is not None else KeyboardOutput())
+        self.root = TrieNode()
+        self._hook = None
+        # 자동완성 목록 콜백 suggest(후보 목록, 입력한 글자 수) - 목록을 닫을 때는 (None, 0).
+        # 훅 스레드에서 불리므로 바로 반환해야 합니다 (GUI는 시그널 emit만). None이면 사용 안 함
+        self.suggest = None
+        self.suggest_min_prefix = 2
+        self.usage = None  # UsageCounts - 치환할 때마다 hit(약어) (None이면 기록 안 함)
+        # 훅 스레드에서만 바뀌는 입력 상태
+        self._walk_root = self.root
+        self._node = self.root
+        self._depth = 0
+        self._time = -1
+        self._suggesting = False
+        # 사용자가 누른 키 수 (합성 키, 수정 키, 키 떼기 제외). 다른 스레드에서 나중에 치환을 보내는 백엔드가
+        # 요청한 뒤 새 키가 눌렸는지 확인하는 데 씀
+        self.key_seq = 0
+        # 백엔드가 다른 스레드에서 직접 보내는 키 [(키 이름, 기한)] - 사용자 입력으로 보지 않고 버림
+        # (추가는 어느 스레드에서나, 꺼내기는 훅 스레드에서만)
+        self._ignored = deque()
+
+    def set_output(self, output):
+        # 훅 스레드는 치환할 때 self.output을 한 번만 읽으므로 참조 교체만으로 충분합니다.
+        previous = getattr(self, "output", None)
+        self.output = output
+        self.stats.backend = output.name
+        if previous is not None and previous is not output:
+            previous.close()
+
+    def use_table(self, root):
+        # 미리 컴파일된 트라이로 참조 한 번만 교체합니다.
+        # 훅 스레드는 키 하나를 처리하는 동안 self.root를 한 번만 읽으므로
+        # 교체 도중에도 항상 완성된 트라이(이전 것 또는 새 것)만 보게 됩니다.
+        self.root = root
+
+    def is_running(self):
+        return self._hook is not None
+
+    def ignore_keys(self, names):
+        # 곧 보낼 합성 키(붙여넣기의 Ctrl+V 등)를 미리 알림. 훅에 들어오면 입력 상태를 바꾸지 않고 버림
+        deadline = time.time() + self.IGNORE_SECONDS
+        self._ignored.extend((name, deadline) for name in names)
+
+    def start(self):
+        if self._hook is None:
+            import keyboard
+            self._hook = keyboard.hook(self.handle_event)
+
+    def stop(self):
+        if self._hook is not None:
+            import keyboard
+            try:
+                keyboard.unhook(self._hook)
+            except Exception:
+                pass
+            self._hook = None
+
+    def _reset(self, root):
+        self._walk_root = root
+        self._node = root
+        self._depth = 0
+        if self._suggesting:
+            self._suggesting = False
+            if self.suggest is not None:
+                self.suggest(None, 0)
+
+    def handle_event(self, event):
+        # keyboard 훅 스레드(또는 벤치마크의 가상 키 입력)에서 키 이벤트마다 호출
+        name = event.name
+        if event.event_type == KEY_UP or name in MODIFIER_KEYS:
+            return
+        ignored = self._ignored
+        while ignored:
+            expected, deadline = ignored[0]
+            if event.time > deadline:
+                ignored.popleft()  # 오지 않은 합성 키
+            elif expected == name:
+                ignored.popleft()
+                return
+            else:
+                break
+        self.key_seq += 1
+        received = time.perf_counter_ns()
+        stats = self.stats
+        delay = time.time() - event.time
+        if 0 <= delay < 60:
+            stats.histograms["hook_delay"].record(int(delay * 1e9))
+        root = self.root
+        if root is not self._walk_root:
+            # 트라이가 교체되었으면 이전 트라이 위의 입력 상태는 버립니다.
+            self._reset(root)
+        if self.timeout and event.time - self._time > self.timeout:
+            self._reset(root)
+        self._time = event.time
+
+        node = self._node
+        if name in self.triggers:
+            if node is not None and node.replacement is not None:
+                # 입력한 약어 + 스페이스를 지우고 번호를 입력 (한 번의 요청으로)
+                matched = time.perf_counter_ns()
+                try:
+                    self.output.inject(self._depth + 1, node.replacement)
+                except Exception:
+                    # 입력 실패로 훅 스레드가 멈추지 않도록 기록만 남김
+                    stats.inject_errors += 1
+                else:
+                    done = time.perf_counter_ns()
+                    stats.record_replacement(node.abbrev, matched - received, done - matched, done - received)
+                    usage = self.usage
+                    if usage is not None:
+                        usage.hit(node.abbrev)
+            self._reset(root)
+        elif not name or len(name) > 1:
+            self._reset(root)
+        else:
+            if node is not None:
+                node = node.children.get(name)
+            self._node = node
+            self._depth += 1
+            suggest = self.suggest
+            if suggest is not None:
+                if node is not None and node.top and self._depth >= self.suggest_min_prefix:
+                    self._suggesting = True
+                    suggest(node.top, self._depth)
+                elif self._suggesting:
+                    self._suggesting = False
+                    suggest(None, 0)
+        stats.histograms["key"].record(time.perf_counter_ns() - received)
+
+
+def build_hotstring_tables(corp, personal, suggest=False, usage=None):
+    # usage(UsageCounts)가 있으면 자동완성 후보를 사용 횟수 순으로
+    counts = {mode: usage.get(mode) if usage is not None else None for mode in SHEET_NAMES}
+    return {
+        "법인": build_hotstring_trie(corp, suggest, counts["법인"]),
+        "개인": build_hotstring_trie(personal, suggest, counts["개인"]),
+    }
+
+
+def iter_code_rows(ws, errors=None, numbered=False):
+    # 시트의 2행부터 (지정, 번호, 구분)을 하나씩 돌려줍니다. (numbered면 (엑셀 행 번호, 지정, 번호, 구분))
+    # 첫 칸이 비면 끝, 번호가 정수가 아니면 그 행은 건너뜀 (기존 규칙과 동일)
+    # errors(list)를 주면 건너뛴 행을 (엑셀 행 번호, 이유)로 기록합니다.
+    for excel_row, row in enumerate(ws.iter_rows(min_row=2, max_col=3, values_only=True), 2):
+        if not row or row[0] is None:
+            break
+        지정 = str(row[0]).strip()
+        번호 = row[1] if len(row) > 1 else None
+        구분 = row[2] if len(row) > 2 else None
+        구분 = str(구분).strip() if 구분 else ""
+        try:
+            번호 = int(번호)
+        except (TypeError, ValueError):
+            if errors is not None:
+                errors.append((excel_row, f"번호가 정수가 아닙니다: {번호!r}"))
+            continue
+        if numbered:
+            yield excel_row, 지정, 번호, 구분
+        else:
+            yield 지정, 번호, 구분
+
+
+def write_json_data(path, corp, personal):
+    data_to_save = {"corp_data": corp.to_records(), "personal_data": personal.to_records()}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data_to_save, f, ensure_ascii=False, indent=4)
+
+
+def read_json_data(path):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return (
+        CodeStore.from_records(data.get("corp_data", [])),
+        CodeStore.from_records(data.get("personal_data", [])),
+    )
+
+
+# ---------------------------
+# 엑셀 불러오기 (스트리밍 읽기)
+# ---------------------------
+PROGRESS_EVERY = 500  # 이 행 수마다 한 번씩만 진행률을 알림
+
+
+def read_workbook(path, cache=None, on_progress=None, on_sheet_missing=None, interrupted=None, row_errors=None):
+    # 엑셀 파일의 법인/개인 시트를 {시트 이름: CodeStore}로 읽습니다. (interrupted()가 참이면 None)
+    # cache(ImportCache)가 있으면 바뀌지 않은 파일은 파싱 없이 캐시된 스냅샷을 씁니다.
+    # row_errors(list)를 주면 건너뛴 행을 (시트, 엑셀 행 번호, 이유)로 기록
+    # (캐시를 쓴 경우에도 처음 불러올 때 기록해 둔 없는 시트/건너뛴 행을 똑같이 알림)
+    cache_key = None
+    if cache is not None:
+        cached, warnings, cache_key = cache.lookup(path)
+        if cached is not None:
+            if on_sheet_missing is not None:
+                for name in warnings["missing"]:
+                    on_sheet_missing(name)
+            if row_errors is not None:
+                row_errors.extend(warnings["row_errors"])
+            return dict(zip(SHEET_NAMES, cached))
+    # read_only 모드는 시트를 한 번에 메모리에 올리지 않고 행 단위로 읽습니다.
+    from openpyxl import load_workbook
+    wb = load_workbook(path, read_only=True, data_only=True)
+    missing = []
+    skipped = []  # (시트, 엑셀 행 번호, 이유)
+    try:
+        sheets = {}
+        for name in SHEET_NAMES:
+            if name in wb.sheetnames:
+                sheets[name] = wb[name]
+            else:
+                missing.append(name)
+                if on_sheet_missing is not None:
+                    on_sheet_missing(name)
+        total = sum(max((ws.max_row or 1) - 1, 0) for ws in sheets.values())
+        if on_progress is not None:
+            on_progress(0, total)
+
+        result = {name: CodeStore() for name in SHEET_NAMES}
+        done = 0
+        for name, ws in sheets.items():
+            store = result[name]
+            errors = []
+            for 지정, 번호, 구분 in iter_code_rows(ws, errors):
+                store.append(지정, 번호, 구분)
+                done += 1
+                if done % PROGRESS_EVERY == 0:
+                    if interrupted is not None and interrupted():
+                        return None
+                    if on_progress is not None:
+                        on_progress(done, total)
+            skipped.extend((name, excel_row, message) for excel_row, message in errors)
+        if interrupted is not None and interrupted():
+            return None
+        if on_progress is not None:
+            on_progress(done, done)
+    finally:
+        wb.close()
+    if row_errors is not None:
+        row_errors.extend(skipped)
+    if cache is not None:
+        try:
+            cache.store(cache_key, [result[name] for name in SHEET_NAMES], missing, skipped)
+        except OSError:
+            pass  # 캐시는 실패해도 불러오기 자체에는 영향 없음
+    return result
+
+
+# ---------------------------
+# 엑셀 내보내기 / 원본 엑셀에 반영
+# ---------------------------
+# 새 파일로 내보낼 때(write_workbook)는 openpyxl write_only 모드로 행을 하나씩 흘려 쓰므로 행 수가 많아도 메모리가 늘지 않습니다.
+# 원본에 반영(write_back_workbook)할 때는 원본을 보통 모드로 열어 법인/개인 시트의 바뀐 칸만 고칩니다.
+# 그래서 다른 시트/열, 셀 서식, 열 너비, 병합, 데이터 유효성 검사, 매크로(.xlsm)가 그대로 남습니다.
+# 바뀐 행은 번호/구분 칸만 고치고, 지운 행은 삭제하고, 새 행은 코드 목록 끝(첫 빈 지정 칸)에 끼워 넣습니다.
+# 코드 행은 불러올 때처럼 수식의 계산 결과로 찾고, 고친 칸에 수식이 있었으면 값으로 바꿉니다. (요약의 "formulas")
+# 기본 저장 위치는 원본 옆의 새 파일(write_back_path)이고, 원본에 덮어쓰는 것은 부른 쪽에서 확인받습니다.
+# 임시 파일에 다 쓴 뒤 교체하므로 도중에 실패하거나 취소해도 기존 파일은 그대로입니다.
+def write_workbook(path, stores, on_progress=None, interrupted=None):
+    # 법인/개인 시트만 있는 새 엑셀 파일. {"rows": 쓴 행 수} (interrupted()가 참이면 None)
+    from openpyxl import Workbook
+    _check_export_path(path)
+    total = sum(len(stores[name]) for name in SHEET_NAMES)
+    progress = _WriteProgress(total, on_progress, interrupted)
+    wb = Workbook(write_only=True)
+    for name in SHEET_NAMES:
+        ws = wb.create_sheet(name)
+        ws.append(list(COLUMNS))
+        store = stores[name]
+        if not _copy_rows(ws, zip(store.abbrevs, store.numbers, store.categories), progress):
+            return None
+    _save_workbook(wb, path)
+    if on_progress is not None:
+        on_progress(total, total)
+    return {"rows": total}
+
+
+def write_back_path(source):
+    # 원본에 반영한 결과를 저장할 기본 경로 (원본 옆의 새 파일)
+    base, ext = os.path.splitext(source)
+    return f"{base} (반영){ext}"
+
+
+def write_back_workbook(source, stores, path=None, on_progress=None, interrupted=None):
+    # source 엑셀에 현재 코드표와 달라진 칸만 고쳐서 path(기본: write_back_path(source))에 저장
+    # {"updated", "inserted", "deleted", "formulas"} 행 수 (interrupted()가 참이면 None)
+    # formulas: 고치거나 지우면서 수식이 값으로 바뀌거나 없어진 행 수
+    from openpyxl import load_workbook
+    path = path or write_back_path(source)
+    ext = os.path.splitext(source)[1].lower()
+    if os.path.splitext(path)[1].lower() != ext:
+        raise ValueError(f"원본과 같은 형식({ext})으로만 저장할 수 있습니다.")
+    summary = {"updated": 0, "inserted": 0, "deleted": 0, "formulas": 0}
+    wb = load_workbook(source, keep_vba=(ext == ".xlsm"))  # 수식은 계산 결과가 아니라 수식 그대로
+    computed = []  # 코드 행에 수식이 있을 때만 여는 계산 결과(data_only) 통합 문서
+
+    def evaluated_rows(name):
+        # 불러올 때와 같은 값으로 코드 행을 찾기 위해, min_row부터 앞 3열의 계산 결과를 읽음
+        def rows_from(min_row):
+            if not computed:
+                computed.append(load_workbook(source, read_only=True, data_only=True))
+            return computed[0][name].iter_rows(min_row=min_row, max_col=3, values_only=True)
+        return rows_from
+
+    try:
+        total = sum(wb[name].max_row for name in SHEET_NAMES if name in wb.sheetnames)
+        progress = _WriteProgress(total, on_progress, interrupted)
+        for name in SHEET_NAMES:
+            if name in wb.sheetnames:
+                ws, evaluated = wb[name], evaluated_rows(name)
+            else:
+                # 원본에 없던 시트는 새로 만듦
+                ws, evaluated = wb.create_sheet(name), None
+                ws.append(list(COLUMNS))
+            if not _write_back_sheet(ws, evaluated, stores[name], summary, progress):
+                return None
+    finally:
+        for computed_wb in computed:
+            computed_wb.close()
+    _save_workbook(wb, path)
+    if on_progress is not None:
+        on_progress(total, total)
+    return summary
+
+
+class _WriteProgress:
+    # 쓴 행 수를 세다가 PROGRESS_EVERY마다 진행률 알림 / 취소 확인 (취소되면 tick()이 False)
+    def __init__(self, total, on_progress, interrupted):
+        self.total = total
+        self.done = 0
+        self.on_progress = on_progress
+        self.interrupted = interrupted
+        if on_progress is not None:
+            on_progress(0, total)
+
+    def tick(self):
+        self.done += 1
+        if self.done % PROGRESS_EVERY == 0:
+            if self.interrupted is not None and self.interrupted():
+                return False
+            if self.on_progress is not None:
+                self.on_progress(self.done, self.total)
+        return True
+
+
+def _copy_rows(ws, rows, progress):
+    for values in rows:
+        ws.append(values)
+        if not progress.tick():
+            return False
+    return True
+
+
+def _write_back_sheet(ws, evaluated, store, summary, progress):
+    # 코드 행을 (지정, 같은 지정 중 몇 번째) 기준으로 현재 코드표와 맞춤 (diff_code_rows와 같은 기준)
+    # 행을 찾는 키와 코드 목록의 끝은 불러올 때(iter_code_rows)처럼 계산 결과로 정하므로
+    # 코드 행에 처음 수식이 나오면 evaluated(그 행 번호)로 그 행부터 계산 결과(앞 3열)를 함께 읽음
+    # (수식이 없는 시트는 계산 결과 통합 문서를 열지 않음)
+    from copy import copy
+    wanted = _keyed_rows(store)
+    seen = {}
+    deleted = []
+    end_row = ws.max_row + 1  # 코드 목록 다음 행 (첫 빈 지정 칸)
+    shown_rows = None
+    for excel_row, cells in enumerate(ws.iter_rows(min_row=2, max_col=3), 2):
+        values = [cell.value for cell in cells]
+        formulas = [isinstance(v, str) and v.startswith("=") for v in values]
+        if any(formulas) and shown_rows is None:
+            shown_rows = evaluated(excel_row)
+        shown = next(shown_rows, ()) if shown_rows is not None else values
+        if not progress.tick():
+            return False
+        if not shown or shown[0] is None:
+            end_row = excel_row
+            break
+        abbrev = str(shown[0]).strip()
+        try:
+            number = int(shown[1] if len(shown) > 1 else None)
+        except (TypeError, ValueError):
+            continue  # 불러올 때 건너뛴 행 - 순번도 세지 않고 그대로 둠
+        k = seen.get(abbrev, 0)
+        seen[abbrev] = k + 1
+        row = wanted.pop((abbrev, k), None)
+        if row is None:
+            deleted.append(excel_row)
+            summary["formulas"] += any(formulas)
+            continue
+        category = shown[2] if len(shown) > 2 else None
+        category = str(category).strip() if category else ""
+        changed = [number != store.numbers[row], category != store.categories[row]]
+        if any(changed):
+            if changed[0]:
+                ws.cell(excel_row, 2).value = store.numbers[row]
+            if changed[1]:
+                ws.cell(excel_row, 3).value = store.categories[row]
+            summary["updated"] += 1
+            summary["formulas"] += (changed[0] and formulas[1]) or (changed[1] and formulas[2])
+
+    # 아래쪽부터 고쳐야 위쪽 행 번호가 밀리지 않음: 새 행을 끼워 넣은 뒤 지운 행을 연속 구간별로 삭제
+    new_rows = sorted(wanted.values())
+    if new_rows:
+        if end_row <= ws.max_row:
+            ws.insert_rows(end_row, len(new_rows))
+        template = end_row - 1 if end_row > 2 else None  # 새 행은 바로 위 코드 행의 서식을 따름
+        for i, row in enumerate(new_rows):
+            for col, value in enumerate((store.abbrevs[row], store.numbers[row], store.categories[row]), 1):
+                cell = ws.cell(end_row + i, col, value)
+                if template is not None:
+                    cell._style = copy(ws.cell(template, col)._style)
+        summary["inserted"] += len(new_rows)
+    while deleted:
+        last = deleted.pop()
+        first = last
+        while deleted and deleted[-1] == first - 1:
+            first = deleted.pop()
+        ws.delete_rows(first, last - first + 1)
+        summary["deleted"] += last - first + 1
+    return True
+
+
+def _check_export_path(path):
+    # 새로 만드는 write_only 통합 문서는 매크로를 담을 수 없으므로 .xlsx로만 저장
+    if os.path.splitext(path)[1].lower() != ".xlsx":
+        raise ValueError("엑셀 파일은 .xlsx 형식으로만 저장할 수 있습니다.")
+
+
+def _save_workbook(wb, path):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        wb.save(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# ---------------------------
+# 폴더 일괄 불러오기 (여러 프로세스에서 동시에 파싱)
+# ---------------------------
+# 폴더 안의 엑셀 파일들을 프로세스 풀에서 나눠 파싱하고(코어 수만큼 빨라짐),
+# 파일마다 새 프로필을 만들거나(기본) 전부 합쳐 프로필 하나로 저장합니다.
+# 파싱은 작업 프로세스, 스냅샷 쓰기는 결과가 오는 대로 이 프로세스에서 합니다.
+# 이미 있는 프로필은 덮어쓰지 않고 오류로 보고합니다. (열려 있는 프로필의 저널과 충돌하지 않도록)
+BULK_EXTENSIONS = (".xlsx", ".xlsm")
+
+
+def find_workbooks(folder):
+    return sorted(
+        os.path.join(folder, name) for name in os.listdir(folder)
+        if name.lower().endswith(BULK_EXTENSIONS) and not name.startswith("~$")  # ~$: 엑셀 임시 파일
+    )
+
+
+def parse_workbook_file(path):
+    # 작업 프로세스에서 실행. 결과는 피클로 넘어옴
+    missing = []
+    row_errors = []
+    stores = read_workbook(path, on_sheet_missing=missing.append, row_errors=row_errors)
+    return {"stores": stores, "missing": missing, "row_errors": row_errors}
+
+
+BULK_POLL_S = 0.2  # 파싱을 기다리는 동안 취소 요청을 확인하는 간격
+
+
+def _bulk_file_report(path, profile):
+    return {"path": path, "profile": profile, "rows": {}, "missing_sheets": [], "row_errors": [], "error": None}
+
+
+def bulk_import(paths, registry, into=None, workers=None, on_progress=None, interrupted=None):
+    # paths의 엑셀 파일들을 불러와 프로필로 저장. into가 있으면 그 이름의 프로필 하나로 합침
+    # 보고서 {"files": [파일별 결과], "profiles": {프로필: 원본 파일}, "rows": 전체 행 수, "cancelled", "elapsed_s"}를 돌려줌
+    # interrupted()가 참이 되면 남은 파일을 취소. 이미 저장한 프로필은 두고, into는 저장하지 않음
+    # (원본 파일 기록(registry.set_source)은 호출한 쪽에서 - GUI 스레드와 상태 파일을 같이 쓰지 않도록)
+    started = time.perf_counter()
+    files = {}
+    if into is None:
+        seen = set()
+        for path in paths:
+            name = os.path.splitext(os.path.basename(path))[0].strip()
+            report = files[path] = _bulk_file_report(path, name)
+            report["error"] = registry.validate_name(name) or (f"'{name}' 프로필이 겹칩니다." if name in seen else None)
+            seen.add(name)
+    else:
+        error = registry.validate_name(into)
+        if error is not None:
+            raise ValueError(error)
+        files = {path: _bulk_file_report(path, into) for path in paths}
+    todo = [path for path, report in files.items() if report["error"] is None]
+    merged = {}  # into: 경로 -> 파싱 결과 (파일 순서대로 합치기 위해 모아 둠)
+    profiles = {}
+    done = 0
+    if on_progress is not None:
+        on_progress(0, len(todo))
+    cancelled = False
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = {executor.submit(parse_workbook_file, path): path for path in todo}
+        pending = set(futures)
+        while pending and not cancelled:
+            # 취소를 바로 알아채도록 제일 느린 파일이 끝날 때까지 기다리지 않고 짧게 나눠 기다림
+            finished, pending = wait(pending, timeout=BULK_POLL_S, return_when=FIRST_COMPLETED)
+            for future in finished:
+                path = futures[future]
+                report = files[path]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    report["error"] = str(e) or type(e).__name__
+                else:
+                    stores = result["stores"]
+                    report["rows"] = {mode: len(stores[mode]) for mode in SHEET_NAMES}
+                    report["missing_sheets"] = result["missing"]
+                    report["row_errors"] = [
+                        {"sheet": sheet, "row": row, "error": message} for sheet, row, message in result["row_errors"]
+                    ]
+                    if into is None:
+                        try:
+                            _save_bulk_profile(registry, report["profile"], stores)
+                            profiles[report["profile"]] = path
+                        except OSError as e:
+                            report["error"] = f"프로필 저장 실패: {e}"
+                    else:
+                        merged[path] = stores
+                done += 1
+                if on_progress is not None:
+                    on_progress(done, len(todo))
+            if pending and interrupted is not None and interrupted():
+                cancelled = True
+    finally:
+        # 취소했으면 이미 파싱 중인 파일을 기다리지 않고 돌아감 (그 결과는 버려짐)
+        executor.shutdown(wait=not cancelled, cancel_futures=cancelled)
+    if cancelled:
+        # 끝나지 못한 파일은 취소로 기록. 합치는 경우 일부 파일만으로 된 프로필이 되므로 저장하지 않음
+        for path in todo:
+            report = files[path]
+            if report["error"] is None and (into is not None or report["profile"] not in profiles):
+                report["error"] = "취소됨"
+    elif into is not None and merged:
+        stores = {mode: CodeStore() for mode in SHEET_NAMES}
+        for path in paths:
+            if path not in merged:
+                continue
+            for mode in SHEET_NAMES:
+                source = merged[path][mode]
+                for abbrev, number, category in zip(source.abbrevs, source.numbers, source.categories):
+                    stores[mode].append(abbrev, number, category)
+        _save_bulk_profile(registry, into, stores)
+        profiles[into] = None  # 여러 파일을 합쳤으므로 감시할 원본 없음
+    return {
+        "files": [files[path] for path in paths],
+        "profiles": profiles,
+        "rows": sum(sum(report["rows"].values()) for report in files.values() if report["error"] is None),
+        "cancelled": cancelled,
+        "elapsed_s": round(time.perf_counter() - started, 3),
+    }
+
+
+def bulk_import_summary(report):
+    failed = [f for f in report["files"] if f["error"] is not None]
+    skipped = sum(len(f["row_errors"]) for f in report["files"])
+    lines = ["취소되었습니다."] if report["cancelled"] else []
+    lines += [
+        f"파일 {len(report['files'])}개 중 {len(report['files']) - len(failed)}개 성공, "
+        f"프로필 {len(report['profiles'])}개, {report['rows']}행 ({report['elapsed_s']:.1f}초)"
+    ]
+    if skipped:
+        lines.append(f"번호가 잘못되어 건너뛴 행: {skipped}개")
+    lines += [f"실패: {os.path.basename(f['path'])} - {f['error']}" for f in failed]
+    return "\n".join(lines)
+
+
+def _save_bulk_profile(registry, name, stores):
+    registry.create(name)
+    snap_path, _ = registry.paths(name)
+    write_snapshot(snap_path, [stores[mode] for mode in SHEET_NAMES])
+
+
+# ---------------------------
+# 사무실 공용 코드표 동기화
+# ---------------------------
+# 공용 코드표를 올려 두는 간단한 서버(SyncRepository + run_sync_server)와 각 PC의 SyncClient.
+# 서버는 코드표가 올라올 때마다(publish) 이전 판과 비교해서 바뀐 행만 판 번호와 함께 기록하고,
+# 각 PC는 마지막으로 받은 판 이후의 변경분만 받아 프로필에 반영합니다.
+# 받은 내용은 프로필 스냅샷에 저장되므로 서버에 연결되지 않아도 마지막으로 받은 코드표로 계속 동작합니다.
+#
+# 변경분은 행 번호 대신 (지정, 같은 지정 중 몇 번째) 키로 보냅니다 (diff_code_rows와 같은 키).
+#   ["set", 지정, 순번, 번호, 구분]  - 번호/구분 변경
+#   ["del", 지정, 순번]              - 삭제
+#   ["add", 지정, 번호, 구분]        - 맨 뒤에 추가
+# 판마다 전체 코드표의 해시(code_digest)도 함께 보내서, 적용한 결과가 서버와 다르면
+# (이 PC에서 직접 고친 경우 등) 전체를 다시 받습니다.
+# 코드표를 올리려면(publish) 서버 폴더의 publish.token에 든 토큰을 X-Sync-Token 헤더로 보내야 합니다.
+SYNC_PORT = 8765
+SYNC_TOKEN_HEADER = "X-Sync-Token"
+SYNC_MAX_BODY = 32 * 1024 * 1024  # 올리는 코드표 크기 제한 (10만 행이 수 MB)
+
+
+def code_digest(stores):
+    h = hashlib.sha1()
+    for mode in SHEET_NAMES:
+        store = stores[mode]
+        for abbrev, number, category in zip(store.abbrevs, store.numbers, store.categories):
+            h.update(f"{abbrev}\x1f{number}\x1f{category}\x1e".encode("utf-8"))
+        h.update(b"\x1d")
+    return h.hexdigest()
+
+
+def diff_to_ops(old, updates, inserts, deletes):
+    # diff_code_rows 결과(old 기준 행 번호)를 키 기반 변경분으로
+    keys = {row: key for key, row in _keyed_rows(old).items()}
+    ops = [["set", *keys[row], number, category] for row, number, category in updates]
+    ops += [["del", *keys[row]] for row in deletes]
+    ops += [["add", abbrev, number, category] for abbrev, number, category in inserts]
+    return ops
+
+
+def ops_to_diff(store, ops):
+    # 키 기반 변경분을 store 기준 diff_code_rows 형식으로. 없는 키의 set은 추가로, del은 무시
+    keys = _keyed_rows(store)
+    updates, inserts, deletes = [], [], set()
+    for op in ops:
+        if op[0] == "set":
+            row = keys.get((op[1], op[2]))
+            if row is None:
+                inserts.append((op[1], op[3], op[4]))
+            else:
+                updates.append((row, op[3], op[4]))
+        elif op[0] == "del":
+            row = keys.get((op[1], op[2]))
+            if row is not None:
+                deletes.add(row)
+        elif op[0] == "add":
+            inserts.append((op[1], op[2], op[3]))
+        else:
+            raise ValueError(f"알 수 없는 변경 종류: {op[0]}")
+    return updates, inserts, sorted(deletes)
+
+
+def store_to_rows(store):
+    return [[a, n, c] for a, n, c in zip(store.abbrevs, store.numbers, store.categories)]
+
+
+def store_from_rows(rows):
+    store = CodeStore()
+    for abbrev, number, category in rows:
+        store.append(str(abbrev), int(number), str(category))
+    return store
+
+
+class SyncRepository:
+    # 서버 쪽 공용 코드표. shared.snap(스냅샷 헤더의 저널 번호 자리에 판 번호) + changes.jsonl(판별 변경분)
+    KEEP_CHANGES = 500  # 보관하는 판 수. 이보다 오래된 판을 가진 PC에는 전체를 보냄
+
+    def __init__(self, directory):
+        self.snap_path = os.path.join(directory, "shared.snap")
+        self.log_path = os.path.join(directory, "changes.jsonl")
+        self.token_path = os.path.join(directory, "publish.token")
+        self.lock = threading.Lock()
+        self.stores = {"법인": CodeStore(), "개인": CodeStore()}
+        self.version = 0
+        self.changes = []  # [{"version": 판, "ops": {모드: 변경분}}] 오래된 것부터
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.snap_path):
+            (corp, personal), self.version = read_snapshot(self.snap_path)
+            self.stores = {"법인": corp, "개인": personal}
+        try:
+            with open(self.log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        change = json.loads(line)
+                    except ValueError:
+                        break  # 기록 도중 꺼져서 잘린 마지막 줄
+                    if change["version"] == self.version + 1:
+                        # 스냅샷을 쓰기 전에 꺼진 경우: 기록만 남은 판을 다시 적용
+                        for mode, ops in change["ops"].items():
+                            apply_code_diff(self.stores[mode], *ops_to_diff(self.stores[mode], ops))
+                        self.version = change["version"]
+                    if change["version"] <= self.version:
+                        self.changes.append(change)
+        except FileNotFoundError:
+            pass
+        self.changes = self.changes[-self.KEEP_CHANGES:]
+        self.digest = code_digest(self.stores)
+
+    def publish_token(self):
+        # 코드표를 올릴 때 필요한 토큰. 처음 실행할 때 만들어 publish.token(소유자만 읽기 가능)에 저장
+        try:
+            with open(self.token_path, "r", encoding="utf-8") as f:
+                token = f.read().strip()
+            if token:
+                return token
+        except FileNotFoundError:
+            pass
+        token = os.urandom(16).hex()
+        write_private_file(self.token_path, token)
+        return token
+
+    def publish(self, stores):
+        # 새 코드표를 올림. 바뀐 내용이 있으면 판 번호를 올리고 새 판 번호를 돌려줌
+        with self.lock:
+            ops = {}
+            diffs = {}
+            for mode in SHEET_NAMES:
+                diff = diff_code_rows(self.stores[mode], stores[mode])
+                if any(diff):
+                    diffs[mode] = diff
+                    ops[mode] = diff_to_ops(self.stores[mode], *diff)
+            if not ops:
+                return self.version
+            change = {"version": self.version + 1, "ops": ops}
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(change, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            for mode, diff in diffs.items():
+                apply_code_diff(self.stores[mode], *diff)
+            self.version = change["version"]
+            self.digest = code_digest(self.stores)
+            self.changes.append(change)
+            write_snapshot(self.snap_path, [self.stores[mode] for mode in SHEET_NAMES], self.version)
+            if len(self.changes) > self.KEEP_CHANGES * 2:
+                self._trim_log()
+            return self.version
+
+    def _trim_log(self):
+        self.changes = self.changes[-self.KEEP_CHANGES:]
+        tmp_path = self.log_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(change, ensure_ascii=False) + "\n" for change in self.changes)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.log_path)
+
+    def changes_since(self, since):
+        # since 판 이후의 변경분. 보관 중인 판보다 오래됐거나 모르는 판이면 전체 코드표
+        with self.lock:
+            reply = {"version": self.version, "digest": self.digest}
+            oldest = self.changes[0]["version"] - 1 if self.changes else self.version
+            if since == self.version or 0 < since < self.version and since >= oldest:
+                reply["changes"] = [change for change in self.changes if change["version"] > since]
+            else:
+                reply["full"] = {mode: store_to_rows(self.stores[mode]) for mode in SHEET_NAMES}
+            return reply
+
+
+def run_sync_server(repository, host="127.0.0.1", port=SYNC_PORT, token=None):
+    server = make_sync_server(repository, host, port, token)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def make_sync_server(repository, host="127.0.0.1", port=SYNC_PORT, token=None):
+    # 아직 요청을 받지 않는 HTTP 서버 (serve_forever는 호출한 쪽에서. port=0이면 빈 포트 - 테스트용)
+    # GET /changes?since=판 번호, POST /publish (본문: {"법인": [[지정, 번호, 구분], ...], "개인": [...]})
+    # publish는 token과 같은 X-Sync-Token 헤더가 있어야 받음 (token이 None이면 받지 않음)
+    # 기본은 이 PC에서만 접속 가능. 사무실의 다른 PC에서 받으려면 host를 "0.0.0.0" 등으로
+    import hmac
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+    from urllib.parse import urlsplit, parse_qs
+
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status, reply):
+            body = json.dumps(reply, ensure_ascii=False).encode("utf-8")
+            compress = len(body) > 1024 and "gzip" in self.headers.get("Accept-Encoding", "")
+            if compress:
+                body = gzip.compress(body)
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            if compress:
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _reject(self, status, error):
+            # 본문을 읽지 않고 거절하므로 연결은 닫음 (남은 본문이 다음 요청으로 읽히지 않도록)
+            self.close_connection = True
+            self._reply(status, {"ok": False, "error": error})
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            if url.path != "/changes":
+                self._reply(404, {"ok": False, "error": "없는 주소입니다."})
+                return
+            try:
+                since = int(parse_qs(url.query).get("since", ["0"])[0])
+            except ValueError:
+                self._reply(400, {"ok": False, "error": "since는 판 번호(정수)여야 합니다."})
+                return
+            self._reply(200, {"ok": True, **repository.changes_since(since)})
+
+        def do_POST(self):
+            if urlsplit(self.path).path != "/publish":
+                self._reject(404, "없는 주소입니다.")
+                return
+            sent = self.headers.get(SYNC_TOKEN_HEADER, "").encode("utf-8")
+            if token is None or not hmac.compare_digest(sent, token.encode("utf-8")):
+                self._reject(403, "코드표를 올릴 권한이 없습니다. (토큰 확인)")
+                return
+            try:
+                length = int(self.headers.get("Content-Length", ""))
+            except ValueError:
+                self._reject(400, "Content-Length가 없거나 잘못되었습니다.")
+                return
+            if length < 0:
+                self._reject(400, "Content-Length가 없거나 잘못되었습니다.")
+                return
+            if length > SYNC_MAX_BODY:
+                self._reject(413, f"코드표가 너무 큽니다. (최대 {SYNC_MAX_BODY // (1024 * 1024)}MB)")
+                return
+            try:
+                body = json.loads(self.rfile.read(length).decode("utf-8"))
+                stores = {mode: store_from_rows(body.get(mode, [])) for mode in SHEET_NAMES}
+            except (ValueError, TypeError, AttributeError) as e:
+                self._reply(400, {"ok": False, "error": f"잘못된 코드표입니다: {e}"})
+                return
+            self._reply(200, {"ok": True, "version": repository.publish(stores)})
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+class SyncClient:
+    TIMEOUT = 5.0
+
+    def __init__(self, url, token=None):
+        # token: 코드표를 올릴 때(publish)만 필요
+        self.url = url.rstrip("/")
+        self.token = token
+
+    def _request(self, path, body=None):
+        from urllib.request import Request, urlopen
+        from urllib.error import HTTPError
+        data = None if body is None else json.dumps(body, ensure_ascii=False).encode("utf-8")
+        headers = {"Content-Type": "application/json; charset=utf-8", "Accept-Encoding": "gzip"}
+        if self.token is not None:
+            headers[SYNC_TOKEN_HEADER] = self.token
+        request = Request(self.url + path, data=data, headers=headers)
+        try:
+            response = urlopen(request, timeout=self.TIMEOUT)
+        except HTTPError as e:
+            response = e
+        with response:
+            payload = response.read()
+            if response.headers.get("Content-Encoding") == "gzip":
+                payload = gzip.decompress(payload)
+        reply = json.loads(payload.decode("utf-8"))
+        if not reply.get("ok"):
+            raise RuntimeError(reply.get("error", "동기화 서버 오류"))
+        return reply
+
+    def pull(self, stores, version):
+        # stores: 현재 코드표 복사본 {"법인": CodeStore, "개인": CodeStore} (직접 고침)
+        # (stores, 새 판 번호, 받은 변경 수)를 돌려줌. 전체를 다시 받았으면 변경 수는 None
+        # 서버에 연결할 수 없으면 OSError(URLError 등)
+        reply = self._request(f"/changes?since={version}")
+        if "changes" in reply:
+            changed = 0
+            for change in reply["changes"]:
+                for mode, ops in change["ops"].items():
+                    apply_code_diff(stores[mode], *ops_to_diff(stores[mode], ops))
+                    changed += len(ops)
+            if not changed or code_digest(stores) == reply["digest"]:
+                return stores, reply["version"], changed
+            reply = self._request("/changes?since=0")
+        stores = {mode: store_from_rows(reply["full"].get(mode, [])) for mode in SHEET_NAMES}
+        return stores, reply["version"], None
+
+    def publish(self, stores):
+        return self._request("/publish", {mode: store_to_rows(stores[mode]) for mode in SHEET_NAMES})["version"]
+
+
+def sync_profile(registry, name, url):
+    # GUI 없이 프로필 하나를 동기화 (스냅샷까지 저장). (새 판 번호, 받은 변경 수)
+    state = registry.open(name)
+    try:
+        known = registry.sync.get(name, {})
+        version = known.get("version", 0) if known.get("url") == url else 0
+        copies = {mode: store.copy() for mode, store in state.stores.items()}
+        stores, version, changed = SyncClient(url).pull(copies, version)
+        if changed != 0:
+            state.journal.checkpoint([stores[mode] for mode in SHEET_NAMES]).result()
+        registry.set_sync(name, url, version)
+        return version, changed
+    finally:
+        state.journal.close()
+
+
+# ---------------------------
+# 백그라운드 실행 (데몬) - GUI 없이 핫스트링만
+# ---------------------------
+# 프로필 데이터를 스냅샷 + 저널에서 읽어 핫스트링 엔진만 돌립니다. Qt와 화면 자원을 올리지 않으므로
+# GUI를 계속 띄워 두는 것보다 메모리를 훨씬 적게 씁니다.
+# GUI는 실행될 때 데몬이 있으면 붙어서(DaemonClient) 켜기/끄기, 모드·프로필 전환을 데몬에 맡기고
+# 편집 내용을 저장할 때마다 다시 읽으라고 알립니다. (이때 GUI 자신의 키보드 훅은 쓰지 않음)
+# 통신은 multiprocessing.connection(Windows는 named pipe, 그 외는 유닉스 소켓)으로 JSON 메시지를 주고받고,
+# 인증 키는 데몬이 시작할 때 새로 만들어 daemon.key(소유자만 읽기 가능)에 저장합니다.
+if sys.platform == "win32":
+    DAEMON_ADDRESS = r"\\.\pipe\semuHot2-daemon"
+else:
+    DAEMON_ADDRESS = os.path.join(tempfile.gettempdir(), f"semuHot2-daemon-{os.getuid()}.sock")
+
+
+class HotstringService:
+    MODES = ("법인", "개인")
+
+    def __init__(self, registry, engine=None):
+        self.registry = registry
+        self.engine = engine if engine is not None else HotstringEngine(output=create_output_backend("sendinput"))
+        self.lock = threading.Lock()  # 접속마다 스레드가 따로 돌므로 상태 변경은 하나씩
+        self.profile = None
+        self.mode = "법인"
+        self.active = False
+        self.rows = {}
+        self.tables = {}
+        self.usage = None
+
+    def load_profile(self, name):
+        # 프로필을 스냅샷 + 저널에서 다시 읽고 트라이를 새로 만듦 (GUI가 편집을 저장한 뒤에도 호출)
+        if name not in self.registry.names():
+            raise ValueError(f"'{name}' 프로필이 없습니다.")
+        snap_path, journal_path = self.registry.paths(name)
+        stores = {"법인": CodeStore(), "개인": CodeStore()}
+        if os.path.exists(snap_path):
+            (corp, personal), journal_seq = read_snapshot(snap_path)
+            stores = {"법인": corp, "개인": personal}
+            EditJournal(journal_path, snap_path).replay(stores, journal_seq)
+        self.tables = build_hotstring_tables(stores["법인"], stores["개인"])
+        self.rows = {mode: len(store) for mode, store in stores.items()}
+        if name != self.profile:
+            self.flush_usage()
+            self.usage = UsageCounts(self.registry.usage_path(name))
+            self.usage.mode = self.mode
+            self.engine.usage = self.usage
+        self.profile = name
+        self.engine.use_table(self.tables[self.mode])
+
+    def flush_usage(self):
+        if self.usage is not None:
+            try:
+                self.usage.flush()
+            except OSError:
+                pass  # 다음 flush에서 다시 시도
+
+    def configure(self, profile=None, mode=None, active=None):
+        if profile is not None and profile != self.profile:
+            self.load_profile(profile)
+        if mode is not None:
+            if mode not in self.MODES:
+                raise ValueError(f"모드는 {'/'.join(self.MODES)} 중 하나여야 합니다.")
+            self.mode = mode
+            if self.usage is not None:
+                self.usage.mode = mode
+            self.engine.use_table(self.tables.get(mode, TrieNode()))
+        if active is not None:
+            if active:
+                self.engine.start()  # 훅 설치에 실패하면 꺼진 상태 그대로 오류를 돌려줌
+            else:
+                self.engine.stop()
+            self.active = bool(active)
+
+    def status(self):
+        return {
+            "pid": os.getpid(),
+            "profile": self.profile,
+            "mode": self.mode,
+            "active": self.active,
+            "rows": self.rows,
+            "stats": self.engine.stats.to_dict(),
+        }
+
+    def handle(self, request):
+        # 요청 하나를 처리하고 응답 dict를 돌려줌 ({"ok": True, ...} 또는 {"ok": False, "error": ...})
+        cmd = request.get("cmd")
+        try:
+            with self.lock:
+                if cmd == "configure":
+                    self.configure(request.get("profile"), request.get("mode"), request.get("active"))
+                elif cmd == "reload":
+                    self.load_profile(request.get("profile") or self.profile)
+                elif cmd == "flush":
+                    self.flush_usage()  # 사용 빈도 보고서를 만들기 전에 대기 중인 횟수를 파일로
+                elif cmd not in ("status", "stop"):
+                    raise ValueError(f"알 수 없는 명령: {cmd}")
+                return {"ok": True, **self.status()}
+        except Exception as e:
+            return {"ok": False, "error": str(e) or type(e).__name__}
+
+
+def write_private_file(path, text):
+    # 소유자만 읽을 수 있는 파일(0o600)로 새로 만듦 - 다른 사용자가 키를 읽어 데몬/서버를 조작하지 못하도록
+    # (남아 있던 파일은 지우고 O_EXCL로 만들어서 미리 만들어 둔 파일이나 링크를 따라가지 않음)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with open(fd, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _serve_connection(conn, service, stopped):
+    with conn:
+        while not stopped.is_set():
+            try:
+                request = json.loads(conn.recv_bytes().decode("utf-8"))
+            except (EOFError, OSError, ValueError):
+                return
+            request = request if isinstance(request, dict) else {}
+            reply = service.handle(request)
+            try:
+                conn.send_bytes(json.dumps(reply, ensure_ascii=False).encode("utf-8"))
+            except OSError:
+                return
+            if request.get("cmd") == "stop":
+                stopped.set()
+
+
+def run_daemon(service, address=DAEMON_ADDRESS, key_file=daemon_key_file):
+    # 접속을 받는 스레드를 띄우고 stop 명령이 올 때까지 기다림
+    from multiprocessing.connection import Listener
+    client = DaemonClient.connect(address, key_file)
+    if client is not None:
+        client.close()
+        raise RuntimeError("이미 실행 중인 데몬이 있습니다.")
+    if sys.platform != "win32" and os.path.exists(address):
+        os.remove(address)  # 비정상 종료로 남은 소켓 파일
+    authkey = os.urandom(16)
+    write_private_file(key_file, authkey.hex())
+    listener = Listener(address, authkey=authkey)
+    stopped = threading.Event()
+
+    def accept_loop():
+        while not stopped.is_set():
+            try:
+                conn = listener.accept()
+            except Exception:
+                if stopped.is_set():
+                    break  # 종료하면서 listener를 닫은 경우
+                continue  # 인증 실패 등 - 해당 접속만 버림
+            threading.Thread(target=_serve_connection, args=(conn, service, stopped), daemon=True).start()
+
+    threading.Thread(target=accept_loop, daemon=True).start()
+    flushed = time.monotonic()
+    try:
+        while not stopped.wait(1.0):
+            if time.monotonic() - flushed >= USAGE_FLUSH_S:
+                with service.lock:
+                    service.flush_usage()
+                flushed = time.monotonic()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stopped.set()  # listener를 닫기 전에 알려서 accept_loop가 끝나도록
+        service.engine.stop()
+        service.flush_usage()
+        try:
+            listener.close()
+        except OSError:
+            pass
+        for path in (key_file,) if sys.platform == "win32" else (key_file, address):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class DaemonClient:
+    TIMEOUT = 10.0  # 응답 대기 (프로필을 다시 읽는 시간 포함)
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    @classmethod
+    def connect(cls, address=DAEMON_ADDRESS, key_file=daemon_key_file):
+        # 실행 중인 데몬에 접속. 데몬이 없으면 None
+        try:
+            with open(key_file, "r", encoding="utf-8") as f:
+                authkey = bytes.fromhex(f.read().strip())
+        except (OSError, ValueError):
+            return None
+        from multiprocessing.connection import Client
+        try:
+            return cls(Client(address, authkey=authkey))
+        except Exception:
+            return None  # 데몬이 꺼졌는데 키 파일만 남은 경우 등
+
+    def request(self, cmd, **args):
+        self.conn.send_bytes(json.dumps({"cmd": cmd, **args}, ensure_ascii=False).encode("utf-8"))
+        if not self.conn.poll(self.TIMEOUT):
+            raise TimeoutError("데몬 응답 시간 초과")
+        reply = json.loads(self.conn.recv_bytes().decode("utf-8"))
+        if not reply.get("ok"):
+            raise RuntimeError(reply.get("error", "데몬 오류"))
+        return reply
+
+    def close(self):
+        try:
+            self.conn.close()
+        except OSError:
+            pass
+
+
+CLI_COMMANDS = ("daemon", "status", "enable", "disable", "reload", "stop", "mode", "profile",
+                "sync-server", "publish", "sync", "import-folder", "usage", "export")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="semuHot2_core", description="세무사랑 핫스트링 (화면 없이 실행)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    daemon = sub.add_parser("daemon", help="핫스트링만 백그라운드로 실행")
+    daemon.add_argument("--profile", help="불러올 프로필 (기본: 마지막으로 사용한 프로필)")
+    daemon.add_argument("--mode", choices=HotstringService.MODES, default="법인")
+    daemon.add_argument("--off", action="store_true", help="핫스트링을 끈 상태로 시작")
+    for name, text in (("status", "상태 보기"), ("enable", "핫스트링 켜기"), ("disable", "핫스트링 끄기"),
+                       ("reload", "현재 프로필 다시 읽기"), ("stop", "데몬 종료")):
+        sub.add_parser(name, help=text)
+    sub.add_parser("mode", help="모드 전환").add_argument("mode", choices=HotstringService.MODES)
+    sub.add_parser("profile", help="프로필 전환").add_argument("name")
+    server = sub.add_parser("sync-server", help="공용 코드표 서버 실행")
+    server.add_argument("--dir", default=os.path.join(script_dir, "shared"), help="공용 코드표 저장 폴더")
+    server.add_argument("--host", default="127.0.0.1", help="다른 PC에서 받게 하려면 0.0.0.0 또는 이 PC의 주소")
+    server.add_argument("--port", type=int, default=SYNC_PORT)
+    server.add_argument("--token", help="코드표를 올릴 때 필요한 토큰 (생략하면 --dir의 publish.token)")
+    publish = sub.add_parser("publish", help="엑셀/JSON 코드표를 공용 코드표 서버에 올리기")
+    publish.add_argument("path")
+    publish.add_argument("--server", required=True, help="예: http://192.168.0.10:8765")
+    publish.add_argument("--token", default=os.environ.get("SEMUHOT_SYNC_TOKEN"),
+                         help="서버의 publish.token 내용 (기본: 환경 변수 SEMUHOT_SYNC_TOKEN)")
+    sync = sub.add_parser("sync", help="공용 코드표 서버에서 바뀐 내용 받기")
+    sync.add_argument("--profile", help="받을 프로필 (기본: 마지막으로 사용한 프로필)")
+    sync.add_argument("--server", help="서버 주소 (생략하면 그 프로필에 설정된 주소)")
+    usage = sub.add_parser("usage", help="자주 쓰는 코드 / 한 번도 쓰지 않은 코드 보고서")
+    usage.add_argument("--profile", help="대상 프로필 (기본: 마지막으로 사용한 프로필)")
+    usage.add_argument("--top", type=int, default=20, help="자주 쓰는 코드를 몇 개까지 보여 줄지")
+    usage.add_argument("--output", help="보고서 JSON 경로 (생략하면 화면에 출력)")
+    export = sub.add_parser("export", help="프로필의 코드표를 엑셀 파일로 내보내기")
+    export.add_argument("path", nargs="?",
+                        help="저장할 .xlsx 경로 (--write-back이면 생략 가능: 원본 옆의 '이름 (반영).xlsx')")
+    export.add_argument("--profile", help="내보낼 프로필 (기본: 마지막으로 사용한 프로필)")
+    export.add_argument("--write-back", action="store_true",
+                        help="프로필의 원본 엑셀을 바탕으로 바뀐 칸만 반영해서 저장")
+    export.add_argument("--replace-source", action="store_true",
+                        help="--write-back 결과를 원본 엑셀에 덮어쓰기 (이 옵션 없이는 원본에 저장하지 않음)")
+    bulk = sub.add_parser("import-folder", help="폴더의 엑셀 파일들을 한꺼번에 프로필로 불러오기")
+    bulk.add_argument("folder")
+    bulk.add_argument("--into", help="모든 파일을 합쳐 만들 프로필 이름 (생략하면 파일마다 새 프로필)")
+    bulk.add_argument("--workers", type=int, help="동시에 파싱할 프로세스 수 (기본: CPU 코어 수)")
+    bulk.add_argument("--report", help="결과 보고서 JSON 경로")
+    args = parser.parse_args(argv)
+
+    registry = ProfileRegistry(profiles_dir, profiles_file, (snapshot_file, journal_file))
+    if args.command == "daemon":
+        service = HotstringService(registry)
+        service.mode = args.mode
+        service.load_profile(args.profile or registry.active)
+        service.configure(active=not args.off)
+        print(json.dumps(service.status(), ensure_ascii=False))
+        run_daemon(service)
+        return 0
+    if args.command == "sync-server":
+        repository = SyncRepository(args.dir)
+        token = args.token or repository.publish_token()
+        print(f"공용 코드표 서버: http://{args.host}:{args.port} (판 {repository.version})")
+        if not args.token:
+            print(f"코드표를 올릴 때 쓸 토큰: {repository.token_path}")
+        run_sync_server(repository, args.host, args.port, token)
+        return 0
+    if args.command == "usage":
+        name = args.profile or registry.active
+        if name not in registry.names():
+            print(f"'{name}' 프로필이 없습니다.", file=sys.stderr)
+            return 1
+        client = DaemonClient.connect()
+        if client is not None:
+            try:
+                client.request("flush")
+            except Exception:
+                pass
+            finally:
+                client.close()
+        state = registry.open(name)
+        state.journal.close()
+        report = usage_report(state.stores, UsageCounts(registry.usage_path(name)), args.top)
+        text = json.dumps(report, ensure_ascii=False, indent=2)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(text)
+        else:
+            print(text)
+        return 0
+    if args.command == "export":
+        name = args.profile or registry.active
+        if name not in registry.names():
+            print(f"'{name}' 프로필이 없습니다.", file=sys.stderr)
+            return 1
+        source = registry.sources.get(name)
+        if args.write_back and (source is None or os.path.splitext(source)[1].lower() not in BULK_EXTENSIONS):
+            print(f"'{name}' 프로필은 엑셀 파일에서 불러온 것이 아닙니다.", file=sys.stderr)
+            return 1
+        if not args.write_back and not args.path:
+            print("저장할 경로를 지정하세요.", file=sys.stderr)
+            return 1
+        if args.write_back:
+            if args.replace_source:
+                args.path = source
+            elif args.path and os.path.normcase(os.path.abspath(args.path)) == os.path.normcase(os.path.abspath(source)):
+                print("원본 엑셀에 덮어쓰려면 --replace-source를 붙이세요.", file=sys.stderr)
+                return 1
+        state = registry.open(name)
+        state.journal.close()
+        try:
+            if args.write_back:
+                result = write_back_workbook(source, state.stores, args.path)
+            else:
+                result = write_workbook(args.path, state.stores)
+        except (OSError, ValueError) as e:
+            print(str(e), file=sys.stderr)
+            return 1
+        print(json.dumps(result, ensure_ascii=False))
+        return 0
+    if args.command == "import-folder":
+        try:
+            paths = find_workbooks(args.folder)
+            report = bulk_import(paths, registry, into=args.into, workers=args.workers,
+                                 on_progress=lambda done, total: print(f"\r{done}/{total}", end="", file=sys.stderr))
+        except (OSError, ValueError) as e:
+            print(str(e), file=sys.stderr)
+            return 1
+        print(file=sys.stderr)
+        for name, path in report["profiles"].items():
+            if path is not None:
+                registry.set_source(name, path)
+        if args.report:
+            with open(args.report, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        print(bulk_import_summary(report))
+        return 0 if report["profiles"] else 1
+    if args.command in ("publish", "sync"):
+        try:
+            if args.command == "publish":
+                if os.path.splitext(args.path)[1].lower() == ".json":
+                    stores = dict(zip(SHEET_NAMES, read_json_data(args.path)))
+                else:
+                    stores = read_workbook(args.path)
+                if not args.token:
+                    print("--token(또는 SEMUHOT_SYNC_TOKEN)으로 서버의 publish.token 내용을 지정하세요.", file=sys.stderr)
+                    return 1
+                print(f"판 {SyncClient(args.server, args.token).publish(stores)}")
+                return 0
+            name = args.profile or registry.active
+            url = args.server or registry.sync.get(name, {}).get("url")
+            if url is None:
+                print(f"'{name}' 프로필에 설정된 동기화 서버가 없습니다. --server로 지정하세요.", file=sys.stderr)
+                return 1
+            version, changed = sync_profile(registry, name, url)
+        except Exception as e:
+            print(str(e), file=sys.stderr)
+            return 1
+        print(f"판 {version} (" + ("전체 받음" if changed is None else f"변경 {changed}건") + ")")
+        client = DaemonClient.connect()
+        if client is not None:
+            # 데몬이 같은 프로필을 쓰고 있으면 다시 읽게 함
+            try:
+                if changed != 0 and client.request("status")["profile"] == name:
+                    client.request("reload")
+            except Exception:
+                pass
+            finally:
+                client.close()
+        return 0
+
+    client = DaemonClient.connect()
+    if client is None:
+        print("실행 중인 데몬이 없습니다.", file=sys.stderr)
+        return 1
+    requests = {
+        "status": ("status", {}),
+        "enable": ("configure", {"active": True}),
+        "disable": ("configure", {"active": False}),
+        "reload": ("reload", {}),
+        "stop": ("stop", {}),
+        "mode": ("configure", {"mode": getattr(args, "mode", None)}),
+        "profile": ("configure", {"profile": getattr(args, "name", None)}),
+    }
+    cmd, request_args = requests[args.command]
+    try:
+        reply = client.request(cmd, **request_args)
+    except Exception as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    finally:
+        client.close()
+    print(json.dumps(reply, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()  # exe로 빌드한 경우 일괄 불러오기 작업 프로세스
+    sys.exit(main())
@@ -0,0 +1,46 @@
+# -*- mode: python ; coding: utf-8 -*-
+# 폴더형(onedir) 빌드: onefile처럼 실행할 때마다 임시 폴더에 압축을 풀지 않으므로 시작이 빠릅니다.
+# pyinstaller semuHot2_onedir.spec  ->  dist/semuHot2/semuHot2.exe
+
+
+a = Analysis(
+    ['semuHot2.py'],
+    pathex=[],
+    binaries=[],
+    datas=[('Hyung.png', '.'), ('settingIcon.png', '.')],
+    hiddenimports=['PyQt6.QtNetwork'],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=[],
+    noarchive=False,
+    optimize=0,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='semuHot2',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='semuHot2',
+)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 저장소 최상위의 semuHot2_core를 그대로 불러오도록
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,51 @@
+import random
+
+import semuHot2_core as core
+
+
+def _store(rows):
+    return core.CodeStore.from_records([{"지정": a, "번호": n, "구분": c} for a, n, c in rows])
+
+
+def _rows(store):
+    return list(zip(store.abbrevs, store.numbers, store.categories))
+
+
+OLD = [("가", 1, "x"), ("나", 2, "y"), ("가", 3, "z"), ("다", 4, "")]
+
+
+def test_diff_reports_updates_inserts_and_deletes_by_key():
+    new = [("가", 1, "x"), ("가", 30, "z"), ("다", 4, "w"), ("라", 5, ""), ("가", 6, "")]
+    updates, inserts, deletes = core.diff_code_rows(_store(OLD), _store(new))
+    assert updates == [(2, 30, "z"), (3, 4, "w")]  # 두 번째 '가'는 두 번째 '가'와 비교
+    assert inserts == [("라", 5, ""), ("가", 6, "")]
+    assert deletes == [1]
+
+
+def test_identical_stores_have_no_diff():
+    assert core.diff_code_rows(_store(OLD), _store(OLD)) == ([], [], [])
+
+
+def test_apply_diff_keeps_row_ids_of_unchanged_rows():
+    old = _store(OLD)
+    ids = {abbrev_key: row_id for abbrev_key, row_id in zip(["가0", "나", "가1", "다"], old.row_ids)}
+    new = _store([("가", 1, "x"), ("가", 3, "zz"), ("마", 9, "")])
+    core.apply_code_diff(old, *core.diff_code_rows(old, new))
+    assert _rows(old) == _rows(new)
+    assert list(old.row_ids[:2]) == [ids["가0"], ids["가1"]]
+    assert old.row_of(ids["나"]) is None
+
+
+def test_apply_diff_reproduces_random_edits():
+    rng = random.Random(3)
+    names = ["가", "나", "다", "라", "마"]
+    for _ in range(50):
+        old_rows = [(rng.choice(names), rng.randint(0, 5), rng.choice("xy")) for _ in range(rng.randint(0, 12))]
+        new_rows = [(rng.choice(names), rng.randint(0, 5), rng.choice("xy")) for _ in range(rng.randint(0, 12))]
+        old, new = _store(old_rows), _store(new_rows)
+        diff = core.diff_code_rows(old, new)
+        # 행 순서가 아니라 (지정, 순번)으로 맞추므로 결과는 키별 내용이 같아야 함
+        core.apply_code_diff(old, *diff)
+        assert sorted(_rows(old)) == sorted(_rows(new))
+        assert core._keyed_rows(old).keys() == core._keyed_rows(new).keys()
+        assert core.diff_code_rows(old, new)[0] == []
@@ -0,0 +1,40 @@
+import semuHot2_core as core
+
+
+def _store(rows):
+    return core.CodeStore.from_records([{"지정": a, "번호": n, "구분": c} for a, n, c in rows])
+
+
+def test_categories_are_interned():
+    store = _store([("a", 1, "판관비"), ("b", 2, "기타"), ("c", 3, "판관비")])
+    assert store.categories.names == ["판관비", "기타"]
+    assert list(store.categories.ids) == [0, 1, 0]
+    store.set(1, 2, "판관비")
+    assert list(store.categories) == ["판관비"] * 3
+    assert store.categories.names == ["판관비", "기타"]  # 이미 있는 이름은 다시 넣지 않음
+
+
+def test_row_ids_survive_deletes_and_copies():
+    store = _store([("a", 1, ""), ("b", 2, ""), ("c", 3, ""), ("d", 4, "")])
+    ids = list(store.row_ids)
+    store.remove_rows(1, 2)
+    store.append("e", 5, "")
+    assert list(store.row_ids) == [ids[0], ids[3], 4]
+    assert store.row_of(ids[3]) == 1
+    assert store.row_of(ids[1]) is None
+    copy = store.copy()
+    copy.set(0, 1, 100)
+    assert store.numbers[0] == 1
+    assert list(copy.row_ids) == list(store.row_ids) and copy.next_id == store.next_id
+
+
+def test_row_ids_round_trip_through_snapshot(tmp_path):
+    path = str(tmp_path / "data.snap")
+    store = _store([("a", 1, ""), ("b", 2, ""), ("c", 3, "")])
+    store.remove_rows(0, 0)
+    core.write_snapshot(path, [store, core.CodeStore()])
+    (read, _), _ = core.read_snapshot(path)
+    assert list(read.row_ids) == [1, 2]
+    assert read.next_id == 3
+    read.append("d", 4, "")
+    assert read.row_ids[-1] == 3  # 지운 행의 ID를 다시 쓰지 않음
@@ -0,0 +1,110 @@
+import json
+import os
+import stat
+import sys
+import threading
+import time
+from multiprocessing.connection import Client
+
+import pytest
+
+import semuHot2_core as core
+
+
+def _store(*rows):
+    return core.CodeStore.from_records([{"지정": a, "번호": n, "구분": c} for a, n, c in rows])
+
+
+@pytest.fixture
+def service(tmp_path):
+    # 기본 프로필(법인 ab=101, 개인 ab=201)과 "다른" 프로필(법인 ab=301)을 가진 서비스 + FakeOutput
+    default_paths = (str(tmp_path / "data.snap"), str(tmp_path / "data.journal"))
+    registry = core.ProfileRegistry(str(tmp_path / "profiles"), str(tmp_path / "profiles.json"), default_paths)
+    core.write_snapshot(default_paths[0], [_store(("ab", 101, "")), _store(("ab", 201, ""))])
+    registry.create("다른")
+    core.write_snapshot(registry.paths("다른")[0], [_store(("ab", 301, "")), _store()])
+    output = core.FakeOutput()
+    service = core.HotstringService(registry, core.HotstringEngine(output=output))
+    service.load_profile(core.ProfileRegistry.DEFAULT)
+    yield service, output
+    service.flush_usage()
+
+
+def _typed(service, output, text="ab "):
+    output.injections.clear()
+    output.type_keys(service.engine, ["space" if ch == " " else ch for ch in text], start=1000.0)
+    return output.injections
+
+
+def test_handle_switches_mode_and_profile(service):
+    service, output = service
+    assert _typed(service, output) == [(3, "101")]
+
+    reply = service.handle({"cmd": "configure", "mode": "개인"})
+    assert (reply["ok"], reply["mode"]) == (True, "개인")
+    assert _typed(service, output) == [(3, "201")]
+
+    reply = service.handle({"cmd": "configure", "profile": "다른", "mode": "법인"})
+    assert (reply["profile"], reply["rows"]) == ("다른", {"법인": 1, "개인": 0})
+    assert _typed(service, output) == [(3, "301")]
+
+    assert service.handle({"cmd": "configure", "mode": "기타"})["ok"] is False
+    assert service.handle({"cmd": "configure", "profile": "없음"})["ok"] is False
+    assert service.handle({"cmd": "bogus"}) == {"ok": False, "error": "알 수 없는 명령: bogus"}
+    assert service.handle({})["ok"] is False
+    assert service.status()["profile"] == "다른"
+
+
+def test_daemon_round_trip(service, tmp_path):
+    service, output = service
+    if sys.platform == "win32":
+        address = rf"\\.\pipe\semuHot2-test-{os.getpid()}"
+    else:
+        address = str(tmp_path / "d.sock")
+    key_file = str(tmp_path / "daemon.key")
+    errors = []
+
+    def run():
+        try:
+            core.run_daemon(service, address, key_file)
+        except Exception as e:  # pragma: no cover - 실패하면 아래에서 보고
+            errors.append(e)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    client = None
+    deadline = time.monotonic() + 5
+    while client is None and time.monotonic() < deadline and not errors:
+        client = core.DaemonClient.connect(address, key_file)
+        time.sleep(0.02)
+    assert client is not None, errors
+    try:
+        if sys.platform != "win32":
+            assert stat.S_IMODE(os.stat(key_file).st_mode) == 0o600
+
+        assert client.request("status")["profile"] == core.ProfileRegistry.DEFAULT
+        assert client.request("configure", mode="개인")["mode"] == "개인"
+        assert _typed(service, output) == [(3, "201")]
+        with pytest.raises(RuntimeError, match="알 수 없는 명령"):
+            client.request("bogus")
+
+        # dict가 아닌 요청도 오류 응답만 돌려주고 접속은 그대로
+        client.conn.send_bytes(json.dumps([1, 2]).encode("utf-8"))
+        assert json.loads(client.conn.recv_bytes().decode("utf-8"))["ok"] is False
+        assert client.request("status")["ok"]
+
+        # 키가 틀리면 접속을 받지 않고, 데몬은 계속 동작
+        with pytest.raises(Exception):
+            Client(address, authkey=b"wrong key")
+        assert core.DaemonClient.connect(address, key_file).request("status")["mode"] == "개인"
+
+        # 이미 실행 중이면 두 번째 데몬은 시작하지 않음
+        with pytest.raises(RuntimeError):
+            core.run_daemon(service, address, key_file)
+
+        assert client.request("stop")["ok"]
+    finally:
+        client.close()
+    thread.join(5)
+    assert not thread.is_alive() and not errors
+    assert not os.path.exists(key_file)
@@ -0,0 +1,104 @@
+import semuHot2_core as core
+
+
+def _store(*rows):
+    return core.CodeStore.from_records([{"지정": a, "번호": n, "구분": c} for a, n, c in rows])
+
+
+def _rows(store):
+    return list(zip(store.abbrevs, store.numbers, store.categories))
+
+
+ROWS = [("가", 1, "매출"), ("나", 2, "매입"), ("다", 3, ""), ("라", 4, "매출")]
+
+
+def test_transaction_coalesces_nested_edits(tmp_path):
+    stores = {"법인": _store(*ROWS), "개인": _store(("개", 9, ""))}
+    committed = []
+    transactions = core.EditTransactions(committed.append)
+    with transactions.begin("붙여넣기") as outer:
+        core.edit_cells(outer, "법인", stores["법인"], [(0, 1, "10"), (1, 0, "나나")])
+        with transactions.begin("셀 편집") as inner:  # 안쪽 트랜잭션은 바깥 것에 합쳐짐
+            assert inner is outer
+            core.edit_cells(inner, "개인", stores["개인"], [(0, 2, "기타")])
+        assert committed == []
+    assert transactions.current is None
+    assert [t.label for t in committed] == ["붙여넣기"]
+    assert committed[0].changes == [
+        ("법인", 0, 1, 1, 10), ("법인", 1, 0, "나", "나나"), ("개인", 0, 2, "", "기타")]
+
+    journal_path, snap_path = str(tmp_path / "data.journal"), str(tmp_path / "data.snap")
+    journal = core.EditJournal(journal_path, snap_path)
+    changes, affected = core.commit_edits(committed[0], stores, journal)
+    assert affected == {"법인": {"가", "나", "나나"}, "개인": {"개"}}
+    assert changes[0] == ("법인", stores["법인"].row_ids[0], 1, 1, 10)
+    journal.commit()
+    journal.close()
+
+    replica = {"법인": _store(*ROWS), "개인": _store(("개", 9, ""))}
+    assert core.EditJournal(journal_path, snap_path).replay(replica, 0) == 3
+    assert _rows(replica["법인"]) == _rows(stores["법인"])
+    assert _rows(replica["개인"]) == [("개", 9, "기타")]
+
+
+def test_undo_redo_by_row_id_after_deleting_diff():
+    stores = {"법인": _store(*ROWS), "개인": core.CodeStore()}
+    store = stores["법인"]
+    transaction = core.EditTransaction("찾아 바꾸기")
+    core.edit_cells(transaction, "법인", store, [(1, 1, 20), (2, 1, 30), (3, 2, "기타")])
+    changes, _ = core.commit_edits(transaction, stores, _NullJournal())
+
+    # 원본 파일이 바뀌어 '가'와 '다'가 지워지고 행이 앞으로 밀림
+    new = _store(("나", 20, "매입"), ("라", 4, "기타"))
+    core.apply_code_diff(store, *core.diff_code_rows(store, new))
+    assert _rows(store) == [("나", 20, "매입"), ("라", 4, "기타")]
+
+    undo = core.EditTransaction("실행 취소", undoable=False)
+    core.revert_edits(undo, stores, changes, undo=True)
+    assert _rows(store) == [("나", 2, "매입"), ("라", 4, "매출")]  # 지워진 '다'의 변경은 건너뜀
+    assert undo.changes == [("법인", 1, 2, "기타", "매출"), ("법인", 0, 1, 20, 2)]
+
+    redo = core.EditTransaction("다시 실행", undoable=False)
+    core.revert_edits(redo, stores, changes, undo=False)
+    assert _rows(store) == [("나", 20, "매입"), ("라", 4, "기타")]
+
+
+def test_rejected_cells_are_counted_and_skipped():
+    store = _store(*ROWS)
+    transaction = core.EditTransaction("붙여넣기")
+    count = core.edit_cells(transaction, "법인", store, [
+        (0, 1, "1.5"),    # 정수가 아닌 번호
+        (1, 1, "abc"),
+        (2, 0, "   "),    # 빈 지정
+        (3, 0, " 마 "),   # 앞뒤 공백은 지움
+        (0, 2, "매출"),   # 값이 같으면 변경 아님
+        (1, 1, " 7 "),
+    ])
+    assert (count, transaction.rejected) == (2, 3)
+    assert transaction.changes == [("법인", 3, 0, "라", "마"), ("법인", 1, 1, 2, 7)]
+    assert _rows(store) == [("가", 1, "매출"), ("나", 7, "매입"), ("다", 3, ""), ("마", 4, "매출")]
+
+
+def test_replace_and_paste_only_touch_rows_shown_by_search():
+    store = _store(("가1", 11, "매출"), ("나1", 12, "매출"), ("가2", 13, "매입"), ("가3", 14, "매출"))
+    shown = core.SearchIndex(store).search("가")
+    assert shown == [0, 2, 3]
+
+    transaction = core.EditTransaction("찾아 바꾸기")
+    assert core.edit_cells(transaction, "법인", store, core.replace_edits(store, 2, "매출", "판매", shown)) == 2
+    assert list(store.categories) == ["판매", "매출", "매입", "판매"]
+    # 지정을 비우게 되는 바꾸기는 거부
+    core.edit_cells(transaction, "법인", store, core.replace_edits(store, 0, "가1", "", shown))
+    assert transaction.rejected == 1 and store.abbrevs[0] == "가1"
+
+    # 화면 1행(저장소 2행)부터 두 줄 붙여넣기: 열과 보이는 행 밖으로 넘치는 값은 버림
+    edits = core.paste_edits("x\t21\ty\tz\r\nw\t22\r\n\r\n", (1, 0), [], shown)
+    assert edits == [(2, 0, "x"), (2, 1, "21"), (2, 2, "y"), (3, 0, "w"), (3, 1, "22")]
+    # 값 하나는 선택한 셀 모두에
+    assert core.paste_edits("9", (0, 1), [(0, 1), (2, 1)], shown) == [(0, 1, "9"), (3, 1, "9")]
+    assert core.paste_edits("9", (1, 1), [], shown) == [(2, 1, "9")]
+
+
+class _NullJournal:
+    def record(self, mode, row_id, column, value):
+        pass
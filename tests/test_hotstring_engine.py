@@ -0,0 +1,117 @@
+import semuHot2_core as core
+
+
+def _store(*rows):
+    return core.CodeStore.from_records([{"지정": a, "번호": n, "구분": c} for a, n, c in rows])
+
+
+CORP = _store(("ab", 101, "매출"), ("abc", 102, "매입"), ("vab", 9, ""), ("ab", 999, "중복"))
+PERSONAL = _store(("ab", 201, "개인"), ("zz", 202, ""))
+
+
+def _engine(store=CORP):
+    output = core.FakeOutput()
+    engine = core.HotstringEngine(output=output)
+    engine.use_table(core.build_hotstring_trie(store))
+    return engine, output
+
+
+def _type(engine, output, text, start=1000.0, interval=0.05):
+    # "ab cd" 처럼 공백은 space 키로
+    keys = ["space" if ch == " " else ch for ch in text]
+    return output.type_keys(engine, keys, interval=interval, start=start)
+
+
+def test_replacement_erases_abbreviation_and_trigger():
+    engine, output = _engine()
+    _type(engine, output, "ab ")
+    assert output.injections == [(3, "101")]  # 'a', 'b', 스페이스
+    assert output.text == "101"
+    assert engine.stats.slowest == [(engine.stats.slowest[0][0], "ab")]
+
+
+def test_longer_abbreviation_and_first_duplicate_row():
+    engine, output = _engine()
+    _type(engine, output, "abc ab ")
+    assert output.injections == [(4, "102"), (3, "101")]
+    assert output.text == "102101"
+
+
+def test_only_whole_words_are_replaced():
+    engine, output = _engine()
+    _type(engine, output, "xab a ")  # 단어 중간의 ab, 끝 노드가 아닌 a
+    assert output.injections == []
+    _type(engine, output, "ab ", start=2000.0)  # 스페이스 뒤 새 단어
+    assert output.injections == [(3, "101")]
+
+
+def test_non_character_keys_end_the_word():
+    engine, output = _engine()
+    output.type_keys(engine, ["a", "enter", "b", "space"], start=1000.0)
+    assert output.injections == []
+    output.type_keys(engine, ["x", "backspace", "a", "b", "space"], start=2000.0)
+    assert output.injections == [(3, "101")]
+
+
+def test_typing_pause_resets_the_word():
+    engine, output = _engine()
+    _type(engine, output, "ab ", interval=engine.timeout + 1)
+    assert output.injections == []
+
+
+def test_mode_swap_discards_partial_word():
+    engine, output = _engine()
+    tables = core.build_hotstring_tables(CORP, PERSONAL)
+    engine.use_table(tables["법인"])
+    clock = _type(engine, output, "a")
+    engine.use_table(tables["개인"])  # 단어 도중에 모드 전환
+    clock = _type(engine, output, "b ", start=clock)
+    assert output.injections == []  # 법인 트라이의 'a' 위치에서 이어 가지 않음
+    _type(engine, output, "zz ab ", start=clock)
+    assert output.injections == [(3, "202"), (3, "201")]
+
+
+def test_ignored_synthetic_keys_do_not_enter_the_word():
+    engine, output = _engine()
+    # 붙여넣기 백엔드가 보낸 지우기 + Ctrl+V의 v
+    engine.ignore_keys(["backspace", "v"])
+    clock = core.time.time()
+    output.type_keys(engine, ["backspace", "v", "a", "b", "space"], start=clock)
+    assert output.injections == [(3, "101")]  # 'vab'가 아니라 'ab'
+
+
+def test_ignored_keys_expire():
+    engine, output = _engine()
+    engine.ignore_keys(["v"])
+    clock = core.time.time() + engine.IGNORE_SECONDS + 1
+    output.type_keys(engine, ["v", "a", "b", "space"], start=clock)
+    assert output.injections == [(4, "9")]
+
+
+def test_inject_failure_is_counted_not_raised():
+    class Broken(core.OutputBackend):
+        name = "broken"
+
+        def inject(self, erase, text):
+            raise OSError("no input device")
+
+    engine = core.HotstringEngine(output=Broken())
+    engine.use_table(core.build_hotstring_trie(CORP))
+    core.FakeOutput().type_keys(engine, ["a", "b", "space"], start=1000.0)
+    assert engine.stats.inject_errors == 1
+
+
+def test_key_seq_counts_only_real_key_presses():
+    engine, output = _engine()
+    _type(engine, output, "ab")
+    assert engine.key_seq == 2
+    engine.handle_event(core.SimulatedKeyEvent("a", 1001.0, event_type="up"))
+    engine.handle_event(core.SimulatedKeyEvent("shift", 1001.0))
+    assert engine.key_seq == 2  # 키 떼기, 수정 키는 세지 않음
+    engine.ignore_keys(["backspace", "v"])
+    now = core.time.time()
+    engine.handle_event(core.SimulatedKeyEvent("backspace", now))
+    engine.handle_event(core.SimulatedKeyEvent("v", now))
+    assert engine.key_seq == 2  # 붙여넣기에 쓴 합성 키도 세지 않음
+    engine.handle_event(core.SimulatedKeyEvent("c", now))
+    assert engine.key_seq == 3
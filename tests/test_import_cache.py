@@ -0,0 +1,30 @@
+from openpyxl import Workbook
+
+import semuHot2_core as core
+
+
+def _read(path, cache):
+    missing, row_errors = [], []
+    stores = core.read_workbook(path, cache, on_sheet_missing=missing.append, row_errors=row_errors)
+    return stores, missing, row_errors
+
+
+def test_cache_hit_replays_missing_sheets_and_row_errors(tmp_path):
+    path = str(tmp_path / "codes.xlsx")
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "법인"
+    for row in (core.COLUMNS, ["가", 1, "매출"], ["나", "미정", "매입"], ["다", 3, None]):
+        ws.append(list(row))
+    wb.save(path)  # 개인 시트 없음
+    cache = core.ImportCache(str(tmp_path / "cache"))
+
+    first = _read(path, cache)
+    second = _read(path, cache)  # 캐시에서 읽음
+
+    for stores, missing, row_errors in (first, second):
+        assert list(stores["법인"].abbrevs) == ["가", "다"]
+        assert len(stores["개인"]) == 0
+        assert missing == ["개인"]
+        assert [(sheet, row) for sheet, row, _ in row_errors] == [("법인", 3)]
+    assert first[2] == second[2]
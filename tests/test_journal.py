@@ -0,0 +1,82 @@
+import semuHot2_core as core
+
+
+def _store(rows):
+    return core.CodeStore.from_records([{"지정": a, "번호": n, "구분": c} for a, n, c in rows])
+
+
+def _rows(store):
+    return list(zip(store.abbrevs, store.numbers, store.categories))
+
+
+CORP_ROWS = [("복리", 811, "판관비"), ("ㅂㄹ", -1, ""), ("통신", 5, "판관비"), ("접대", 0, "기타")]
+
+
+def _open(tmp_path):
+    snap = str(tmp_path / "data.snap")
+    return snap, core.EditJournal(str(tmp_path / "data.journal"), snap)
+
+
+def _reload(tmp_path):
+    snap, journal = _open(tmp_path)
+    stores, base_seq = core.read_snapshot(snap)
+    stores = dict(zip(core.SHEET_NAMES, stores))
+    applied = journal.replay(stores, base_seq)
+    return stores, journal, applied
+
+
+def test_journal_replays_edits_after_snapshot(tmp_path):
+    snap, journal = _open(tmp_path)
+    corp, personal = _store(CORP_ROWS), _store([("개인", 1, "")])
+    journal.checkpoint([corp, personal], discard=True).result()
+
+    journal.record("법인", corp.row_ids[0], 1, 812)
+    journal.record("개인", personal.row_ids[0], 0, "개인2")
+    journal.commit()
+    journal.record("법인", corp.row_ids[2], 2, "커밋 안 됨")  # commit 전에 꺼진 기록은 남지 않음
+
+    stores, journal, applied = _reload(tmp_path)
+    assert applied == 2
+    assert stores["법인"].numbers[0] == 812
+    assert stores["법인"].categories[2] == "판관비"
+    assert stores["개인"].abbrevs[0] == "개인2"
+    assert journal.seq == 2
+
+    # 체크포인트 뒤에는 그 이후 기록만 적용
+    journal.checkpoint([stores["법인"], stores["개인"]]).result()
+    journal.record("법인", stores["법인"].row_ids[1], 1, 7)
+    journal.close()
+    stores, journal, applied = _reload(tmp_path)
+    assert applied == 1
+    assert stores["법인"].numbers[:2].tolist() == [812, 7]
+    journal.close()
+
+
+def test_journal_ignores_truncated_last_line(tmp_path):
+    snap, journal = _open(tmp_path)
+    corp = _store(CORP_ROWS)
+    core.write_snapshot(snap, [corp, core.CodeStore()])
+    journal.record("법인", corp.row_ids[0], 1, 1)
+    journal.close()
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"n": 2, "m": "법인", "i": 0, "c": 1, "v"')  # 기록 도중 꺼짐
+
+    stores, journal, applied = _reload(tmp_path)
+    assert applied == 1
+    assert stores["법인"].numbers[0] == 1
+    journal.close()
+
+
+def test_journal_follows_row_ids_across_deleted_rows(tmp_path):
+    snap, journal = _open(tmp_path)
+    corp = _store(CORP_ROWS)
+    journal.record("법인", corp.row_ids[3], 1, 99)
+    corp.remove_rows(0, 1)  # 기록한 행이 3번 -> 1번으로 밀림
+    journal.record("법인", 12345, 1, 1)  # 없는 행 ID는 무시
+    core.write_snapshot(snap, [corp, core.CodeStore()], journal_seq=0)
+    journal.close()
+
+    stores, journal, applied = _reload(tmp_path)
+    assert applied == 1
+    assert _rows(stores["법인"])[1] == ("접대", 99, "기타")
+    journal.close()
@@ -0,0 +1,69 @@
+import semuHot2_core as core
+
+
+def _store(*rows):
+    return core.CodeStore.from_records([{"지정": a, "번호": n, "구분": c} for a, n, c in rows])
+
+
+ROWS = [
+    ("복리후생비", 811, "판관비"),
+    ("복리", 812, ""),
+    ("급여", 801, "복리"),      # 구분이 '복리'
+    ("후생복리", 813, ""),
+    ("복리후생", 511, "제조"),
+    ("a81", 100, ""),
+]
+
+
+def _check(index, query, expected, usage=None):
+    assert index.search(query, usage) == expected
+    assert core.SearchIndex.scan(index.store, query, usage) == expected
+
+
+def test_hangul_initials():
+    assert core.hangul_initials("복리후생비") == "ㅂㄹㅎㅅㅂ"
+    assert core.hangul_initials("a1 까ㅎ") == "a1 ㄲㅎ"
+
+
+def test_initial_consonant_search():
+    index = core.SearchIndex(_store(*ROWS))
+    _check(index, "ㅂㄹ", [1, 4, 0, 3, 2])
+    _check(index, "ㅂㄹㅎㅅㅂ", [0])
+    _check(index, "복ㄹ", [1, 4, 0, 3, 2])  # 음절과 초성을 섞어도 초성으로 찾음
+    _check(index, "ㅈ", [4])
+
+
+def test_ranking_exact_prefix_substring_and_field():
+    index = core.SearchIndex(_store(*ROWS))
+    # 지정 완전 일치 > 지정 앞부분(짧은 값 먼저) > 지정 포함 > 구분
+    _check(index, "복리", [1, 4, 0, 3, 2])
+    # 지정에 들어 있으면 번호보다 앞
+    _check(index, "81", [5, 0, 1, 3])
+    _check(index, "  복리후생비 ", [0])
+    _check(index, "없는 값", [])
+    _check(index, "", [])
+    # 같은 순위 안에서는 자주 쓴 약어 먼저
+    _check(index, "복리", [1, 0, 4, 3, 2], usage={"복리후생비": 3})
+
+
+def test_search_after_edits_filters_stale_postings():
+    store = _store(*ROWS)
+    index = core.SearchIndex(store)
+    store.set(1, 0, "xyz")
+    index.update_row(1)
+    _check(index, "복리", [4, 0, 3, 2])   # 예전 '복리' 조각 항목은 남아 있어도 결과에서 빠짐
+    _check(index, "xy", [1])
+    assert 1 in index.grams["복리"]
+
+    store.append("복리", 900, "새")       # 맨 뒤에 추가된 행
+    index.update_row(len(store) - 1)
+    _check(index, "ㅂㄹ", [6, 4, 0, 3, 2])
+    _check(index, "90", [6])
+
+    index.REBUILD_STALE = 3
+    store.set(3, 2, "복리")
+    index.update_row(3)                   # 오래된 항목이 쌓이면 다시 만듦
+    assert index.stale == 0
+    assert 1 not in index.grams["복리"]
+    _check(index, "복리", [6, 4, 0, 3, 2])
+    assert index.sort_keys[1] == core.collation_key("xyz")
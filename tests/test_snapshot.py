@@ -0,0 +1,45 @@
+import pytest
+
+import semuHot2_core as core
+
+
+def _store(rows):
+    return core.CodeStore.from_records([{"지정": a, "번호": n, "구분": c} for a, n, c in rows])
+
+
+def _rows(store):
+    return list(zip(store.abbrevs, store.numbers, store.categories))
+
+
+CORP_ROWS = [("복리", 811, "판관비"), ("ㅂㄹ", -1, ""), ("통신", 2 ** 40, "판관비"), ("emoji😀", 0, "기타")]
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "data.snap")
+    corp, personal = _store(CORP_ROWS), core.CodeStore()
+    core.write_snapshot(path, [corp, personal], journal_seq=42)
+
+    (read_corp, read_personal), seq = core.read_snapshot(path)
+    assert seq == 42
+    assert _rows(read_corp) == CORP_ROWS
+    assert read_corp.categories.names == corp.categories.names
+    assert len(read_personal) == 0
+
+    # 스냅샷에서 읽은 저장소도 그대로 고치고 다시 저장할 수 있어야 함
+    read_corp.set(0, 0, "복리후생")
+    read_corp.append("끝", 9, "")
+    core.write_snapshot(path, [read_corp, read_personal])
+    (again, _), seq = core.read_snapshot(path)
+    assert seq == 0
+    assert _rows(again)[0] == ("복리후생", 811, "판관비")
+    assert _rows(again)[-1] == ("끝", 9, "")
+
+
+def test_snapshot_rejects_other_files(tmp_path):
+    empty = tmp_path / "empty.snap"
+    empty.write_bytes(b"")
+    other = tmp_path / "other.snap"
+    other.write_bytes(b"not a snapshot file")
+    for path in (empty, other):
+        with pytest.raises(ValueError):
+            core.read_snapshot(str(path))
@@ -0,0 +1,121 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+import semuHot2_core as core
+
+
+def _store(rows):
+    return core.CodeStore.from_records([{"지정": a, "번호": n, "구분": c} for a, n, c in rows])
+
+
+def _rows(store):
+    return list(zip(store.abbrevs, store.numbers, store.categories))
+
+
+def _stores(corp, personal=()):
+    return {"법인": _store(corp), "개인": _store(personal)}
+
+
+OLD = [("가", 1, "x"), ("나", 2, "y"), ("가", 3, "z"), ("다", 4, "")]
+
+
+def test_sync_ops_round_trip():
+    old = _store(OLD)
+    new = _store([("가", 10, "x"), ("나", 2, "y"), ("바", 7, "")])
+    ops = core.diff_to_ops(old, *core.diff_code_rows(old, new))
+    replica = _store(OLD)
+    core.apply_code_diff(replica, *core.ops_to_diff(replica, ops))
+    assert _rows(replica) == _rows(new)
+    assert core.code_digest({"법인": replica, "개인": core.CodeStore()}) == \
+        core.code_digest({"법인": new, "개인": core.CodeStore()})
+
+
+@pytest.fixture
+def server(tmp_path):
+    # 빈 포트에 띄운 공용 코드표 서버 -> (주소, 토큰, 저장소)
+    repository = core.SyncRepository(str(tmp_path / "shared"))
+    token = repository.publish_token()
+    httpd = core.make_sync_server(repository, "127.0.0.1", 0, token)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{httpd.server_address[1]}", token, repository
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        thread.join()
+
+
+def _post(url, headers, body=b""):
+    host, port = url.rsplit("/", 1)[-1].split(":")
+    conn = http.client.HTTPConnection(host, int(port), timeout=5)
+    try:
+        conn.putrequest("POST", "/publish")
+        for name, value in headers.items():
+            conn.putheader(name, value)
+        conn.endheaders()
+        if body:
+            conn.send(body)
+        response = conn.getresponse()
+        return response.status, json.loads(response.read().decode("utf-8"))
+    finally:
+        conn.close()
+
+
+def test_publish_requires_token_and_valid_body(server):
+    url, token, repository = server
+    for wrong in (None, "0" * len(token)):
+        with pytest.raises(RuntimeError):
+            core.SyncClient(url, wrong).publish(_stores(OLD))
+    assert repository.version == 0
+
+    body = json.dumps({"법인": [list(row) for row in OLD]}).encode("utf-8")
+    auth = {core.SYNC_TOKEN_HEADER: token}
+    assert _post(url, {"Content-Length": str(len(body))}, body)[0] == 403
+    assert _post(url, {**auth, "Content-Length": "abc"})[0] == 400
+    assert _post(url, {**auth, "Content-Length": "-1"})[0] == 400
+    assert _post(url, auth)[0] == 400  # Content-Length 없음
+    assert _post(url, {**auth, "Content-Length": str(core.SYNC_MAX_BODY + 1)})[0] == 413
+    bad = b'{"\xeb\xb2\x95\xec\x9d\xb8": [["a", "x", ""]]}'  # 번호가 정수가 아님
+    assert _post(url, {**auth, "Content-Length": str(len(bad))}, bad)[0] == 400
+    status, reply = _post(url, {**auth, "Content-Length": str(len(body))}, body)
+    assert (status, reply["version"]) == (200, 1)
+
+
+def test_pull_applies_changes_since_last_version(server):
+    url, token, repository = server
+    publisher = core.SyncClient(url, token)
+    assert publisher.publish(_stores(OLD, [("개", 1, "")])) == 1
+    assert publisher.publish(_stores(OLD, [("개", 1, "")])) == 1  # 바뀐 것이 없으면 판 그대로
+
+    client = core.SyncClient(url)
+    local, version, changed = client.pull(_stores([]), 0)
+    assert (version, changed) == (1, None)  # 처음에는 전체
+    assert _rows(local["법인"]) == OLD
+
+    assert publisher.publish(_stores([("가", 10, "x")] + OLD[1:] + [("라", 5, "")], [("개", 1, "")])) == 2
+    local, version, changed = client.pull(local, version)
+    assert (version, changed) == (2, 2)  # 변경분만 (수정 1, 추가 1)
+    assert _rows(local["법인"])[0] == ("가", 10, "x")
+    assert core.code_digest(local) == repository.digest
+
+    # 서버 저장소를 다시 열어도 같은 판
+    reopened = core.SyncRepository(str(repository.snap_path.rsplit("/", 1)[0]))
+    assert (reopened.version, reopened.digest) == (2, repository.digest)
+
+
+def test_pull_falls_back_to_full_copy_on_digest_mismatch(server):
+    url, token, repository = server
+    publisher = core.SyncClient(url, token)
+    publisher.publish(_stores(OLD))
+    client = core.SyncClient(url)
+    local, version, _ = client.pull(_stores([]), 0)
+
+    local["법인"].set(1, 1, 999)  # 이 PC에서 직접 고침
+    publisher.publish(_stores(OLD + [("마", 6, "")]))
+    local, version, changed = client.pull(local, version)
+    assert (version, changed) == (2, None)  # 적용 결과가 서버와 달라 전체를 다시 받음
+    assert _rows(local["법인"]) == OLD + [("마", 6, "")]
@@ -0,0 +1,77 @@
+import semuHot2_core as core
+
+
+def _store(*rows):
+    return core.CodeStore.from_records([{"지정": a, "번호": n, "구분": c} for a, n, c in rows])
+
+
+def _abbrevs(store, rows):
+    return [store.abbrevs[row] for row in rows]
+
+
+def test_collation_order_for_hangul_latin_digits_and_mixed():
+    words = ["하나", "가", "ㄱ", "각", "간", "B", "a", "10", "2", "-", "가10", "가2", "a10", "A2", "까", "ㄴ", "나"]
+    assert sorted(words, key=core.collation_key) == [
+        "-",                      # 기호
+        "2", "10",                # 숫자는 값 크기대로
+        "a", "A2", "a10", "B",    # 영문은 대소문자 무시
+        "ㄱ", "가", "가2", "가10", "각", "간", "까", "ㄴ", "나", "하나",  # 초성만 쓴 글자는 같은 초성의 음절보다 앞
+    ]
+    assert core.collation_key("007") == core.collation_key("7")
+    assert core.collation_key("ABC") == core.collation_key("abc")
+
+
+def test_order_by_each_column_and_direction():
+    store = _store(("나", 3, "매입"), ("가", 10, "매출"), ("다", 2, ""), ("가", 1, "매입"))
+    keys = core.TableKeys(store)
+    assert _abbrevs(store, keys.order(0)) == ["가", "가", "나", "다"]
+    assert keys.order(0) == [1, 3, 0, 2]  # 같은 값끼리는 원래 행 순서
+    assert keys.order(1) == [3, 2, 0, 1]
+    assert keys.order(1, descending=True) == [1, 0, 2, 3]
+    assert keys.order(2) == [2, 0, 3, 1]  # "" < 매입 < 매출
+    assert keys.usage_order({"다": 5, "나": 2}) == [2, 0, 1, 3]
+
+
+def test_filter_combines_categories_number_range_and_search_rows():
+    store = _store(*[(f"c{i}", i, ("매출", "매입", "급여", "")[i % 4]) for i in range(20)])
+    keys = core.TableKeys(store)
+    assert keys.category_counts() == {"매출": 5, "매입": 5, "급여": 5, "": 5}
+
+    mask = keys.mask(categories={"매출", "급여"})
+    assert keys.select(range(20), mask) == [0, 2, 4, 6, 8, 10, 12, 14, 16, 18]
+
+    mask = keys.mask(categories={"매출", "급여"}, number_range=(4, 14))
+    assert keys.select(keys.order(1, descending=True), mask) == [14, 12, 10, 8, 6, 4]
+
+    mask = keys.mask(categories={"매입"}, number_range=(None, 9), rows=[1, 5, 9, 13])
+    assert keys.select(range(20), mask) == [1, 5, 9]
+    assert keys.mask() is None and keys.select([3, 1], None) == [3, 1]
+
+
+def test_number_bounds_follow_edits():
+    store = _store(("a", 5, ""), ("b", 10, ""), ("c", 15, ""), ("d", 20, ""))
+    keys = core.TableKeys(store)
+
+    def in_range(low, high):
+        return sorted(keys.select(range(len(store)), keys.mask(number_range=(low, high))))
+
+    assert in_range(10, 15) == [1, 2]        # 양 끝 값 포함
+    assert in_range(11, 14) == []            # 경계 바로 안쪽 값이 없으면 비어 있음
+    assert in_range(6, None) == [1, 2, 3]    # 최소만
+    assert in_range(None, 19) == [0, 1, 2]   # 최대만
+    assert in_range(None, None) == [0, 1, 2, 3]
+
+    store.set(0, 1, 12)   # 5 -> 12: 캐시된 번호순을 버려야 범위 안에 들어옴
+    keys.update_row(0)
+    assert in_range(10, 15) == [0, 1, 2]
+    assert keys.order(1) == [1, 0, 2, 3]
+
+    store.append("e", 15, "")   # 맨 뒤에 추가된 행
+    keys.update_row(4)
+    assert in_range(15, 15) == [2, 4]
+    assert in_range(16, 19) == []
+
+    store.set(4, 0, "0")        # 지정 정렬 키도 다시 만듦
+    keys.order(0)
+    keys.update_row(4)
+    assert _abbrevs(store, keys.order(0)) == ["0", "a", "b", "c", "d"]
@@ -0,0 +1,121 @@
+import random
+
+import semuHot2_core as core
+
+
+def _store(rows):
+    return core.CodeStore.from_records([{"지정": a, "번호": n, "구분": c} for a, n, c in rows])
+
+
+def _walk(root, abbrev):
+    node = root
+    for ch in abbrev:
+        node = node.children.get(ch) if node is not None else None
+    return node
+
+
+def test_build_uses_first_row_and_skips_empty_abbreviations():
+    store = _store([("ab", 1, "x"), ("", 2, "y"), ("ab", 3, "z"), ("abc", 4, "w")])
+    root = core.build_hotstring_trie(store)
+    assert _walk(root, "ab").replacement == "1"
+    assert _walk(root, "ab").abbrev == "ab"
+    assert _walk(root, "abc").replacement == "4"
+    assert _walk(root, "a").replacement is None
+    assert _walk(root, "b") is None
+    assert root.replacement is None and root.top is None
+
+
+def test_build_tables_per_mode():
+    tables = core.build_hotstring_tables(_store([("ab", 1, "")]), _store([("ab", 2, "")]))
+    assert set(tables) == set(core.SHEET_NAMES)
+    assert _walk(tables["법인"], "ab").replacement == "1"
+    assert _walk(tables["개인"], "ab").replacement == "2"
+
+
+def _replacements(root, categories=False):
+    # {약어: 번호} - 끝 노드 전체 (categories면 {약어: (번호, 구분)}, 구분은 자동완성 트라이에만 있음)
+    found = {}
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node.replacement is not None:
+            found[node.abbrev] = (node.replacement, node.category) if categories else node.replacement
+        stack.extend(node.children.values())
+    return found
+
+
+def _random_edits(store, rng, letters="abc", steps=30):
+    # 임의 편집을 하나씩 하고 바뀐 약어 집합을 돌려줌
+    for _ in range(steps):
+        row = rng.randrange(len(store))
+        changed = {store.abbrevs[row]}
+        action = rng.choice(("rename", "renumber", "delete", "add"))
+        if action == "rename":
+            new = "".join(rng.choice(letters) for _ in range(rng.randint(1, 4)))
+            store.set(row, 0, new)
+            changed.add(new)
+        elif action == "renumber":
+            store.set(row, 1, rng.randint(100, 999))
+        elif action == "delete":
+            store.remove_rows(row, row)
+        else:
+            new = "".join(rng.choice(letters) for _ in range(rng.randint(1, 5)))
+            store.append(new, rng.randint(100, 999), "new")
+            changed.add(new)
+        yield changed
+
+
+def _random_store(rng, letters="abc", count=60):
+    return _store([("".join(rng.choice(letters) for _ in range(rng.randint(1, 4))), i, f"c{i % 3}")
+                   for i in range(count)])
+
+
+def test_patch_matches_full_rebuild_and_leaves_original_untouched():
+    rng = random.Random(7)
+    store = _random_store(rng)
+    root = core.build_hotstring_trie(store)
+    for changed in _random_edits(store, rng):
+        before = _replacements(root)
+        patched = core.patch_hotstring_trie(root, store, changed)
+        assert _replacements(patched) == _replacements(core.build_hotstring_trie(store))
+        assert _replacements(root) == before  # 훅 스레드가 보고 있던 트라이는 그대로
+        root = patched
+
+
+def _tops(root, prefix=""):
+    tops = {prefix: root.top}
+    for ch, child in root.children.items():
+        tops.update(_tops(child, prefix + ch))
+    return tops
+
+
+def test_suggestions_rank_by_usage_then_length_then_name():
+    store = _store([("abcd", 1, ""), ("abc", 2, ""), ("abd", 3, ""), ("ab", 4, ""), ("b", 5, "")])
+    root = core.build_hotstring_trie(store, suggest=True)
+    assert [entry[0] for entry in _walk(root, "ab").top] == ["ab", "abc", "abd", "abcd"]
+    ranked = core.build_hotstring_trie(store, suggest=True, usage={"abcd": 3, "abd": 1})
+    assert [entry[0] for entry in _walk(ranked, "ab").top] == ["abcd", "abd", "ab", "abc"]
+    assert [entry[0] for entry in ranked.top] == ["abcd", "abd", "b", "ab", "abc"]
+    assert _walk(ranked, "abd").top == [("abd", "3", "")]
+
+
+def test_suggestions_keep_top_k():
+    store = _store([(f"a{i:02d}", i, "") for i in range(core.SUGGEST_TOP_K + 5)])
+    root = core.build_hotstring_trie(store, suggest=True)
+    assert len(_walk(root, "a").top) == core.SUGGEST_TOP_K
+
+
+def test_patched_suggestions_match_full_rebuild():
+    rng = random.Random(11)
+    store = _random_store(rng)
+    usage = {store.abbrevs[0]: 5, store.abbrevs[1]: 2}
+    root = core.build_hotstring_trie(store, True, usage)
+    for changed in _random_edits(store, rng):
+        patched = core.patch_hotstring_trie(root, store, changed, usage)
+        rebuilt = core.build_hotstring_trie(store, True, usage)
+        assert _replacements(patched, True) == _replacements(rebuilt, True)
+        # 지운 약어의 빈 가지는 남으므로 새로 만든 트라이에 있는 노드만 비교
+        patched_tops = _tops(patched)
+        for prefix, top in _tops(rebuilt).items():
+            assert patched_tops[prefix] == top, prefix
+        root = patched
@@ -0,0 +1,68 @@
+import json
+import os
+
+import pytest
+
+import semuHot2_core as core
+
+
+def _store(*rows):
+    return core.CodeStore.from_records([{"지정": a, "번호": n, "구분": c} for a, n, c in rows])
+
+
+def test_two_instances_flush_to_the_same_file(tmp_path):
+    path = str(tmp_path / "data.usage.json")
+    gui, daemon = core.UsageCounts(path), core.UsageCounts(path)
+    gui.hit("ab")
+    gui.hit("ab")
+    daemon.hit("ab")
+    daemon.mode = "개인"
+    daemon.hit("zz")
+    assert gui.get("법인") == {"ab": 2}  # 아직 쓰지 않은 횟수도 포함
+
+    assert gui.flush() == 2
+    since = gui.since
+    assert daemon.flush() == 2  # 덮어쓰지 않고 파일에 있던 횟수에 더함
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    assert data == {"since": since, "counts": {"법인": {"ab": 3}, "개인": {"zz": 1}}}
+
+    # 쓸 것이 없는 flush는 다른 인스턴스가 쓴 파일을 다시 읽음
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert gui.flush() == 0
+    assert (gui.get("법인"), gui.get("개인")) == ({"ab": 3}, {"zz": 1})
+    assert core.UsageCounts(path).get("법인") == {"ab": 3}
+
+
+def test_failed_flush_keeps_pending_counts(tmp_path):
+    usage = core.UsageCounts(str(tmp_path / "없는 폴더" / "data.usage.json"))
+    usage.hit("ab")
+    with pytest.raises(OSError):
+        usage.flush()
+    assert usage.get("법인") == {"ab": 1}
+    os.makedirs(tmp_path / "없는 폴더")
+    assert usage.flush() == 1
+
+
+def test_usage_report_hottest_and_never_fired(tmp_path):
+    stores = {
+        "법인": _store(("ab", 1, "매출"), ("cd", 2, ""), ("ab", 3, "중복"), ("ef", 4, "매입"), ("gh", 5, "")),
+        "개인": _store(("zz", 9, "")),
+    }
+    usage = core.UsageCounts(str(tmp_path / "data.usage.json"))
+    for abbrev, n in (("cd", 5), ("ab", 2), ("gh", 2), ("없는약어", 7)):
+        for _ in range(n):
+            usage.hit(abbrev)
+
+    report = core.usage_report(stores, usage, top=2)
+    corp = report["modes"]["법인"]
+    assert (corp["codes"], corp["used"], corp["hits"]) == (4, 3, 9)  # 표에 없는 약어는 세지 않음
+    assert corp["hot"] == [  # 횟수 내림차순, 같으면 가나다순. 같은 지정은 처음 나온 행만
+        {"지정": "cd", "번호": 2, "구분": "", "횟수": 5},
+        {"지정": "ab", "번호": 1, "구분": "매출", "횟수": 2},
+    ]
+    assert corp["dead"] == [{"지정": "ef", "번호": 4, "구분": "매입"}]
+    assert report["modes"]["개인"] == {
+        "codes": 1, "used": 0, "hits": 0, "hot": [], "dead": [{"지정": "zz", "번호": 9, "구분": ""}]}
+    assert report["since"] is None  # 아직 파일에 쓴 적 없음
@@ -0,0 +1,141 @@
+import re
+import zipfile
+
+from openpyxl import Workbook, load_workbook
+
+import semuHot2_core as core
+
+
+def _save_with_cached_values(path, rows, cached):
+    # openpyxl은 수식의 계산 결과를 저장하지 않으므로, 엑셀이 저장한 파일처럼 <v>에 결과를 직접 넣음
+    # cached: {"B3": 2, "A4": "다", ...}
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "법인"
+    for row in rows:
+        ws.append(row)
+    wb.create_sheet("개인").append(list(core.COLUMNS))
+    wb.save(path)
+    with zipfile.ZipFile(path) as z:
+        parts = {name: z.read(name) for name in z.namelist()}
+    xml = parts["xl/worksheets/sheet1.xml"].decode("utf-8")
+    for ref, value in cached.items():
+        kind = ' t="str"' if isinstance(value, str) else ""
+        xml, count = re.subn(
+            rf'<c r="{ref}"([^>]*)><f>(.*?)</f><v\s*/>',
+            lambda m: f'<c r="{ref}"{m.group(1)}{kind}><f>{m.group(2)}</f><v>{value}</v>',
+            xml,
+        )
+        assert count == 1, ref
+    parts["xl/worksheets/sheet1.xml"] = xml.encode("utf-8")
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        for name, data in parts.items():
+            z.writestr(name, data)
+
+
+def _code_rows(path):
+    ws = load_workbook(path)["법인"]
+    return [list(row) for row in ws.iter_rows(min_row=2, max_col=4, values_only=True)]
+
+
+def test_write_back_replaces_edited_formula_rows(tmp_path):
+    source = tmp_path / "codes.xlsx"
+    rows = [
+        list(core.COLUMNS),
+        ["가", 1, "매출"],
+        ["나", "=1+1", "매입"],          # 번호가 수식
+        ['="다"', 3, "매출"],            # 지정이 수식
+        ["가", "미정", "매출"],          # 번호가 정수가 아니어서 불러올 때 건너뛴 행
+        ["가", "=A2", "매출"],           # 수식 결과가 정수가 아님 - 건너뛴 행
+        ["가", 5, "매출", "메모"],       # 두 번째 '가'
+        ["바", "=2+2", "매입"],          # 고치지 않은 수식 행
+        ["라", 7, "매입"],
+    ]
+    _save_with_cached_values(str(source), rows, {"B3": 2, "A4": "다", "B6": "가", "B8": 4})
+    before = source.read_bytes()
+
+    stores = core.read_workbook(str(source))
+    store = stores["법인"]
+    assert list(store.abbrevs) == ["가", "나", "다", "가", "바", "라"]
+    assert list(store.numbers) == [1, 2, 3, 5, 4, 7]
+
+    store.set(3, 1, 6)          # 두 번째 '가' 번호 변경
+    store.set(1, 1, 8)          # 수식 행('나')의 번호 변경 -> 값으로 바뀜
+    store.remove_rows(2, 2)     # 수식 행('다') 삭제
+    store.remove_rows(4, 4)     # '라' 삭제
+    store.append("마", 9, "매출")
+
+    summary = core.write_back_workbook(str(source), stores)
+    assert summary == {"updated": 2, "inserted": 1, "deleted": 2, "formulas": 2}
+    assert source.read_bytes() == before  # 기본은 원본 옆의 새 파일
+    target = core.write_back_path(str(source))
+    assert target == str(tmp_path / "codes (반영).xlsx")
+
+    assert _code_rows(target) == [
+        ["가", 1, "매출", None],
+        ["나", 8, "매입", None],
+        ["가", "미정", "매출", None],
+        ["가", "=A2", "매출", None],
+        ["가", 6, "매출", "메모"],
+        ["바", "=2+2", "매입", None],
+        ["마", 9, "매출", None],
+    ]
+
+
+def test_write_back_keeps_formatting_and_other_sheets(tmp_path):
+    from openpyxl.styles import Font
+    from openpyxl.worksheet.datavalidation import DataValidation
+
+    source = tmp_path / "codes.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "법인"
+    for row in [list(core.COLUMNS), ["가", 1, "매출"], ["나", 2, "매입"], ["다", 3, "매출"], [None], ["합계", "=SUM(B2:B4)"]]:
+        ws.append(row)
+    ws.column_dimensions["A"].width = 30
+    ws["A1"].font = Font(bold=True)
+    ws["B4"].font = Font(italic=True)
+    ws.merge_cells("D1:E1")
+    validation = DataValidation(type="list", formula1='"매출,매입"')
+    ws.add_data_validation(validation)
+    validation.add("C2:C100")
+    wb.create_sheet("개인").append(list(core.COLUMNS))
+    wb.create_sheet("메모").append(["그대로", "=1+1"])
+    wb.save(source)
+
+    stores = core.read_workbook(str(source))
+    stores["법인"].set(1, 2, "기타")
+    stores["법인"].append("라", 4, "매입")
+    stores["개인"].append("개", 1, "")
+    target = tmp_path / "out.xlsx"
+    summary = core.write_back_workbook(str(source), stores, str(target))
+    assert summary == {"updated": 1, "inserted": 2, "deleted": 0, "formulas": 0}
+
+    wb = load_workbook(target)
+    ws = wb["법인"]
+    assert ws.column_dimensions["A"].width == 30
+    assert ws["A1"].font.bold
+    assert ws["B5"].font.italic  # 새 행은 바로 위 행의 서식을 따름
+    assert [str(r) for r in ws.merged_cells.ranges] == ["D1:E1"]
+    assert len(ws.data_validations.dataValidation) == 1
+    assert [list(r) for r in ws.iter_rows(min_row=2, max_col=3, values_only=True)] == [
+        ["가", 1, "매출"], ["나", 2, "기타"], ["다", 3, "매출"], ["라", 4, "매입"],
+        [None, None, None], ["합계", "=SUM(B2:B4)", None],
+    ]
+    assert [list(r) for r in wb["메모"].values] == [["그대로", "=1+1"]]
+    assert [list(r) for r in wb["개인"].values] == [list(core.COLUMNS), ["개", 1, None]]
+
+
+def test_write_back_round_trip_is_unchanged(tmp_path):
+    source = tmp_path / "codes.xlsx"
+    rows = [list(core.COLUMNS), ["가", "=1+1", "매출"], ['="나"', 3, ""], ["가", 4, "매입"]]
+    _save_with_cached_values(str(source), rows, {"B2": 2, "A3": "나"})
+
+    stores = core.read_workbook(str(source))
+    summary = core.write_back_workbook(str(source), stores, str(source))
+    assert summary == {"updated": 0, "inserted": 0, "deleted": 0, "formulas": 0}
+    assert _code_rows(str(source)) == [
+        ["가", "=1+1", "매출", None],
+        ['="나"', 3, None, None],
+        ["가", 4, "매입", None],
+    ]